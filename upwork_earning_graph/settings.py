@@ -53,6 +53,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "upworkapi.middleware.RequestTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -153,13 +154,41 @@ CACHES = {
     "default": {
         "BACKEND": env.str(
             "DJANGO_CACHE_BACKEND",
-            "django.core.cache.backends.filebased.FileBasedCache",
+            "upworkapi.cache_backends.CompressedFileBasedCache",
         ),
         "LOCATION": env.str("DJANGO_CACHE_LOCATION", DJANGO_CACHE_DIR),
         "TIMEOUT": env.int("DJANGO_CACHE_TIMEOUT", 300),
         "OPTIONS": {"MAX_ENTRIES": env.int("DJANGO_CACHE_MAX_ENTRIES", 5000)},
     }
 }
+if CACHES["default"]["BACKEND"].endswith("CompressedFileBasedCache"):
+    # Values whose pickle is smaller than this are stored uncompressed.
+    CACHES["default"]["OPTIONS"]["COMPRESS_MIN_BYTES"] = env.int(
+        "DJANGO_CACHE_COMPRESS_MIN_BYTES", 1024
+    )
+    if env.str("DJANGO_CACHE_COMPRESSOR", ""):
+        CACHES["default"]["OPTIONS"]["COMPRESSOR"] = env.str("DJANGO_CACHE_COMPRESSOR")
+    if env.str("DJANGO_CACHE_COMPRESS_LEVEL", ""):
+        CACHES["default"]["OPTIONS"]["COMPRESS_LEVEL"] = env.int(
+            "DJANGO_CACHE_COMPRESS_LEVEL"
+        )
+
+# Worker metrics snapshots and the retired totals get their own store: the
+# report cache above culls files at random once full, which would reset the
+# counters. It only ever holds a few keys per worker, so it is never culled.
+METRICS_CACHE_DIR = env.str("METRICS_CACHE_DIR", "") or (
+    DJANGO_CACHE_DIR.rstrip("/") + "-metrics"
+)
+CACHES["metrics"] = {
+    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+    "LOCATION": METRICS_CACHE_DIR,
+    "TIMEOUT": None,
+    "OPTIONS": {"MAX_ENTRIES": 10**9},
+}
+
+# Bearer token Prometheus must send to scrape /metrics/. When unset the
+# endpoint is only served with DEBUG on.
+METRICS_TOKEN = env.str("METRICS_TOKEN", "")
 
 # SMTP
 if os.environ.get("EMAIL_BACKEND") == "smtp":
@@ -203,9 +232,7 @@ if USE_AWS_S3:
 # Upwork API
 UPWORK_PUBLIC_KEY = env("UPWORK_PUBLIC_KEY")
 UPWORK_SECRET_KEY = env("UPWORK_SECRET_KEY")
-UPWORK_CALLBACK_URL = env(
-    "UPWORK_CALLBACK_URL"
-)
+UPWORK_CALLBACK_URL = env("UPWORK_CALLBACK_URL")
 
 # Analytics
 
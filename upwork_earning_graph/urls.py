@@ -17,7 +17,7 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path
 from .views import home, about, contact
-from upworkapi.views import auth, reports, debug
+from upworkapi.views import api, auth, export, reports, debug, metrics
 
 
 urlpatterns = [
@@ -43,6 +43,11 @@ urlpatterns = [
         reports.all_time_earning_graph,
         name="all_time_earning_graph",
     ),
+    path(
+        "earning/all-time/progress/",
+        reports.all_time_warm_progress,
+        name="all_time_warm_progress",
+    ),
     path(
         "earning/all-time-hourly/",
         reports.all_time_hourly_graph,
@@ -69,11 +74,72 @@ urlpatterns = [
         reports.earning_month_client_detail,
         name="earning_month_client_detail",
     ),
+    path(
+        "export/transactions/",
+        export.transactions,
+        name="export_transactions",
+    ),
     path("debug/session/", debug.session_dump),
+    path("debug/timing/", debug.timing_dump, name="debug_timing"),
+    path("metrics/", metrics.metrics_view, name="metrics"),
     path("earning/fixed/", reports.fixed_price_graph, name="fixed_price_graph"),
     path(
         "earning/fixed/<int:year>/<int:month>",
         reports.fixed_price_month_detail,
         name="fixed_price_month_detail",
     ),
+    path("api/v1/hourly/<int:year>/", api.hourly_year, name="api_hourly_year"),
+    path(
+        "api/v1/hourly/<int:year>/<int:month>/",
+        api.hourly_month,
+        name="api_hourly_month",
+    ),
+    path(
+        "api/v1/hourly/<int:year>/details/",
+        api.hourly_details,
+        name="api_hourly_year_details",
+    ),
+    path(
+        "api/v1/hourly/<int:year>/<int:month>/details/",
+        api.hourly_details,
+        name="api_hourly_month_details",
+    ),
+    path("api/v1/hours/<int:year>/", api.hours_year, name="api_hours_year"),
+    path("api/v1/rates/<int:year>/", api.rates_year, name="api_rates_year"),
+    path("api/v1/earnings/<int:year>/", api.earnings_year, name="api_earnings_year"),
+    path(
+        "api/v1/earnings/<int:year>/<int:month>/",
+        api.earnings_year,
+        name="api_earnings_month",
+    ),
+    path(
+        "api/v1/earnings/<int:year>/details/",
+        api.earnings_details,
+        name="api_earnings_year_details",
+    ),
+    path(
+        "api/v1/earnings/<int:year>/<int:month>/details/",
+        api.earnings_details,
+        name="api_earnings_month_details",
+    ),
+    path("api/v1/fixed/<int:year>/", api.fixed_year, name="api_fixed_year"),
+    path(
+        "api/v1/fixed/<int:year>/details/",
+        api.fixed_details,
+        name="api_fixed_year_details",
+    ),
+    path(
+        "api/v1/fixed/<int:year>/<int:month>/details/",
+        api.fixed_details,
+        name="api_fixed_month_details",
+    ),
+    path("api/v1/net/<int:year>/", api.net_year, name="api_net_year"),
+    path("api/v1/net/<int:year>/<int:month>/", api.net_year, name="api_net_month"),
+    path("api/v1/all-time/", api.all_time, name="api_all_time"),
+    path("api/v1/clients/", api.clients, name="api_clients"),
+    path(
+        "api/v1/clients/<path:client_name>/",
+        api.client_trend,
+        name="api_client_trend",
+    ),
 ]
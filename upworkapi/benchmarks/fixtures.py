@@ -0,0 +1,359 @@
+# upworkapi/benchmarks/fixtures.py
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+import json
+import random
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+@dataclass
+class FixtureDataset:
+    """Upwork-shaped payload rows served by the stub server.
+
+    `time_report` holds raw `timeReport` nodes; `transactions` maps a tenant
+    id to its raw `transactionHistoryRow` nodes. Both are kept sorted by date
+    so the server can slice date ranges cheaply.
+    """
+
+    tenants: List[str]
+    time_report: List[Dict[str, Any]] = field(default_factory=list)
+    transactions: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    join_year: int = 2010
+
+    def sort(self) -> "FixtureDataset":
+        self.time_report.sort(key=lambda r: r["dateWorkedOn"])
+        for rows in self.transactions.values():
+            rows.sort(key=lambda r: r["transactionCreationDate"])
+        return self
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "tenants": self.tenants,
+                "time_report": self.time_report,
+                "transactions": self.transactions,
+                "join_year": self.join_year,
+            }
+        )
+
+    @classmethod
+    def from_json(cls, raw: str) -> "FixtureDataset":
+        data = json.loads(raw)
+        return cls(
+            tenants=list(data["tenants"]),
+            time_report=list(data["time_report"]),
+            transactions={k: list(v) for k, v in data["transactions"].items()},
+            join_year=int(data.get("join_year") or 2010),
+        ).sort()
+
+
+# Work-period formats recognised by reports._parse_txn_work_range, keyed by
+# name; None leaves the description without a period.
+DESCRIPTION_FORMATS: Dict[str, Optional[str]] = {
+    "mdy": "%m/%d/%Y",
+    "iso": "%Y-%m-%d",
+    "month_day": "%b %d, %Y",
+    "day_month": "%d %B %Y",
+    "dmy_dash": "%d-%b-%Y",
+    "none": None,
+}
+
+
+@dataclass
+class TransactionMix:
+    """Shape of the generated transaction history.
+
+    The weights split earning rows between hourly invoices and fixed-price
+    kinds. Every earning is followed by a service fee of `service_fee_rate`
+    times its amount (0 disables fees). Membership is charged monthly and
+    connects are bought `connects_per_month` times a month on average.
+    """
+
+    hourly: float = 0.5
+    fixed: float = 0.3
+    bonus: float = 0.1
+    milestone: float = 0.1
+    service_fee_rate: float = 0.1
+    membership_fee: float = 14.99
+    connects_per_month: float = 2.0
+    connects_price: float = 0.15
+
+    def earning_kinds(self) -> Tuple[List[str], List[float]]:
+        kinds = ["hourly", "fixed", "bonus", "milestone"]
+        return kinds, [max(getattr(self, k), 0.0) for k in kinds]
+
+
+def _money(amount: float) -> Dict[str, Any]:
+    raw = "%.2f" % amount
+    return {"rawValue": raw, "currency": "USD", "displayValue": "$" + raw}
+
+
+def time_report_node(day: date, client: str, hours: float, rate: float) -> Dict:
+    return {
+        "dateWorkedOn": day.isoformat(),
+        "totalCharges": round(hours * rate, 2),
+        "totalHoursWorked": hours,
+        "memo": "Work on %s" % client,
+        "contract": {"offer": {"client": {"name": client}}},
+    }
+
+
+def transaction_node(
+    day: date, client: str, kind: str, description: str, amount: float
+) -> Dict:
+    return {
+        "transactionCreationDate": day.isoformat() + "T12:00:00.000Z",
+        "relatedAccountingEntity": None,
+        "description": description,
+        "descriptionUI": description,
+        "type": kind,
+        "accountingSubtype": kind,
+        "transactionAmount": _money(amount),
+        "payment": _money(amount),
+        "assignmentCompanyName": client,
+        "assignmentAgencyName": None,
+        "assignmentDeveloperName": None,
+    }
+
+
+def _work_period(day: date, fmt: Optional[str]) -> str:
+    """The Mon-Sun week before `day`, formatted like an Upwork invoice."""
+    if fmt is None:
+        return ""
+    end = day - timedelta(days=day.weekday() + 1)
+    start = end - timedelta(days=6)
+    return " (%s - %s)" % (start.strftime(fmt), end.strftime(fmt))
+
+
+def _earning_nodes(
+    rnd: random.Random,
+    day: date,
+    client: str,
+    kind: str,
+    rate: float,
+    mix: TransactionMix,
+    fmt: Optional[str],
+) -> List[Dict]:
+    if kind == "hourly":
+        hours = round(rnd.uniform(2, 40), 2)
+        amount = round(hours * rate, 2)
+        description = "Invoice for %s hrs @ $%.2f/hr%s" % (
+            hours,
+            rate,
+            _work_period(day, fmt),
+        )
+        nodes = [transaction_node(day, client, "APInvoice", description, amount)]
+    else:
+        label = {"fixed": "Fixed Price", "bonus": "Bonus", "milestone": "Milestone"}
+        amount = round(rnd.uniform(100, 2500), 2)
+        description = "%s payment - %s" % (label[kind], client)
+        nodes = [transaction_node(day, client, label[kind], description, amount)]
+    if mix.service_fee_rate > 0:
+        nodes.append(
+            transaction_node(
+                day,
+                client,
+                "Service Fee",
+                "Service Fee - %s" % description,
+                -round(amount * mix.service_fee_rate, 2),
+            )
+        )
+    return nodes
+
+
+def _monthly_charges(
+    rnd: random.Random, start: date, end: date, mix: TransactionMix
+) -> List[Dict]:
+    nodes = []
+    month = date(start.year, start.month, 1)
+    while month <= end:
+        if mix.membership_fee > 0:
+            nodes.append(
+                transaction_node(
+                    month,
+                    "Upwork",
+                    "Charge",
+                    "Fees for Freelancer Plus Membership",
+                    -mix.membership_fee,
+                )
+            )
+        purchases = int(mix.connects_per_month) + (
+            1 if rnd.random() < mix.connects_per_month % 1 else 0
+        )
+        for _ in range(purchases):
+            day = month + timedelta(days=rnd.randrange(28))
+            if day > end:
+                continue
+            count = rnd.choice([10, 20, 40, 80])
+            nodes.append(
+                transaction_node(
+                    day,
+                    "Upwork",
+                    "Charge",
+                    "Fees for additional connects (%s)" % count,
+                    -round(count * mix.connects_price, 2),
+                )
+            )
+        month = (month + timedelta(days=32)).replace(day=1)
+    return nodes
+
+
+def build_dataset(
+    *,
+    years: int = 3,
+    transactions: int = 1000,
+    time_entries_per_day: float = 1.0,
+    tenants: int = 1,
+    clients: int = 8,
+    mix: Optional[TransactionMix] = None,
+    description_formats: Sequence[str] = tuple(DESCRIPTION_FORMATS),
+    end_year: Optional[int] = None,
+    seed: int = 1,
+) -> FixtureDataset:
+    """Deterministic dataset: hourly time entries plus a transaction history.
+
+    `transactions` earning rows are split evenly across tenants and spread
+    uniformly over the years, each with its service fee per `mix`; monthly
+    membership and connects charges go to the first tenant. Hourly invoice
+    descriptions carry a work period in one of `description_formats`.
+    """
+    rnd = random.Random(seed)
+    mix = mix or TransactionMix()
+    formats = [DESCRIPTION_FORMATS[name] for name in description_formats] or [None]
+    end_year = end_year or date.today().year
+    start = date(end_year - years + 1, 1, 1)
+    end = min(date(end_year, 12, 31), date.today())
+    span_days = max((end - start).days, 1)
+    client_names = ["Client %02d" % i for i in range(1, clients + 1)]
+    rates = {c: rnd.choice([25.0, 40.0, 55.0, 75.0]) for c in client_names}
+    tenant_ids = ["tenant-%d" % i for i in range(1, tenants + 1)]
+
+    dataset = FixtureDataset(tenants=tenant_ids, join_year=start.year)
+    day = start
+    while day <= end:
+        if day.weekday() < 5:
+            count = int(time_entries_per_day) + (
+                1 if rnd.random() < time_entries_per_day % 1 else 0
+            )
+            for _ in range(count):
+                client = rnd.choice(client_names)
+                hours = round(rnd.uniform(0.5, 8.0), 2)
+                dataset.time_report.append(
+                    time_report_node(day, client, hours, rates[client])
+                )
+        day += timedelta(days=1)
+
+    kinds, weights = mix.earning_kinds()
+    for i in range(transactions):
+        tenant = tenant_ids[i % len(tenant_ids)]
+        day = start + timedelta(days=rnd.randrange(span_days + 1))
+        client = rnd.choice(client_names)
+        kind = rnd.choices(kinds, weights)[0]
+        dataset.transactions.setdefault(tenant, []).extend(
+            _earning_nodes(
+                rnd, day, client, kind, rates[client], mix, rnd.choice(formats)
+            )
+        )
+    dataset.transactions.setdefault(tenant_ids[0], []).extend(
+        _monthly_charges(rnd, start, end, mix)
+    )
+    return dataset.sort()
+
+
+def seed_cache(
+    dataset: FixtureDataset,
+    *,
+    user_id: int,
+    tenant_id: Optional[str] = None,
+    years: Optional[Sequence[int]] = None,
+) -> int:
+    """Store the dataset as the per-year row caches the reports read.
+
+    Rows are normalized exactly as a live fetch would, so report views and
+    aggregation helpers can be driven without any upstream server. Returns
+    the number of cache entries written.
+    """
+    from upworkapi.services.transactions import transaction_history_row
+    from upworkapi.views import reports
+
+    tenant_id = tenant_id or dataset.tenants[0]
+    if years is None:
+        years = range(dataset.join_year, date.today().year + 1)
+    txn_rows = [
+        transaction_history_row(r) for r in dataset.transactions.get(tenant_id, [])
+    ]
+    time_rows = [reports._time_report_row(r) for r in dataset.time_report]
+    now = time.time()
+    written = 0
+    for year in years:
+        prefix = str(year)
+        reports._store_year_rows(
+            reports._time_report_year_key(user_id, year),
+            year,
+            [r for r in time_rows if r["date"].startswith(prefix)],
+            refreshed_at=now,
+        )
+        reports._store_year_rows(
+            reports._transaction_history_year_key(
+                user_id, tenant_id=tenant_id, tenant_ids=None, year=year
+            ),
+            year,
+            [r for r in txn_rows if reports._txn_row_date(r).startswith(prefix)],
+            refreshed_at=now,
+        )
+        written += 2
+    return written
+
+
+def add_dataset_arguments(parser) -> None:
+    """Generator options shared by the benchmark management commands."""
+    parser.add_argument("--dataset", help="Load a saved dataset JSON instead.")
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument(
+        "--transactions",
+        type=int,
+        default=10000,
+        help="Earning rows; fees and monthly charges are added on top.",
+    )
+    parser.add_argument("--time-entries-per-day", type=float, default=1.5)
+    parser.add_argument("--tenants", type=int, default=1)
+    parser.add_argument("--clients", type=int, default=12)
+    parser.add_argument("--service-fee-rate", type=float, default=0.1)
+    parser.add_argument("--membership-fee", type=float, default=14.99)
+    parser.add_argument("--connects-per-month", type=float, default=2.0)
+    parser.add_argument(
+        "--description-formats",
+        default=",".join(DESCRIPTION_FORMATS),
+        help="Comma separated work-period formats: %s."
+        % ", ".join(DESCRIPTION_FORMATS),
+    )
+    parser.add_argument("--seed", type=int, default=1)
+
+
+def dataset_from_options(options: Dict[str, Any]) -> FixtureDataset:
+    if options.get("dataset"):
+        with open(options["dataset"]) as fh:
+            return FixtureDataset.from_json(fh.read())
+    formats = [
+        f.strip() for f in options["description_formats"].split(",") if f.strip()
+    ]
+    unknown = sorted(set(formats) - set(DESCRIPTION_FORMATS))
+    if unknown:
+        raise ValueError("Unknown description formats: %s" % ", ".join(unknown))
+    return build_dataset(
+        years=options["years"],
+        transactions=options["transactions"],
+        time_entries_per_day=options["time_entries_per_day"],
+        tenants=options["tenants"],
+        clients=options["clients"],
+        mix=TransactionMix(
+            service_fee_rate=options["service_fee_rate"],
+            membership_fee=options["membership_fee"],
+            connects_per_month=options["connects_per_month"],
+        ),
+        description_formats=formats,
+        seed=options["seed"],
+    )
@@ -0,0 +1,237 @@
+# upworkapi/benchmarks/load.py
+from __future__ import annotations
+
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+import math
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from upworkapi.benchmarks.runner import (
+    BENCH_USER_ID,
+    bench_user,
+    call_view,
+    session_for,
+)
+from upworkapi.benchmarks.stub_server import StubUpworkServer, upstream_summary
+
+
+@dataclass
+class LoadStep:
+    name: str
+    path: str
+
+
+@dataclass
+class Sample:
+    step: str
+    wait_ms: float
+    service_ms: float
+    ok: bool
+    error: str = ""
+
+    @property
+    def total_ms(self) -> float:
+        return self.wait_ms + self.service_ms
+
+
+def default_journey(year: int, month: int) -> List[LoadStep]:
+    """Annual -> monthly -> all-time -> fixed, as a user browses the site."""
+    return [
+        LoadStep("annual", "/earning/total/%s" % year),
+        LoadStep("monthly", "/earning/all-time/%s/%s" % (year, month)),
+        LoadStep("all_time", "/earning/all-time/"),
+        LoadStep("fixed", "/earning/fixed/?year=%s" % year),
+    ]
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile; None for no values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class _WorkerPool:
+    """A fixed pool of sync workers, like gunicorn's, with a shared backlog.
+
+    Each worker serves one request at a time; requests beyond that wait in
+    the backlog. Busy time and backlog depth are tracked for saturation.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="load_worker"
+        )
+        self._lock = threading.Lock()
+        self.busy_seconds = 0.0
+        self.queued = 0
+        self.max_queued = 0
+
+    def serve(self, path: str, user, session) -> Sample:
+        submitted = time.perf_counter()
+        with self._lock:
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+
+        def work():
+            started = time.perf_counter()
+            with self._lock:
+                self.queued -= 1
+            error = ""
+            try:
+                call_view(path, user=user, session=session)
+            except Exception as exc:
+                error = "%s: %s" % (type(exc).__name__, exc)
+            finished = time.perf_counter()
+            with self._lock:
+                self.busy_seconds += finished - started
+            return started, finished, error
+
+        started, finished, error = self._executor.submit(work).result()
+        return Sample(
+            step="",
+            wait_ms=(started - submitted) * 1000.0,
+            service_ms=(finished - started) * 1000.0,
+            ok=not error,
+            error=error,
+        )
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+@dataclass
+class LoadReport:
+    sessions: int
+    workers: int
+    wall_seconds: float
+    busy_seconds: float
+    max_queued: int
+    timeout: float
+    samples: List[Sample] = field(default_factory=list)
+    upstream_calls: Dict[str, int] = field(default_factory=dict)
+    upstream_bytes: int = 0
+
+    @property
+    def saturation(self) -> float:
+        capacity = self.workers * self.wall_seconds
+        return self.busy_seconds / capacity if capacity else 0.0
+
+    def _stats(self, samples: List[Sample]) -> Dict[str, Any]:
+        totals = [s.total_ms for s in samples]
+        waits = [s.wait_ms for s in samples]
+
+        def rounded(value):
+            return None if value is None else round(value, 1)
+
+        return {
+            "requests": len(samples),
+            "errors": sum(1 for s in samples if not s.ok),
+            "timeouts": sum(1 for s in samples if s.service_ms > self.timeout * 1000),
+            "p50_ms": rounded(percentile(totals, 50)),
+            "p95_ms": rounded(percentile(totals, 95)),
+            "p99_ms": rounded(percentile(totals, 99)),
+            "max_ms": rounded(max(totals) if totals else None),
+            "wait_p95_ms": rounded(percentile(waits, 95)),
+        }
+
+    def as_dict(self) -> Dict[str, Any]:
+        by_step: Dict[str, List[Sample]] = defaultdict(list)
+        for s in self.samples:
+            by_step[s.step].append(s)
+        errors = sorted({s.error for s in self.samples if s.error})
+        return {
+            "sessions": self.sessions,
+            "workers": self.workers,
+            "wall_seconds": round(self.wall_seconds, 3),
+            "throughput_rps": (
+                round(len(self.samples) / self.wall_seconds, 2)
+                if self.wall_seconds
+                else 0.0
+            ),
+            "saturation": round(self.saturation, 3),
+            "max_queued": self.max_queued,
+            "overall": self._stats(self.samples),
+            "steps": {name: self._stats(rows) for name, rows in by_step.items()},
+            "upstream_calls": dict(self.upstream_calls),
+            "upstream_total": sum(self.upstream_calls.values()),
+            "upstream_bytes": self.upstream_bytes,
+            "errors": errors[:20],
+        }
+
+
+def _wait_for_warm_jobs(deadline: float) -> None:
+    # Cold all-time pages hand off to background threads; their Upwork calls
+    # are part of the cost of the run.
+    for t in threading.enumerate():
+        if t.name == "all_time_warm":
+            t.join(max(0.0, deadline - time.monotonic()))
+
+
+def run_load(
+    server: StubUpworkServer,
+    journey: List[LoadStep],
+    *,
+    sessions: int = 10,
+    workers: int = 4,
+    rounds: int = 1,
+    ramp_seconds: float = 0.0,
+    think_seconds: float = 0.0,
+    timeout: float = 120.0,
+    tenant_id: Optional[str] = None,
+) -> LoadReport:
+    """Drive `sessions` concurrent users through `journey` on `workers`.
+
+    Every session is a distinct user (so its caches start cold) walking the
+    journey `rounds` times; sessions start evenly spread over `ramp_seconds`.
+    """
+    pool = _WorkerPool(workers)
+    samples: List[Sample] = []
+    samples_lock = threading.Lock()
+    server.reset_counters()
+
+    def browse(index: int):
+        if ramp_seconds and sessions > 1:
+            time.sleep(ramp_seconds * index / (sessions - 1))
+        user = bench_user(BENCH_USER_ID + index)
+        session = session_for(tenant_id)
+        for _ in range(rounds):
+            for step in journey:
+                sample = pool.serve(step.path, user, session)
+                sample.step = step.name
+                with samples_lock:
+                    samples.append(sample)
+                if think_seconds:
+                    time.sleep(think_seconds)
+
+    started = time.perf_counter()
+    threads = [
+        threading.Thread(target=browse, args=(i,), name="load_session_%d" % i)
+        for i in range(sessions)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - started
+    pool.shutdown()
+    _wait_for_warm_jobs(time.monotonic() + timeout)
+
+    _total, calls, sent = upstream_summary(server)
+    return LoadReport(
+        sessions=sessions,
+        workers=workers,
+        wall_seconds=wall,
+        busy_seconds=pool.busy_seconds,
+        max_queued=pool.max_queued,
+        timeout=timeout,
+        samples=samples,
+        upstream_calls=calls,
+        upstream_bytes=sent,
+    )
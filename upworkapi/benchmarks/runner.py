@@ -0,0 +1,214 @@
+# upworkapi/benchmarks/runner.py
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date
+import statistics
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from django.contrib.auth.models import User
+from django.contrib.messages.storage import default_storage
+from django.contrib.sessions.backends.cache import SessionStore
+from django.core.cache import cache
+from django.template.response import TemplateResponse
+from django.test import RequestFactory
+from django.urls import resolve
+
+from upworkapi.benchmarks.stub_server import StubUpworkServer, upstream_summary
+
+BENCH_USER_ID = 900001
+
+# Benchmarks never touch the configured cache (and its real users' data).
+BENCH_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "upworkapi-benchmark",
+        "OPTIONS": {"MAX_ENTRIES": 100000},
+    },
+    "metrics": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "upworkapi-benchmark-metrics",
+    },
+}
+
+
+@dataclass
+class CaseResult:
+    name: str
+    cold_ms: List[float] = field(default_factory=list)
+    warm_ms: List[float] = field(default_factory=list)
+    upstream_calls: int = 0
+    upstream_bytes: int = 0
+    response_bytes: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        def median(values):
+            return round(statistics.median(values), 2) if values else None
+
+        return {
+            "cold_ms": median(self.cold_ms),
+            "warm_ms": median(self.warm_ms),
+            "cold_runs": [round(v, 2) for v in self.cold_ms],
+            "warm_runs": [round(v, 2) for v in self.warm_ms],
+            "upstream_calls": self.upstream_calls,
+            "upstream_bytes": self.upstream_bytes,
+            "response_bytes": self.response_bytes,
+        }
+
+
+def bench_user(user_id: int = BENCH_USER_ID) -> User:
+    # Unsaved: views only read id/username, so no database is needed.
+    return User(id=user_id, username="bench-%s" % user_id)
+
+
+def session_for(tenant_id: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        "token": {
+            "access_token": "bench",
+            "refresh_token": "bench",
+            "expires_at": time.time() + 86400,
+        },
+        "access_token": "bench",
+        "tenant_id": tenant_id,
+        "freelancer_reference": "~bench",
+    }
+
+
+def call_view(path: str, *, user: User, session: Dict[str, Any]):
+    """Run the view for `path` directly (no middleware) and render it."""
+    request = RequestFactory().get(path)
+    request.user = user
+    request.session = SessionStore()
+    request.session.update(session)
+    request._messages = default_storage(request)
+    match = resolve(request.path_info)
+    response = match.func(request, *match.args, **match.kwargs)
+    if response.status_code != 200:
+        raise RuntimeError("%s returned HTTP %s" % (path, response.status_code))
+    if isinstance(response, TemplateResponse) and not response.is_rendered:
+        response.render()
+    warnings = [str(m) for m in request._messages if m.level_tag == "warning"]
+    if warnings:
+        raise RuntimeError("%s warned: %s" % (path, "; ".join(warnings)))
+    return response
+
+
+def _response_size(response) -> int:
+    if getattr(response, "streaming", False):
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return len(response.content)
+
+
+def view_case(name: str, path: str) -> "BenchCase":
+    def run(ctx: "BenchContext"):
+        return _response_size(call_view(path, user=ctx.user, session=ctx.session))
+
+    return BenchCase(name, run)
+
+
+@dataclass
+class BenchCase:
+    name: str
+    run: Callable[["BenchContext"], Optional[int]]
+
+
+@dataclass
+class BenchContext:
+    server: StubUpworkServer
+    user: User
+    session: Dict[str, Any]
+    year: int
+
+
+def default_cases(year: int, years: List[int]) -> List[BenchCase]:
+    from upworkapi.services.transactions import fetch_transaction_history_rows
+    from upworkapi.views import reports
+
+    def txn_rows(ctx):
+        fetch_transaction_history_rows(
+            token=ctx.session["token"],
+            tenant_id=ctx.session["tenant_id"],
+            start_date=date(ctx.year, 1, 1),
+            end_date=date(ctx.year, 12, 31),
+        )
+
+    def time_report_rows(ctx):
+        reports._fetch_time_report(
+            ctx.session["token"], "%s0101" % ctx.year, "%s1231" % ctx.year
+        )
+
+    def warm_all_time(ctx):
+        req = reports._request_stub(ctx.user.id)
+        for y in years:
+            reports._cached_all_time_year_summary(
+                req,
+                token=ctx.session["token"],
+                tenant_id=ctx.session["tenant_id"],
+                tenant_ids=None,
+                freelancer_reference=ctx.session["freelancer_reference"],
+                year=y,
+            )
+
+    return [
+        BenchCase("service:transaction_history_year", txn_rows),
+        BenchCase("service:time_report_year", time_report_rows),
+        BenchCase("service:all_time_warm", warm_all_time),
+        view_case("view:earning_graph", "/earning/?year=%s" % year),
+        view_case("view:total_earning_year", "/earning/total/%s" % year),
+        view_case("view:total_earning_trx", "/earning/total/?year=%s" % year),
+        view_case("view:fixed_price_graph", "/earning/fixed/?year=%s" % year),
+        view_case("view:timereport_graph", "/timereport/"),
+        view_case("view:all_time_hourly", "/earning/all-time-hourly/"),
+    ]
+
+
+def run_cases(
+    ctx: BenchContext, cases: List[BenchCase], *, repeat: int = 3
+) -> Dict[str, CaseResult]:
+    """Time each case `repeat` times cold (empty cache) and then warm."""
+    results: Dict[str, CaseResult] = {}
+    for case in cases:
+        result = CaseResult(case.name)
+        for i in range(repeat):
+            cache.clear()
+            ctx.server.reset_counters()
+            start = time.perf_counter()
+            size = case.run(ctx)
+            result.cold_ms.append((time.perf_counter() - start) * 1000.0)
+            if i == 0:
+                result.upstream_calls, _calls, result.upstream_bytes = upstream_summary(
+                    ctx.server
+                )
+                result.response_bytes = size or 0
+
+            start = time.perf_counter()
+            case.run(ctx)
+            result.warm_ms.append((time.perf_counter() - start) * 1000.0)
+        results[case.name] = result
+    return results
+
+
+def compare(
+    current: Dict[str, Any], baseline: Dict[str, Any], *, threshold: float = 0.2
+) -> List[str]:
+    """Describe cases whose median got slower than `threshold` (fraction)."""
+    regressions = []
+    for name, now in current.get("cases", {}).items():
+        before = baseline.get("cases", {}).get(name)
+        if not before:
+            continue
+        for metric in ("cold_ms", "warm_ms"):
+            old, new = before.get(metric), now.get(metric)
+            # Ignore sub-5ms jitter; it is noise at this resolution.
+            if old and new and new > old * (1 + threshold) and new - old > 5:
+                regressions.append(
+                    "%s %s: %.1fms -> %.1fms (+%.0f%%)"
+                    % (name, metric, old, new, (new / old - 1) * 100)
+                )
+        if now.get("upstream_calls", 0) > before.get("upstream_calls", 0):
+            regressions.append(
+                "%s upstream_calls: %s -> %s"
+                % (name, before.get("upstream_calls"), now.get("upstream_calls"))
+            )
+    return regressions
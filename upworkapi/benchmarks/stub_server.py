@@ -0,0 +1,229 @@
+# upworkapi/benchmarks/stub_server.py
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import re
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from upworkapi import utils
+from upworkapi.benchmarks.fixtures import FixtureDataset
+
+UPWORK_HOSTS = ("api.upwork.com", "www.upwork.com")
+
+_RANGE_RE = re.compile(r'rangeStart:\s*"(\d{8})",\s*rangeEnd:\s*"(\d{8})"')
+_ACE_ALIAS_RE = re.compile(r"(\w+)\s*:\s*(accountingEntities|accountingEntity)\b")
+
+
+def _iso(ymd: str) -> str:
+    return "%s-%s-%s" % (ymd[:4], ymd[4:6], ymd[6:8])
+
+
+class _DateIndex:
+    """Sorted date keys for slicing a date-ordered row list."""
+
+    def __init__(self, rows: List[Dict[str, Any]], field: str):
+        self.rows = rows
+        self.keys = [str(r.get(field) or "")[:10] for r in rows]
+
+    def between(self, start: str, end: str) -> List[Dict[str, Any]]:
+        lo = bisect_left(self.keys, start[:10])
+        hi = bisect_right(self.keys, end[:10])
+        return self.rows[lo:hi]
+
+
+class StubUpworkServer:
+    """Local HTTP server answering the GraphQL operations this app sends.
+
+    Responses are built from a FixtureDataset. `calls` counts requests per
+    operation and `bytes_sent` tracks payload volume, so benchmarks can
+    report upstream cost next to latency. `latency` adds a fixed delay per
+    call to approximate the real API's round trip.
+    """
+
+    def __init__(self, dataset: FixtureDataset, *, latency: float = 0.0):
+        self.dataset = dataset
+        self.latency = latency
+        self.calls: Counter = Counter()
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self._time_index = _DateIndex(dataset.time_report, "dateWorkedOn")
+        self._txn_index = {
+            tenant: _DateIndex(rows, "transactionCreationDate")
+            for tenant, rows in dataset.transactions.items()
+        }
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return "http://%s:%s" % (host, port)
+
+    def start(self) -> "StubUpworkServer":
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                self._reply(server.handle(self.path, self.headers, body))
+
+            def do_GET(self):
+                self._reply(server.handle(self.path, self.headers, b""))
+
+            def _reply(self, payload):
+                raw = json.dumps(payload).encode("utf-8")
+                with server._lock:
+                    server.bytes_sent += len(raw)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(raw)))
+                self.end_headers()
+                self.wfile.write(raw)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="stub_upwork", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self) -> "StubUpworkServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.calls.clear()
+            self.bytes_sent = 0
+
+    def _count(self, operation: str) -> None:
+        with self._lock:
+            self.calls[operation] += 1
+
+    def handle(self, path: str, headers, body: bytes) -> Dict[str, Any]:
+        if self.latency:
+            time.sleep(self.latency)
+        if not path.rstrip("/").endswith("/graphql"):
+            self._count("rest")
+            return {}
+        try:
+            request = json.loads(body or b"{}")
+        except ValueError:
+            return {"errors": [{"message": "invalid JSON"}]}
+        query = request.get("query") or ""
+        variables = request.get("variables") or {}
+        tenant = headers.get("X-Upwork-API-TenantId") or self.dataset.tenants[0]
+
+        if "timeReport" in query:
+            self._count("timeReport")
+            return self._time_report(query)
+        if _ACE_ALIAS_RE.search(query):
+            self._count("accountingEntities")
+            return {
+                "data": {
+                    alias: (
+                        [{"id": "ace-" + tenant}]
+                        if field == "accountingEntities"
+                        else {"id": "ace-" + tenant}
+                    )
+                    for alias, field in _ACE_ALIAS_RE.findall(query)
+                }
+            }
+        if "transactionHistory" in query:
+            self._count("transactionHistory")
+            return self._transactions(tenant, variables)
+        if "JoinYear" in query:
+            self._count("JoinYear")
+            created = "%s-01-15T00:00:00Z" % self.dataset.join_year
+            return {"data": {"user": {"createdDateTime": {"rawValue": created}}}}
+        if "companySelector" in query:
+            self._count("companySelector")
+            items = [{"title": t, "organizationId": t} for t in self.dataset.tenants]
+            return {"data": {"companySelector": {"items": items}}}
+        self._count("other")
+        return {"data": {}}
+
+    def _time_report(self, query: str) -> Dict[str, Any]:
+        m = _RANGE_RE.search(query)
+        rows = self._time_index.between(_iso(m.group(1)), _iso(m.group(2))) if m else []
+        return {"data": {"user": {"freelancerProfile": {"user": {"timeReport": rows}}}}}
+
+    def _transactions(self, tenant: str, variables: Dict[str, Any]) -> Dict:
+        flt = variables.get("transactionHistoryFilter") or {}
+        ace_ids = flt.get("aceIds_any")
+        index = self._txn_index.get(tenant)
+        rows: List[Dict[str, Any]] = []
+        if index is not None and (not ace_ids or "ace-" + tenant in ace_ids):
+            rng = flt.get("transactionDateTime_bt") or {}
+            rows = index.between(
+                rng.get("rangeStart") or "0000", rng.get("rangeEnd") or "9999"
+            )
+        return {
+            "data": {
+                "transactionHistory": {
+                    "transactionDetail": {"transactionHistoryRow": rows}
+                }
+            }
+        }
+
+
+class _RedirectAdapter(utils.PacedHTTPAdapter):
+    """Sends requests for Upwork hosts to another base URL instead."""
+
+    def __init__(self, base_url: str, **kwargs):
+        super().__init__(**kwargs)
+        self.base_url = base_url.rstrip("/")
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        if parts.hostname in UPWORK_HOSTS:
+            request = request.copy()
+            request.url = (
+                self.base_url + parts.path + ("?" + parts.query if parts.query else "")
+            )
+        return super().send(request, **kwargs)
+
+
+@contextmanager
+def upwork_routed_to(base_url: str) -> Iterator[None]:
+    """Route every Upwork call made through `upworkapi.utils` to `base_url`.
+
+    Swaps the shared pooled adapter, so sessions created afterwards (and
+    clients from `upwork_client.get_client`) talk to the stub. The calling
+    thread's cached session is dropped so it is rebuilt on the new adapter.
+    """
+    previous = utils._http_adapter
+    utils._http_adapter = _RedirectAdapter(
+        base_url, pool_connections=4, pool_maxsize=64
+    )
+    utils._local.session = None
+    try:
+        yield
+    finally:
+        utils._http_adapter = previous
+        utils._local.session = None
+
+
+def upstream_summary(server: StubUpworkServer) -> Tuple[int, Dict[str, int], int]:
+    with server._lock:
+        return sum(server.calls.values()), dict(server.calls), server.bytes_sent
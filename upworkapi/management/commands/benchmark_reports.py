@@ -0,0 +1,114 @@
+import json
+import platform
+from datetime import date
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from upworkapi.benchmarks.fixtures import add_dataset_arguments, dataset_from_options
+from upworkapi.benchmarks.runner import (
+    BENCH_CACHES,
+    BenchContext,
+    bench_user,
+    compare,
+    default_cases,
+    run_cases,
+    session_for,
+)
+from upworkapi.benchmarks.stub_server import StubUpworkServer, upwork_routed_to
+
+
+class Command(BaseCommand):
+    help = (
+        "Time report views and service functions end to end against a local "
+        "stub Upwork server serving synthetic data."
+    )
+
+    def add_arguments(self, parser):
+        add_dataset_arguments(parser)
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=0.0,
+            help="Seconds of delay added to every stub Upwork call.",
+        )
+        parser.add_argument("--only", help="Run cases whose name contains this.")
+        parser.add_argument("--output", help="Write the JSON report here.")
+        parser.add_argument("--baseline", help="JSON report to compare against.")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.2,
+            help="Allowed slowdown vs. baseline as a fraction (default 0.2).",
+        )
+
+    def handle(self, *args, **options):
+        year = date.today().year
+        try:
+            dataset = dataset_from_options(options)
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        years = list(range(dataset.join_year, year + 1))
+        cases = default_cases(year, years)
+        if options["only"]:
+            cases = [c for c in cases if options["only"] in c.name]
+
+        with override_settings(CACHES=BENCH_CACHES), StubUpworkServer(
+            dataset, latency=options["latency"]
+        ) as server, upwork_routed_to(server.url):
+            ctx = BenchContext(
+                server=server,
+                user=bench_user(),
+                session=session_for(dataset.tenants[0]),
+                year=year,
+            )
+            results = run_cases(ctx, cases, repeat=options["repeat"])
+
+        report = {
+            "meta": {
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "dataset": options["dataset"],
+                "years": options["years"],
+                "transactions": options["transactions"],
+                "transaction_rows": sum(map(len, dataset.transactions.values())),
+                "time_entries": len(dataset.time_report),
+                "tenants": len(dataset.tenants),
+                "clients": options["clients"],
+                "repeat": options["repeat"],
+                "latency": options["latency"],
+            },
+            "cases": {name: r.as_dict() for name, r in results.items()},
+        }
+
+        self.stdout.write(
+            "%-36s %10s %10s %8s %12s"
+            % ("case", "cold ms", "warm ms", "calls", "bytes in")
+        )
+        for name, r in report["cases"].items():
+            self.stdout.write(
+                "%-36s %10.1f %10.1f %8d %12d"
+                % (
+                    name,
+                    r["cold_ms"],
+                    r["warm_ms"],
+                    r["upstream_calls"],
+                    r["upstream_bytes"],
+                )
+            )
+
+        if options["output"]:
+            with open(options["output"], "w") as fh:
+                json.dump(report, fh, indent=2, sort_keys=True)
+
+        if options["baseline"]:
+            with open(options["baseline"]) as fh:
+                baseline = json.load(fh)
+            regressions = compare(report, baseline, threshold=options["threshold"])
+            if regressions:
+                raise CommandError(
+                    "Benchmark regressions:\n  " + "\n  ".join(regressions)
+                )
+            self.stdout.write(self.style.SUCCESS("No regressions vs. baseline."))
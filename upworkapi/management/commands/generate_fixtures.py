@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from upworkapi.benchmarks.fixtures import (
+    add_dataset_arguments,
+    dataset_from_options,
+    seed_cache,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a synthetic Upwork dataset for load and scale tests, and "
+        "save it for the stub server and/or seed it into the report caches."
+    )
+
+    def add_arguments(self, parser):
+        add_dataset_arguments(parser)
+        parser.add_argument("--output", help="Write the dataset JSON here.")
+        parser.add_argument(
+            "--seed-cache",
+            action="store_true",
+            help="Store the rows as the cached time report and transaction "
+            "history of --user-id in the configured cache.",
+        )
+        parser.add_argument("--user-id", type=int)
+        parser.add_argument("--tenant", help="Tenant to seed (default: first).")
+
+    def handle(self, *args, **options):
+        if options["seed_cache"] and not options["user_id"]:
+            raise CommandError("--seed-cache needs --user-id.")
+        try:
+            dataset = dataset_from_options(options)
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        if options["tenant"] and options["tenant"] not in dataset.tenants:
+            raise CommandError("Unknown tenant %s." % options["tenant"])
+
+        self.stdout.write(
+            "%d time entries, %d transaction rows over %d tenant(s) since %d."
+            % (
+                len(dataset.time_report),
+                sum(map(len, dataset.transactions.values())),
+                len(dataset.tenants),
+                dataset.join_year,
+            )
+        )
+        if options["output"]:
+            with open(options["output"], "w") as fh:
+                fh.write(dataset.to_json())
+            self.stdout.write("Wrote %s" % options["output"])
+        if options["seed_cache"]:
+            written = seed_cache(
+                dataset, user_id=options["user_id"], tenant_id=options["tenant"]
+            )
+            self.stdout.write(
+                "Seeded %d cache entries for user %s." % (written, options["user_id"])
+            )
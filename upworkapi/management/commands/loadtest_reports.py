@@ -0,0 +1,136 @@
+import json
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from upworkapi.benchmarks.fixtures import add_dataset_arguments, dataset_from_options
+from upworkapi.benchmarks.load import default_journey, run_load
+from upworkapi.benchmarks.runner import BENCH_CACHES
+from upworkapi.benchmarks.stub_server import StubUpworkServer, upwork_routed_to
+
+
+class Command(BaseCommand):
+    help = (
+        "Simulate concurrent users browsing the report pages against a local "
+        "stub Upwork server and report latency percentiles, worker "
+        "saturation and upstream calls."
+    )
+
+    def add_arguments(self, parser):
+        add_dataset_arguments(parser)
+        parser.add_argument("--sessions", type=int, default=20)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Requests served at once (gunicorn sync workers).",
+        )
+        parser.add_argument(
+            "--rounds",
+            type=int,
+            default=1,
+            help="Times each session walks the journey; later rounds are warm.",
+        )
+        parser.add_argument("--ramp", type=float, default=0.0)
+        parser.add_argument("--think-time", type=float, default=0.0)
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=0.05,
+            help="Seconds of delay added to every stub Upwork call.",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=120.0,
+            help="Worker timeout; slower requests are counted as timeouts.",
+        )
+        parser.add_argument("--output", help="Write the JSON report here.")
+        parser.add_argument(
+            "--max-p95",
+            type=float,
+            help="Fail when the overall p95 latency (ms) exceeds this.",
+        )
+
+    def handle(self, *args, **options):
+        if options["sessions"] < 1 or options["workers"] < 1:
+            raise CommandError("--sessions and --workers must be at least 1.")
+        try:
+            dataset = dataset_from_options(options)
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        today = date.today()
+        journey = default_journey(today.year, today.month)
+
+        with override_settings(CACHES=BENCH_CACHES), StubUpworkServer(
+            dataset, latency=options["latency"]
+        ) as server, upwork_routed_to(server.url):
+            report = run_load(
+                server,
+                journey,
+                sessions=options["sessions"],
+                workers=options["workers"],
+                rounds=options["rounds"],
+                ramp_seconds=options["ramp"],
+                think_seconds=options["think_time"],
+                timeout=options["timeout"],
+                tenant_id=dataset.tenants[0],
+            ).as_dict()
+
+        self.stdout.write(
+            "%d sessions on %d workers: %.1fs wall, %.1f req/s, saturation "
+            "%.0f%%, max backlog %d"
+            % (
+                report["sessions"],
+                report["workers"],
+                report["wall_seconds"],
+                report["throughput_rps"],
+                report["saturation"] * 100,
+                report["max_queued"],
+            )
+        )
+        self.stdout.write(
+            "%-10s %6s %6s %9s %9s %9s %11s"
+            % ("step", "reqs", "errors", "p50 ms", "p95 ms", "p99 ms", "wait p95")
+        )
+        rows = list(report["steps"].items()) + [("overall", report["overall"])]
+        for name, s in rows:
+            self.stdout.write(
+                "%-10s %6d %6d %9.1f %9.1f %9.1f %11.1f"
+                % (
+                    name,
+                    s["requests"],
+                    s["errors"],
+                    s["p50_ms"] or 0,
+                    s["p95_ms"] or 0,
+                    s["p99_ms"] or 0,
+                    s["wait_p95_ms"] or 0,
+                )
+            )
+        self.stdout.write(
+            "Upstream calls: %d (%s), %d bytes"
+            % (
+                report["upstream_total"],
+                ", ".join(
+                    "%s=%d" % kv for kv in sorted(report["upstream_calls"].items())
+                ),
+                report["upstream_bytes"],
+            )
+        )
+        for error in report["errors"]:
+            self.stderr.write(error)
+
+        if options["output"]:
+            with open(options["output"], "w") as fh:
+                json.dump(report, fh, indent=2, sort_keys=True)
+
+        timeouts = report["overall"]["timeouts"]
+        if timeouts:
+            raise CommandError("%d request(s) exceeded the worker timeout." % timeouts)
+        p95 = report["overall"]["p95_ms"] or 0
+        if options["max_p95"] is not None and p95 > options["max_p95"]:
+            raise CommandError(
+                "p95 latency %.1fms exceeds --max-p95 %.1fms."
+                % (p95, options["max_p95"])
+            )
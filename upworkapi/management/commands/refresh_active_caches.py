@@ -0,0 +1,154 @@
+from concurrent.futures import ThreadPoolExecutor
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from oauthlib.oauth2 import InvalidGrantError, MissingTokenError
+
+from upworkapi.services import activity, metrics
+from upworkapi.services.tokens import fresh_token
+from upworkapi.utils import pace_upwork_calls
+from upworkapi.views.reports import _refresh_user_caches
+
+
+class Command(BaseCommand):
+    help = (
+        "Refresh report caches (current year, all-time rollup) of users "
+        "active in the last --days, with bounded parallelism and a shared "
+        "Upwork call rate limit. Runs once, or every --interval seconds."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=float, default=7)
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=2,
+            help="Users refreshed at the same time.",
+        )
+        parser.add_argument(
+            "--rate",
+            type=float,
+            default=2.0,
+            help="Upwork calls per second across all jobs (0: unlimited).",
+        )
+        parser.add_argument("--burst", type=int, default=4)
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0,
+            help="Repeat every this many seconds instead of running once.",
+        )
+        parser.add_argument(
+            "--no-all-time",
+            action="store_true",
+            help="Skip warming the all-time rollup.",
+        )
+        parser.add_argument("--user", action="append", help="Only these user ids.")
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        if options["concurrency"] < 1:
+            raise CommandError("--concurrency must be at least 1.")
+        pace_upwork_calls(options["rate"] or None, options["burst"])
+        try:
+            while True:
+                self.run_once(options)
+                if not options["interval"]:
+                    break
+                time.sleep(options["interval"])
+        finally:
+            pace_upwork_calls(None)
+            metrics.flush(force=True)
+
+    def run_once(self, options):
+        users = activity.active_users(options["days"])
+        if options["user"]:
+            users = [(u, p) for u, p in users if u in options["user"]]
+        self.stdout.write(
+            "%d user(s) active in the last %g day(s)." % (len(users), options["days"])
+        )
+        if options["dry_run"] or not users:
+            return {}
+
+        # Resolve fallbacks here; worker threads only read their stored token.
+        missing = [u for u, p in users if not p.get("freelancer_reference")]
+        usernames = {
+            str(pk): username
+            for pk, username in User.objects.filter(pk__in=missing).values_list(
+                "pk", "username"
+            )
+        }
+        users = [
+            (
+                u,
+                dict(
+                    p,
+                    freelancer_reference=p.get("freelancer_reference")
+                    or usernames.get(u),
+                ),
+            )
+            for u, p in users
+        ]
+
+        started = time.monotonic()
+        with ThreadPoolExecutor(
+            max_workers=options["concurrency"], thread_name_prefix="refresh"
+        ) as pool:
+            results = dict(
+                zip(
+                    [u for u, _p in users],
+                    pool.map(
+                        lambda item: self.refresh_user(*item, options=options), users
+                    ),
+                )
+            )
+
+        counts = {}
+        for user_id, result in results.items():
+            label = result.split(":")[0]
+            counts[label] = counts.get(label, 0) + 1
+            metrics.inc("upworkapi_scheduled_refreshes_total", result=label)
+            if result not in ("refreshed", "busy"):
+                self.stderr.write("user %s: %s" % (user_id, result))
+        self.stdout.write(
+            "Done in %.1fs: %s"
+            % (
+                time.monotonic() - started,
+                ", ".join("%s=%d" % kv for kv in sorted(counts.items())),
+            )
+        )
+        return results
+
+    def refresh_user(self, user_id, profile, *, options):
+        try:
+            return self._refresh_user(user_id, profile, options=options)
+        finally:
+            # fresh_token() reads the stored grant on this pool thread.
+            connections.close_all()
+
+    def _refresh_user(self, user_id, profile, *, options):
+        try:
+            token = fresh_token(user_id)
+        except (InvalidGrantError, MissingTokenError):
+            return "expired"
+        if token is None:
+            return "no_token"
+        freelancer_reference = profile.get("freelancer_reference")
+        if not freelancer_reference:
+            return "no_user"
+        try:
+            done = _refresh_user_caches(
+                user_id,
+                token=token,
+                tenant_id=profile.get("tenant_id"),
+                tenant_ids=profile.get("tenant_ids"),
+                freelancer_reference=freelancer_reference,
+                all_time=not options["no_all_time"],
+            )
+        except (InvalidGrantError, MissingTokenError):
+            return "expired"
+        except Exception as exc:
+            return "error: %s" % exc
+        return "refreshed" if done else "busy"
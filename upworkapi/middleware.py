@@ -2,12 +2,33 @@ import time
 
 from django.conf import settings
 from django.contrib import messages
+from django.contrib.auth import SESSION_KEY
 from django.shortcuts import redirect
 from oauthlib.oauth2 import InvalidGrantError, MissingTokenError
-from requests_oauthlib import OAuth2Session
 
+from upworkapi.services import activity, metrics, timing
+from upworkapi.services.tokens import fresh_token
+
+# Paths that never talk to Upwork. Requests for them skip the session (and
+# the token check) entirely.
+TOKEN_EXEMPT_PREFIXES = (
+    "/static/",
+    "/auth",
+    "/callback",
+    "/logout/",
+    "/admin/",
+    "/about/",
+    "/contact/",
+    "/debug/",
+    "/earning/all-time/progress/",
+    "/metrics/",
+)
+TOKEN_EXEMPT_PATHS = ("/",)
+
+
+class RequestTimingMiddleware:
+    """Collect per-request spans and expose them as a Server-Timing header."""
 
-class UpworkTokenRefreshMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
 
@@ -15,64 +36,84 @@ class UpworkTokenRefreshMiddleware:
         if request.path.startswith("/static/"):
             return self.get_response(request)
 
-        if request.path.startswith("/auth") or request.path.startswith("/callback"):
+        timing.begin()
+        try:
+            response = self.get_response(request)
+        finally:
+            summary = timing.end()
+        response["Server-Timing"] = timing.server_timing(summary)
+        summary.update(
+            path=request.path,
+            status=response.status_code,
+            user_id=getattr(getattr(request, "user", None), "id", None),
+        )
+        timing.remember(summary)
+        metrics.flush()
+        return response
+
+    def process_template_response(self, request, response):
+        start = time.perf_counter()
+
+        def _rendered(response):
+            timing.record(
+                "render",
+                (
+                    response.template_name
+                    if isinstance(response.template_name, str)
+                    else "template"
+                ),
+                (time.perf_counter() - start) * 1000.0,
+            )
+
+        response.add_post_render_callback(_rendered)
+        return response
+
+
+class UpworkTokenRefreshMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if _is_token_exempt(request):
             return self.get_response(request)
 
         token = request.session.get("token")
         if not isinstance(token, dict):
             return self.get_response(request)
 
-        _ensure_expires_at(token)
-        if _needs_refresh(token):
-            try:
-                refreshed = _refresh_token(token)
-                request.session["token"] = refreshed
-                access_token = refreshed.get("access_token") or refreshed.get("token")
-                if access_token:
-                    request.session["access_token"] = access_token
-            except (InvalidGrantError, MissingTokenError):
-                _clear_token_session(request)
-                messages.warning(
-                    request, "Session expired. Please login again to continue."
-                )
-                return redirect("auth")
-
+        try:
+            refreshed = fresh_token(token_owner(request), token)
+        except (InvalidGrantError, MissingTokenError):
+            _clear_token_session(request)
+            messages.warning(
+                request, "Session expired. Please login again to continue."
+            )
+            return redirect("auth")
+
+        if refreshed is not None and refreshed is not token:
+            request.session["token"] = refreshed
+            access_token = refreshed.get("access_token") or refreshed.get("token")
+            if access_token:
+                request.session["access_token"] = access_token
+
+        activity.touch(request.session.get(SESSION_KEY), request.session)
         return self.get_response(request)
 
 
-def _ensure_expires_at(token):
-    if "expires_at" in token:
-        return
-    expires_in = token.get("expires_in")
-    if expires_in is None:
-        return
-    try:
-        token["expires_at"] = time.time() + int(expires_in)
-    except (TypeError, ValueError):
-        return
-
-
-def _needs_refresh(token, leeway_seconds=120):
-    expires_at = token.get("expires_at")
-    if not expires_at:
-        return False
-    try:
-        return time.time() >= float(expires_at) - leeway_seconds
-    except (TypeError, ValueError):
-        return False
-
-
-def _refresh_token(token):
-    refresh_token = token.get("refresh_token")
-    if not refresh_token:
-        raise MissingTokenError(description="Missing refresh token.")
-    session = OAuth2Session(settings.UPWORK_PUBLIC_KEY, token=token)
-    return session.refresh_token(
-        "https://www.upwork.com/api/v3/oauth2/token",
-        refresh_token=refresh_token,
-        client_id=settings.UPWORK_PUBLIC_KEY,
-        client_secret=settings.UPWORK_SECRET_KEY,
-    )
+def token_owner(request):
+    """Key under which a session's Upwork token is shared and refreshed."""
+    user_id = request.session.get(SESSION_KEY)
+    if user_id:
+        return user_id
+    return "session-%s" % request.session.session_key
+
+
+def _is_token_exempt(request):
+    path = request.path
+    if path in TOKEN_EXEMPT_PATHS or path.startswith(TOKEN_EXEMPT_PREFIXES):
+        return True
+    # No session cookie means no token; don't load an empty session for it.
+    return settings.SESSION_COOKIE_NAME not in request.COOKIES
 
 
 def _clear_token_session(request):
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.29 on 2026-10-19 01:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="UpworkGrant",
+            fields=[
+                (
+                    "owner",
+                    models.CharField(max_length=64, primary_key=True, serialize=False),
+                ),
+                ("refresh_token", models.TextField()),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.29 on 2026-10-19 01:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("upworkapi", "0001_upwork_grant"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="upworkgrant",
+            name="last_seen",
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="upworkgrant",
+            name="profile",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AlterField(
+            model_name="upworkgrant",
+            name="refresh_token",
+            field=models.TextField(blank=True, default=""),
+        ),
+    ]
@@ -1,3 +1,19 @@
 from django.db import models
 
-# Create your models here.
+
+class UpworkGrant(models.Model):
+    """Refresh token of a user's Upwork grant, sealed by services.tokens,
+    and when the user was last active (services.activity).
+
+    Kept in the database rather than the shared cache so background jobs
+    can renew the access token and find every active user; `owner` is the
+    key used by fresh_token().
+    """
+
+    owner = models.CharField(max_length=64, primary_key=True)
+    refresh_token = models.TextField(blank=True, default="")
+    # When the refresh token was stored; activity updates leave it alone.
+    updated_at = models.DateTimeField(auto_now=True)
+    last_seen = models.DateTimeField(null=True, blank=True, db_index=True)
+    # Report context of the last active session (activity.PROFILE_FIELDS).
+    profile = models.JSONField(default=dict, blank=True)
@@ -0,0 +1,62 @@
+# upworkapi/services/activity.py
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from upworkapi.models import UpworkGrant
+
+TOUCH_INTERVAL_SECONDS = 3600
+PROFILE_FIELDS = ("tenant_id", "tenant_ids", "freelancer_reference")
+SESSION_MARK = "activity_seen"
+
+Profile = Dict[str, Any]
+
+
+def touch(user_id, session) -> bool:
+    """Record that `user_id` is active, with the session's report context.
+
+    The session remembers what was last written, so this only writes to
+    the database about once an hour per user (or when the tenant changes).
+    Returns True when the shared record was updated.
+    """
+    if not user_id:
+        return False
+    profile = {field: session.get(field) for field in PROFILE_FIELDS}
+    now = time.time()
+    seen = session.get(SESSION_MARK) or {}
+    if (
+        seen.get("profile") == profile
+        and now - float(seen.get("at") or 0) < TOUCH_INTERVAL_SECONDS
+    ):
+        return False
+
+    # One row per user, so concurrent workers never overwrite each other's
+    # users. QuerySet.update() leaves updated_at (the token's age) alone.
+    owner = str(user_id)
+    seen = {"last_seen": datetime.fromtimestamp(now, timezone.utc), "profile": profile}
+    if not UpworkGrant.objects.filter(owner=owner).update(**seen):
+        UpworkGrant.objects.get_or_create(owner=owner, defaults=seen)
+    session[SESSION_MARK] = {"profile": profile, "at": now}
+    return True
+
+
+def forget(user_id) -> None:
+    if user_id:
+        UpworkGrant.objects.filter(owner=str(user_id)).update(
+            last_seen=None, profile={}
+        )
+
+
+def active_users(
+    days: float, *, now: Optional[float] = None
+) -> List[Tuple[str, Profile]]:
+    """(user_id, profile) for users seen in the last `days`, most recent first."""
+    now = now or time.time()
+    cutoff = datetime.fromtimestamp(now - days * 86400, timezone.utc)
+    grants = UpworkGrant.objects.filter(last_seen__gte=cutoff).order_by("-last_seen")
+    return [
+        (g.owner, dict(g.profile, seen_at=g.last_seen.timestamp()))
+        for g in grants.only("owner", "last_seen", "profile")
+    ]
@@ -0,0 +1,102 @@
+# upworkapi/services/client_analytics.py
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+Row = Dict[str, Any]
+# client -> month (1-12) -> {"earnings", "hours", "fees"}
+YearStats = Dict[str, Dict[int, Dict[str, float]]]
+
+
+def _month_of(value: Any) -> Optional[int]:
+    s = str(value or "")[:10]
+    try:
+        month = int(s[5:7])
+    except ValueError:
+        return None
+    return month if len(s) == 10 and 1 <= month <= 12 else None
+
+
+def client_year_stats(
+    time_rows: Iterable[Row],
+    fee_rows: Iterable[Row],
+    *,
+    time_client: Callable[[Row], str],
+    fee_client: Callable[[Row], str],
+    fee_date: Callable[[Row], str],
+) -> YearStats:
+    """Per client and month: hourly earnings and hours from time report
+    rows, and service fees (as a positive amount) from fee rows.
+
+    Client names come from the callables so they match the names used on
+    the report pages.
+    """
+    stats: YearStats = defaultdict(
+        lambda: defaultdict(lambda: {"earnings": 0.0, "hours": 0.0, "fees": 0.0})
+    )
+    for r in time_rows:
+        month = _month_of(r.get("date"))
+        if month is None:
+            continue
+        cell = stats[time_client(r)][month]
+        cell["earnings"] += float(r.get("charges") or 0)
+        cell["hours"] += float(r.get("hours") or 0)
+    for r in fee_rows:
+        month = _month_of(fee_date(r))
+        if month is None:
+            continue
+        stats[fee_client(r)][month]["fees"] += abs(float(r.get("amount") or 0))
+    return {client: dict(months) for client, months in stats.items()}
+
+
+def _ratio(numerator: float, denominator: float) -> Optional[float]:
+    return round(numerator / denominator, 4) if denominator else None
+
+
+def _point(earnings: float, hours: float, fees: float) -> Dict[str, Any]:
+    return {
+        "earnings": round(earnings, 2),
+        "hours": round(hours, 2),
+        "fees": round(fees, 2),
+        "effective_rate": round(earnings / hours, 2) if hours else None,
+        "fee_share": _ratio(fees, earnings),
+    }
+
+
+def client_series(stats_by_year: Dict[int, YearStats], client: str) -> Dict[str, Any]:
+    """Monthly, yearly and overall series for `client` across the years.
+
+    effective_rate is earnings per hour worked; fee_share is fees over
+    earnings. Both are None where the denominator is zero.
+    """
+    months: List[Dict[str, Any]] = []
+    years: List[Dict[str, Any]] = []
+    totals = {"earnings": 0.0, "hours": 0.0, "fees": 0.0}
+    for year in sorted(stats_by_year):
+        by_month = stats_by_year[year].get(client) or {}
+        year_totals = {"earnings": 0.0, "hours": 0.0, "fees": 0.0}
+        for month in range(1, 13):
+            cell = by_month.get(month) or {}
+            values = {k: float(cell.get(k) or 0) for k in year_totals}
+            for k, v in values.items():
+                year_totals[k] += v
+            months.append(dict(_point(**values), period="%04d-%02d" % (year, month)))
+        for k, v in year_totals.items():
+            totals[k] += v
+        years.append(dict(_point(**year_totals), year=year))
+    return {
+        "client": client,
+        "months": months,
+        "years": years,
+        "totals": _point(**totals),
+    }
+
+
+def client_names(stats_by_year: Dict[int, YearStats]) -> List[str]:
+    """Clients by total earnings across the years, largest first."""
+    earned: Dict[str, float] = defaultdict(float)
+    for stats in stats_by_year.values():
+        for client, by_month in stats.items():
+            earned[client] += sum(c["earnings"] for c in by_month.values())
+    return sorted(earned, key=lambda c: (-earned[c], c))
@@ -0,0 +1,82 @@
+# upworkapi/services/detail_pages.py
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, List, Mapping
+
+PER_PAGE = 50
+MAX_PER_PAGE = 200
+SORT_FIELDS = ("date", "client", "description", "amount")
+
+DetailRow = Dict[str, Any]
+
+
+def detail_query(params: Mapping[str, Any]) -> Dict[str, Any]:
+    """page/per_page/sort/client from request.GET, clamped to sane values.
+
+    `sort` is one of SORT_FIELDS, prefixed with "-" for descending; anything
+    else falls back to date order.
+    """
+
+    def number(name, default):
+        try:
+            return int(params.get(name) or default)
+        except (TypeError, ValueError):
+            return default
+
+    sort = str(params.get("sort") or "date")
+    if sort.lstrip("-") not in SORT_FIELDS:
+        sort = "date"
+    return {
+        "page": max(1, number("page", 1)),
+        "per_page": min(MAX_PER_PAGE, max(1, number("per_page", PER_PAGE))),
+        "sort": sort,
+        "client": str(params.get("client") or "").strip(),
+    }
+
+
+def _sort_key(field: str):
+    if field == "amount":
+        return lambda row: float(row.get("amount") or 0)
+    return lambda row: str(row.get(field) or "").lower()
+
+
+def paginate_details(
+    rows: List[DetailRow],
+    *,
+    page: int = 1,
+    per_page: int = PER_PAGE,
+    sort: str = "date",
+    client: str = "",
+) -> Dict[str, Any]:
+    """One page of detail rows, sorted and optionally limited to a client.
+
+    Rows carry date (ISO, for sorting), display_date, client, description
+    and amount. `clients` lists every client of the unfiltered rows so the
+    filter can be offered without loading them all; `total_amount` is the
+    sum over the filtered rows, not just the page. Ties keep date order.
+    """
+    clients = sorted({row.get("client") or "Unknown" for row in rows})
+    if client:
+        rows = [row for row in rows if (row.get("client") or "Unknown") == client]
+
+    field = sort.lstrip("-")
+    ordered = sorted(rows, key=_sort_key("date"))
+    if field != "date" or sort.startswith("-"):
+        ordered.sort(key=_sort_key(field), reverse=sort.startswith("-"))
+
+    pages = max(1, math.ceil(len(ordered) / per_page))
+    page = min(page, pages)
+    offset = (page - 1) * per_page
+    return {
+        "rows": ordered[offset : offset + per_page],
+        "offset": offset,
+        "page": page,
+        "pages": pages,
+        "per_page": per_page,
+        "sort": sort,
+        "client": client,
+        "clients": clients,
+        "total_rows": len(ordered),
+        "total_amount": round(sum(float(r.get("amount") or 0) for r in ordered), 2),
+    }
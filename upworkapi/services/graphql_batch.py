@@ -0,0 +1,103 @@
+# upworkapi/services/graphql_batch.py
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class GraphQLBatch:
+    """Compose several root fields into a single GraphQL operation.
+
+    Each field is registered under an alias so the same root field can be
+    requested more than once (e.g. with different filters). Variables are
+    namespaced per alias, and `split()` maps the response (including partial
+    errors) back to the alias that produced it.
+    """
+
+    def __init__(self, operation_name: str = "Batch") -> None:
+        self.operation_name = operation_name
+        self._fields: List[Tuple[str, str, str, Dict[str, str]]] = []
+        self._var_types: Dict[str, str] = {}
+        self._var_values: Dict[str, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    @property
+    def aliases(self) -> List[str]:
+        return [alias for alias, _, _, _ in self._fields]
+
+    def add(
+        self,
+        alias: str,
+        field: str,
+        selection: str = "",
+        *,
+        variables: Optional[Dict[str, Tuple[str, Any]]] = None,
+    ) -> "GraphQLBatch":
+        """Register `field` under `alias`.
+
+        `variables` maps argument name -> (GraphQL type, value); each one is
+        declared as `$<alias>_<arg>` on the operation.
+        """
+        if not alias.isidentifier():
+            raise ValueError(f"Invalid GraphQL alias: {alias!r}")
+        if alias in self.aliases:
+            raise ValueError(f"Duplicate GraphQL alias: {alias!r}")
+
+        args: Dict[str, str] = {}
+        for arg, (type_name, value) in (variables or {}).items():
+            var_name = f"{alias}_{arg}"
+            self._var_types[var_name] = type_name
+            self._var_values[var_name] = value
+            args[arg] = var_name
+        self._fields.append((alias, field, selection.strip(), args))
+        return self
+
+    def query(self) -> str:
+        header = f"query {self.operation_name}"
+        if self._var_types:
+            decl = ", ".join(f"${n}: {t}" for n, t in self._var_types.items())
+            header += f"({decl})"
+
+        lines = [header + " {"]
+        for alias, field, selection, args in self._fields:
+            head = field if alias == field else f"{alias}: {field}"
+            if args:
+                head += "(" + ", ".join(f"{a}: ${v}" for a, v in args.items()) + ")"
+            if selection:
+                head += " { " + selection + " }"
+            lines.append("  " + head)
+        lines.append("}")
+        return "\n".join(lines)
+
+    def variables(self) -> Dict[str, Any]:
+        return dict(self._var_values)
+
+    def payload(self) -> Dict[str, Any]:
+        return {"query": self.query(), "variables": self.variables()}
+
+    def split(self, response: Any) -> Tuple[Dict[str, Any], Dict[str, List[Any]]]:
+        """Return (data per alias, errors per alias) for a batch response.
+
+        Errors without a path (e.g. validation errors) are attached to every
+        alias, since the server rejected the whole document.
+        """
+        data: Dict[str, Any] = {alias: None for alias in self.aliases}
+        errors: Dict[str, List[Any]] = {alias: [] for alias in self.aliases}
+        if not isinstance(response, dict):
+            return data, errors
+
+        body = response.get("data") or {}
+        if isinstance(body, dict):
+            for alias in self.aliases:
+                data[alias] = body.get(alias)
+
+        for err in response.get("errors") or []:
+            path = err.get("path") if isinstance(err, dict) else None
+            owner = path[0] if isinstance(path, list) and path else None
+            if owner in errors:
+                errors[owner].append(err)
+            else:
+                for alias in self.aliases:
+                    errors[alias].append(err)
+        return data, errors
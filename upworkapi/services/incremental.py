@@ -0,0 +1,44 @@
+# upworkapi/services/incremental.py
+from __future__ import annotations
+
+from collections import Counter
+from datetime import date, datetime
+import hashlib
+import json
+from typing import Any, Callable, Dict, List, Union
+
+
+def row_fingerprint(row: Dict[str, Any]) -> str:
+    raw = json.dumps(row, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def merge_incremental_rows(
+    base_rows: List[Dict[str, Any]],
+    fresh_rows: List[Dict[str, Any]],
+    *,
+    since: Union[str, date, datetime],
+    date_of: Callable[[Dict[str, Any]], str],
+) -> List[Dict[str, Any]]:
+    """Replace the trailing window of `base_rows` with `fresh_rows`.
+
+    Base rows dated on/after `since` are dropped because the refetched window
+    supersedes them. The remaining overlap (e.g. rows whose date could not be
+    parsed) is deduplicated by fingerprint, keeping as many copies of a row as
+    the larger of the two sides has, so genuinely repeated rows survive.
+    """
+    since_s = since.isoformat()[:10] if not isinstance(since, str) else since[:10]
+    kept = [r for r in base_rows if (date_of(r) or "")[:10] < since_s]
+
+    kept_fps = [(row_fingerprint(r), r) for r in kept]
+    fresh_fps = [(row_fingerprint(r), r) for r in fresh_rows]
+    kept_counts = Counter(fp for fp, _ in kept_fps)
+    fresh_counts = Counter(fp for fp, _ in fresh_fps)
+    emitted: Counter = Counter()
+    merged: List[Dict[str, Any]] = []
+    for fp, row in kept_fps + fresh_fps:
+        if emitted[fp] >= max(kept_counts[fp], fresh_counts[fp]):
+            continue
+        emitted[fp] += 1
+        merged.append(row)
+    return merged
@@ -0,0 +1,341 @@
+# upworkapi/services/metrics.py
+from __future__ import annotations
+
+from contextlib import contextmanager
+import os
+import threading
+import time
+import uuid
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.core.cache import caches
+
+from upworkapi.services.timing import upstream_operation
+
+# name -> (type, help) for every exported metric.
+METRICS = {
+    "upworkapi_cache_requests_total": (
+        "counter",
+        "Report cache lookups by key prefix and result.",
+    ),
+    "upworkapi_cache_uncompressed_bytes_total": (
+        "counter",
+        "Pickled size of cache values that were compressed, by codec.",
+    ),
+    "upworkapi_cache_stored_bytes_total": (
+        "counter",
+        "Bytes written for cache values, by codec (raw = below threshold).",
+    ),
+    "upworkapi_cache_compression_cpu_seconds_total": (
+        "counter",
+        "CPU time spent compressing and decompressing cache values.",
+    ),
+    "upworkapi_upstream_requests_total": (
+        "counter",
+        "Upwork HTTP/GraphQL calls by operation and status class.",
+    ),
+    "upworkapi_upstream_request_seconds": (
+        "histogram",
+        "Upwork HTTP/GraphQL call latency by operation.",
+    ),
+    "upworkapi_warm_job_seconds": (
+        "histogram",
+        "All-time warm job duration.",
+    ),
+    "upworkapi_warm_jobs_running": (
+        "gauge",
+        "All-time warm jobs currently running.",
+    ),
+    "upworkapi_scheduled_refreshes_total": (
+        "counter",
+        "Scheduled cache refreshes of active users by result.",
+    ),
+    "upworkapi_snapshot_builds_total": (
+        "counter",
+        "Post-login dashboard snapshot builds by result.",
+    ),
+    "upworkapi_token_refreshes_total": (
+        "counter",
+        "Upwork token refresh attempts by result.",
+    ),
+    "upworkapi_export_rows_total": (
+        "counter",
+        "Transaction rows streamed by export format.",
+    ),
+    "upworkapi_export_errors_total": (
+        "counter",
+        "Transaction exports cut short by an Upwork error, by format.",
+    ),
+}
+
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 1800.0)
+
+# Each worker publishes its cumulative snapshot under its own key; the scrape
+# endpoint sums every worker listed in the index. A worker that has not
+# flushed for WORKER_TTL_SECONDS (exited, or idle) is retired: its counters
+# and histograms are folded into a persistent bucket so totals never go
+# backwards, and if it flushes again it publishes only what is new.
+FLUSH_INTERVAL_SECONDS = 10
+WORKER_TTL_SECONDS = 3600
+# Guards the worker index and the retired bucket (read, change, write).
+LOCK_SECONDS = 30
+LOCK_WAIT_SECONDS = 1.0
+# Retired worker ids remembered so a returning worker can tell it was folded.
+RETIRED_IDS_LIMIT = 1000
+_INDEX_KEY = "metrics:workers"
+_RETIRED_KEY = "metrics:retired"
+_LOCK_KEY = "metrics:lock"
+
+Labels = Tuple[Tuple[str, str], ...]
+
+_lock = threading.Lock()
+_values: Dict[str, Dict[Labels, float]] = {}
+_histograms: Dict[str, Dict[Labels, List[float]]] = {}
+_last_flush = 0.0
+# pid, worker id and last published snapshot of this process.
+_worker: Dict[str, object] = {"pid": None, "id": None, "published": None}
+
+
+def _labels(labels: Dict[str, object]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def inc(name: str, amount: float = 1.0, **labels) -> None:
+    key = _labels(labels)
+    with _lock:
+        series = _values.setdefault(name, {})
+        series[key] = series.get(key, 0.0) + amount
+
+
+def dec(name: str, amount: float = 1.0, **labels) -> None:
+    inc(name, -amount, **labels)
+
+
+def observe(name: str, value: float, **labels) -> None:
+    key = _labels(labels)
+    with _lock:
+        # [bucket counts..., +Inf count, sum]
+        hist = _histograms.setdefault(name, {}).setdefault(
+            key, [0.0] * (len(BUCKETS) + 2)
+        )
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                hist[i] += 1
+        hist[len(BUCKETS)] += 1
+        hist[len(BUCKETS) + 1] += value
+
+
+def snapshot() -> Dict[str, Dict]:
+    with _lock:
+        return {
+            "values": {n: dict(s) for n, s in _values.items()},
+            "histograms": {
+                n: {k: list(v) for k, v in s.items()} for n, s in _histograms.items()
+            },
+        }
+
+
+def _store():
+    # The "metrics" cache alias (see settings.CACHES), never culled.
+    return caches["metrics"]
+
+
+@contextmanager
+def _locked():
+    """Hold the metrics lock, waiting briefly; yields False if still busy."""
+    store = _store()
+    deadline = time.monotonic() + LOCK_WAIT_SECONDS
+    acquired = store.add(_LOCK_KEY, "1", LOCK_SECONDS)
+    while not acquired and time.monotonic() < deadline:
+        time.sleep(0.01)
+        acquired = store.add(_LOCK_KEY, "1", LOCK_SECONDS)
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            store.delete(_LOCK_KEY)
+
+
+def _worker_key(worker_id) -> str:
+    return f"metrics:worker:{worker_id}"
+
+
+def _worker_id(renew: bool = False) -> str:
+    # Random per process, so a restarted worker reusing a pid starts afresh.
+    pid = os.getpid()
+    if renew or _worker["pid"] != pid:
+        _worker.update(pid=pid, id="%d-%s" % (pid, uuid.uuid4().hex[:8]))
+        _worker["published"] = None
+    return _worker["id"]
+
+
+def _cumulative(name: str) -> bool:
+    return METRICS.get(name, ("counter",))[0] != "gauge"
+
+
+def _add(
+    target: Dict[str, Dict],
+    snap: Dict[str, Dict],
+    *,
+    sign: float = 1.0,
+    gauges: bool = True,
+) -> None:
+    for name, series in snap.get("values", {}).items():
+        if not gauges and not _cumulative(name):
+            continue
+        into = target.setdefault("values", {}).setdefault(name, {})
+        for key, v in series.items():
+            into[key] = into.get(key, 0.0) + sign * v
+    for name, series in snap.get("histograms", {}).items():
+        into = target.setdefault("histograms", {}).setdefault(name, {})
+        for key, v in series.items():
+            current = into.get(key)
+            into[key] = (
+                [a + sign * b for a, b in zip(current, v)]
+                if current
+                else [sign * b for b in v]
+            )
+
+
+def _forget_published() -> None:
+    """Drop what this worker published before it was retired: those counts
+    are in the retired bucket now."""
+    published = _worker["published"] or {}
+    with _lock:
+        _add(
+            {"values": _values, "histograms": _histograms},
+            published,
+            sign=-1.0,
+            gauges=False,
+        )
+
+
+def flush(force: bool = False) -> None:
+    """Publish this worker's snapshot to the shared cache (rate limited)."""
+    global _last_flush
+    now = time.monotonic()
+    if not force and now - _last_flush < FLUSH_INTERVAL_SECONDS:
+        return
+    _last_flush = now
+    store = _store()
+    worker_id = _worker_id()
+    if _worker["published"] is not None:
+        retired = store.get(_RETIRED_KEY) or {}
+        if worker_id in retired.get("workers", ()):
+            _forget_published()
+            worker_id = _worker_id(renew=True)
+    snap = dict(snapshot(), flushed_at=time.time())
+    store.set(_worker_key(worker_id), snap, None)
+    _worker["published"] = snap
+    # Checked on every flush, so a worker left out (lock busy) joins later.
+    if worker_id not in (store.get(_INDEX_KEY) or []):
+        with _locked() as acquired:
+            workers = store.get(_INDEX_KEY) or []
+            if acquired and worker_id not in workers:
+                store.set(_INDEX_KEY, list(workers) + [worker_id], None)
+
+
+def _retire(workers: List[str], snapshots: Dict[str, Dict]) -> None:
+    """Fold idle workers into the retired bucket and drop them, and workers
+    whose snapshot is gone, from the index (under the lock)."""
+    cutoff = time.time() - WORKER_TTL_SECONDS
+    idle = [
+        w
+        for w in workers
+        if _worker_key(w) in snapshots
+        and snapshots[_worker_key(w)].get("flushed_at", 0) < cutoff
+    ]
+    missing = [w for w in workers if _worker_key(w) not in snapshots]
+    if not idle and not missing:
+        return
+    store = _store()
+    with _locked() as acquired:
+        if not acquired:
+            return
+        if idle:
+            retired = store.get(_RETIRED_KEY) or {}
+            for w in idle:
+                # Gauges describe a running process; a retired one has none.
+                _add(retired, snapshots.pop(_worker_key(w)), gauges=False)
+            retired["workers"] = (retired.get("workers", []) + idle)[
+                -RETIRED_IDS_LIMIT:
+            ]
+            store.set(_RETIRED_KEY, retired, None)
+            store.delete_many([_worker_key(w) for w in idle])
+        # Re-read: workers may have registered since `workers` was read.
+        gone = set(idle) | set(missing)
+        current = store.get(_INDEX_KEY) or []
+        store.set(_INDEX_KEY, [w for w in current if w not in gone], None)
+
+
+def aggregate() -> Dict[str, Dict]:
+    """Sum the retired totals and the snapshots of every live worker."""
+    flush(force=True)
+    store = _store()
+    workers = store.get(_INDEX_KEY) or []
+    snapshots = store.get_many([_worker_key(w) for w in workers])
+    _retire(workers, snapshots)
+
+    totals: Dict[str, Dict] = {"values": {}, "histograms": {}}
+    _add(totals, store.get(_RETIRED_KEY) or {})
+    live = [w for w in workers if _worker_key(w) in snapshots]
+    for w in live:
+        _add(totals, snapshots[_worker_key(w)])
+    return dict(totals, workers=len(live))
+
+
+def _fmt_labels(labels: Iterable[Tuple[str, str]]) -> str:
+    items = [
+        '%s="%s"' % (k, v.replace("\\", "\\\\").replace('"', '\\"')) for k, v in labels
+    ]
+    return "{%s}" % ",".join(items) if items else ""
+
+
+def _fmt_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render_prometheus(data: Optional[Dict[str, Dict]] = None) -> str:
+    data = data if data is not None else aggregate()
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        if kind == "histogram":
+            for key, hist in sorted(data["histograms"].get(name, {}).items()):
+                for bound, count in zip(BUCKETS, hist):
+                    le = key + (("le", _fmt_value(bound)),)
+                    lines.append(f"{name}_bucket{_fmt_labels(le)} {_fmt_value(count)}")
+                inf = key + (("le", "+Inf"),)
+                lines.append(
+                    f"{name}_bucket{_fmt_labels(inf)} {_fmt_value(hist[len(BUCKETS)])}"
+                )
+                lines.append(
+                    f"{name}_sum{_fmt_labels(key)} {_fmt_value(hist[len(BUCKETS) + 1])}"
+                )
+                lines.append(
+                    f"{name}_count{_fmt_labels(key)} {_fmt_value(hist[len(BUCKETS)])}"
+                )
+        else:
+            for key, value in sorted(data["values"].get(name, {}).items()):
+                lines.append(f"{name}{_fmt_labels(key)} {_fmt_value(value)}")
+    lines.append("# HELP upworkapi_workers Worker processes reporting metrics.")
+    lines.append("# TYPE upworkapi_workers gauge")
+    lines.append(f"upworkapi_workers {data.get('workers', 0)}")
+    return "\n".join(lines) + "\n"
+
+
+def record_upstream_response(response, *args, **kwargs):
+    """`requests` response hook feeding the upstream call metrics."""
+    category, operation = upstream_operation(response.request)
+    status = "%dxx" % (response.status_code // 100)
+    # GraphQL reports most failures with HTTP 200 and an `errors` member.
+    if category == "graphql" and b'"errors"' in (response.content or b""):
+        status = "graphql_error"
+    inc("upworkapi_upstream_requests_total", operation=operation, status=status)
+    observe(
+        "upworkapi_upstream_request_seconds",
+        response.elapsed.total_seconds(),
+        operation=operation,
+    )
+    return response
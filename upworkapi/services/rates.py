@@ -0,0 +1,137 @@
+# upworkapi/services/rates.py
+from __future__ import annotations
+
+from calendar import monthrange
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+TARGET_HOURS_PER_WEEK = 40.0
+
+Row = Dict[str, Any]
+# [hours, earnings]
+Cell = List[float]
+
+
+def hours_and_earnings(rows: List[Row], *, client_of: Callable[[Row], str]):
+    """Hours and charges of time report rows by ISO week, month and client.
+
+    One pass over the rows; the result only depends on the rows, so it can
+    be cached with them. Weeks use the same ISO numbering as the weekly
+    hours chart.
+    """
+    weeks: Dict[int, Cell] = defaultdict(lambda: [0.0, 0.0])
+    months: Dict[int, Cell] = defaultdict(lambda: [0.0, 0.0])
+    clients: Dict[str, Dict[int, Cell]] = defaultdict(
+        lambda: defaultdict(lambda: [0.0, 0.0])
+    )
+    for r in rows:
+        try:
+            d = datetime.strptime(r["date"], "%Y-%m-%d").date()
+        except (KeyError, TypeError, ValueError):
+            continue
+        hours = float(r.get("hours") or 0)
+        earnings = float(r.get("charges") or 0)
+        for cell in (
+            weeks[d.isocalendar()[1]],
+            months[d.month],
+            clients[client_of(r)][d.month],
+        ):
+            cell[0] += hours
+            cell[1] += earnings
+    return {
+        "weeks": dict(weeks),
+        "months": dict(months),
+        "clients": {c: dict(by_month) for c, by_month in clients.items()},
+    }
+
+
+def _workdays(start: date, end: date) -> int:
+    days = 0
+    d = start
+    while d <= end:
+        if d.weekday() < 5:
+            days += 1
+        d += timedelta(days=1)
+    return days
+
+
+def _point(hours: float, earnings: float, capacity: Optional[float]):
+    return {
+        "hours": round(hours, 2),
+        "earnings": round(earnings, 2),
+        "effective_rate": round(earnings / hours, 2) if hours else None,
+        "utilization": round(hours / capacity, 4) if capacity else None,
+    }
+
+
+def rate_report(
+    sums: Dict[str, Any],
+    *,
+    year: int,
+    today: Optional[date] = None,
+    target_hours: float = TARGET_HOURS_PER_WEEK,
+) -> Dict[str, Any]:
+    """Effective hourly rate and utilization from hours_and_earnings().
+
+    Utilization is hours over the target: target_hours for a week, and
+    target_hours / 5 per weekday for a month and the year, counting only
+    days up to `today`. Periods still entirely ahead have no utilization.
+    """
+    today = today or date.today()
+    year = int(year)
+    last_week = date(year, 12, 31).isocalendar()[1]
+    if last_week == 1:
+        last_week = 52
+    if year < today.year:
+        current_week = last_week
+    elif year == today.year:
+        current_week = today.isocalendar()[1]
+    else:
+        current_week = 0
+
+    weeks = []
+    for week in range(1, last_week + 1):
+        hours, earnings = sums["weeks"].get(week) or (0.0, 0.0)
+        capacity = target_hours if week <= current_week else None
+        weeks.append(dict(_point(hours, earnings, capacity), week=week))
+
+    months = []
+    year_capacity = 0.0
+    for month in range(1, 13):
+        start = date(year, month, 1)
+        end = min(date(year, month, monthrange(year, month)[1]), today)
+        capacity = _workdays(start, end) * target_hours / 5 if start <= end else 0
+        year_capacity += capacity
+        hours, earnings = sums["months"].get(month) or (0.0, 0.0)
+        months.append(dict(_point(hours, earnings, capacity), month=month))
+
+    clients = []
+    for client, by_month in sums["clients"].items():
+        hours = sum(c[0] for c in by_month.values())
+        earnings = sum(c[1] for c in by_month.values())
+        monthly_rates = []
+        for month in range(1, 13):
+            h, e = by_month.get(month) or (0.0, 0.0)
+            monthly_rates.append(round(e / h, 2) if h else None)
+        clients.append(
+            {
+                "client": client,
+                "hours": round(hours, 2),
+                "earnings": round(earnings, 2),
+                "effective_rate": round(earnings / hours, 2) if hours else None,
+                "monthly_rates": monthly_rates,
+            }
+        )
+    clients.sort(key=lambda c: (-c["earnings"], c["client"]))
+
+    total_hours = sum(c[0] for c in sums["months"].values())
+    total_earnings = sum(c[1] for c in sums["months"].values())
+    return {
+        "year": year,
+        "target_hours_per_week": target_hours,
+        "weeks": weeks,
+        "months": months,
+        "clients": clients,
+        "totals": _point(total_hours, total_earnings, year_capacity),
+    }
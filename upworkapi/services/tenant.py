@@ -1,23 +1,27 @@
 # upworkapi/services/tenant.py
 from __future__ import annotations
 
-import requests
+from typing import Any
+
+from upworkapi.utils import http_session
 
 UPWORK_GQL_URL = "https://api.upwork.com/graphql"
 
+# Selection for the `companySelector` root field, shared with batched queries.
+COMPANY_SELECTOR_SELECTION = "items { title organizationId }"
+
 
 def list_tenants(access_token: str) -> list[dict]:
     query = """
     query {
       companySelector {
-        items {
-          title
-          organizationId
-        }
+        %s
       }
     }
-    """
-    resp = requests.post(
+    """ % (
+        COMPANY_SELECTOR_SELECTION
+    )
+    resp = http_session().post(
         UPWORK_GQL_URL,
         headers={
             "Authorization": f"bearer {access_token}",
@@ -32,16 +36,23 @@ def list_tenants(access_token: str) -> list[dict]:
     except Exception:
         return []
 
-    items = (
-        ((payload.get("data") or {}).get("companySelector") or {}).get("items")
-    ) or []
+    return tenant_items(((payload.get("data") or {}).get("companySelector")))
+
+
+def tenant_items(company_selector: Any) -> list[dict]:
+    if not isinstance(company_selector, dict):
+        return []
+    items = company_selector.get("items") or []
     return [i for i in items if isinstance(i, dict)]
 
 
-def get_tenant_id(access_token: str) -> str | None:
-    items = list_tenants(access_token)
+def first_tenant_id(items: list[dict]) -> str | None:
     if not items:
         return None
 
     org_id = items[0].get("organizationId")
     return str(org_id) if org_id else None
+
+
+def get_tenant_id(access_token: str) -> str | None:
+    return first_tenant_id(list_tenants(access_token))
@@ -0,0 +1,220 @@
+# upworkapi/services/timing.py
+from __future__ import annotations
+
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+import json
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import sentry_sdk
+except ImportError:  # pragma: no cover - sentry-sdk is in requirements.txt
+    sentry_sdk = None
+
+# Per-thread span list for the request being served; None outside requests
+# (background threads), in which case recording is a no-op.
+_local = threading.local()
+
+RECENT_LIMIT = 50
+_recent: deque = deque(maxlen=RECENT_LIMIT)
+_recent_lock = threading.Lock()
+
+_listeners: List[Callable[[Dict[str, Any]], None]] = []
+
+_OPERATION_RE = re.compile(r"\b(?:query|mutation)\s+(\w+)")
+_ROOT_FIELD_RE = re.compile(r"{\s*(?:\w+\s*:\s*)?(\w+)")
+# REST routes called upstream, as (pattern, template): path segments holding
+# user, team or profile references become placeholders so span names and
+# metric labels stay a fixed set. Unknown paths are reported as "other".
+_REST_ROUTES = [
+    (
+        re.compile(r"^(/\w+)?/finreports/v2/(\w+)/[^/]+/(billings|earnings)(\.json)?$"),
+        lambda m: "%s/finreports/v2/%s/{ref}/%s"
+        % (m.group(1) or "", m.group(2), m.group(3)),
+    ),
+    (
+        re.compile(r"^(/\w+)?/profiles/v1/providers/[^/]+?(\.json)?$"),
+        lambda m: "%s/profiles/v1/providers/{profile_key}%s"
+        % (m.group(1) or "", m.group(2) or ""),
+    ),
+    (
+        re.compile(r"^(/\w+)?/v3/oauth2/token$"),
+        lambda m: "%s/v3/oauth2/token" % (m.group(1) or ""),
+    ),
+]
+
+Span = Dict[str, Any]
+
+
+def register_listener(listener: Callable[[Span], None]) -> None:
+    """Call `listener(span)` for every span recorded from now on."""
+    _listeners.append(listener)
+
+
+def begin() -> None:
+    _local.spans = []
+    _local.started = time.perf_counter()
+
+
+def end() -> Optional[Dict[str, Any]]:
+    spans = getattr(_local, "spans", None)
+    if spans is None:
+        return None
+    total_ms = (time.perf_counter() - _local.started) * 1000.0
+    _local.spans = None
+    return {"total_ms": round(total_ms, 2), "spans": spans}
+
+
+def record(category: str, name: str, duration_ms: float = 0.0, **tags) -> None:
+    spans = getattr(_local, "spans", None)
+    if spans is None:
+        return
+    entry = {
+        "category": category,
+        "name": name,
+        "duration_ms": round(duration_ms, 2),
+        **tags,
+    }
+    spans.append(entry)
+    for listener in _listeners:
+        try:
+            listener(entry)
+        except Exception:
+            pass
+
+
+@contextmanager
+def span(category: str, name: str, **tags) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(category, name, (time.perf_counter() - start) * 1000.0, **tags)
+
+
+def timed(category: str, name: Optional[str] = None):
+    def decorator(func):
+        label = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if getattr(_local, "spans", None) is None:
+                return func(*args, **kwargs)
+            with span(category, label):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def record_cache(prefix: str, hit: bool) -> None:
+    record("cache", prefix, hit=hit)
+
+
+def _operation_name(body: Any) -> str:
+    if isinstance(body, bytes):
+        body = body.decode("utf-8", "replace")
+    query = ""
+    if isinstance(body, str):
+        try:
+            query = (json.loads(body) or {}).get("query") or ""
+        except (ValueError, AttributeError):
+            query = ""
+    m = _OPERATION_RE.search(query) or _ROOT_FIELD_RE.search(query)
+    return m.group(1) if m else "request"
+
+
+def _route_template(path: str) -> str:
+    for pattern, template in _REST_ROUTES:
+        m = pattern.match(path)
+        if m:
+            return template(m)
+    return "other"
+
+
+def upstream_operation(request) -> Tuple[str, str]:
+    """(category, operation) of an outgoing `requests` PreparedRequest.
+
+    The operation never contains per-user ids: GraphQL calls are named by
+    their operation, REST calls by their route template.
+    """
+    if request.url.rstrip("/").endswith("/graphql"):
+        return "graphql", _operation_name(request.body)
+    return "http", _route_template(request.path_url.split("?", 1)[0].rstrip("/"))
+
+
+def record_http_response(response, *args, **kwargs):
+    """`requests` response hook recording each Upwork call as a span."""
+    if getattr(_local, "spans", None) is None:
+        return response
+    request = response.request
+    category, operation = upstream_operation(request)
+    record(
+        category,
+        operation,
+        response.elapsed.total_seconds() * 1000.0,
+        status=response.status_code,
+        tenant=request.headers.get("X-Upwork-API-TenantId") or "",
+        bytes=len(response.content or b""),
+    )
+    return response
+
+
+def server_timing(summary: Dict[str, Any]) -> str:
+    """Aggregate a request summary into a Server-Timing header value.
+
+    Only categories and counts are exposed, never query names or tenants.
+    """
+    durations: Dict[str, float] = {}
+    counts: Dict[str, int] = {}
+    hits = misses = 0
+    for s in summary["spans"]:
+        if s["category"] == "cache":
+            if s.get("hit"):
+                hits += 1
+            else:
+                misses += 1
+            continue
+        durations[s["category"]] = durations.get(s["category"], 0.0) + float(
+            s["duration_ms"]
+        )
+        counts[s["category"]] = counts.get(s["category"], 0) + 1
+
+    parts = [
+        '%s;dur=%.1f;desc="%d"' % (category, durations[category], counts[category])
+        for category in sorted(durations)
+    ]
+    if hits or misses:
+        parts.append('cache;desc="hit %d miss %d"' % (hits, misses))
+    parts.append("total;dur=%.1f" % summary["total_ms"])
+    return ", ".join(parts)
+
+
+def remember(summary: Dict[str, Any]) -> None:
+    with _recent_lock:
+        _recent.append(summary)
+
+
+def recent_summaries() -> List[Dict[str, Any]]:
+    with _recent_lock:
+        return list(_recent)
+
+
+def _sentry_listener(span: Span) -> None:
+    # Cache lookups are too chatty for the breadcrumb buffer.
+    if span["category"] == "cache" or not sentry_sdk.get_client().is_active():
+        return
+    sentry_sdk.add_breadcrumb(
+        category="upwork.%s" % span["category"],
+        message=span["name"],
+        data={k: v for k, v in span.items() if k not in ("category", "name")},
+    )
+
+
+if sentry_sdk is not None:
+    register_listener(_sentry_listener)
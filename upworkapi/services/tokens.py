@@ -0,0 +1,207 @@
+# upworkapi/services/tokens.py
+from __future__ import annotations
+
+import base64
+import json
+import time
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from cryptography.fernet import Fernet, InvalidToken
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.crypto import salted_hmac
+from oauthlib.oauth2 import InvalidGrantError, MissingTokenError
+from requests_oauthlib import OAuth2Session
+
+from upworkapi.models import UpworkGrant
+from upworkapi.services import metrics
+
+UPWORK_TOKEN_URL = "https://www.upwork.com/api/v3/oauth2/token"
+
+# Upwork refresh tokens live for two weeks; older stored grants are ignored.
+REFRESH_TOKEN_SECONDS = 86400 * 14
+REFRESH_LOCK_SECONDS = 30
+REFRESH_WAIT_SECONDS = 10
+REFRESH_POLL_SECONDS = 0.25
+REFRESH_LEEWAY_SECONDS = 120
+
+Token = Dict[str, Any]
+
+
+def _store_key(owner) -> str:
+    return f"upwork_token:{owner}"
+
+
+def _lock_key(owner) -> str:
+    return f"upwork_token_refresh_lock:{owner}"
+
+
+def ensure_expires_at(token: Token) -> None:
+    if "expires_at" in token:
+        return
+    expires_in = token.get("expires_in")
+    if expires_in is None:
+        return
+    try:
+        token["expires_at"] = time.time() + int(expires_in)
+    except (TypeError, ValueError):
+        return
+
+
+def needs_refresh(token: Token, leeway_seconds: int = REFRESH_LEEWAY_SECONDS) -> bool:
+    if not token.get("access_token") and token.get("refresh_token"):
+        return True
+    expires_at = token.get("expires_at")
+    if not expires_at:
+        return False
+    try:
+        return time.time() >= float(expires_at) - leeway_seconds
+    except (TypeError, ValueError):
+        return False
+
+
+def _expires_at(token: Optional[Token]) -> float:
+    try:
+        return float((token or {}).get("expires_at") or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def newest_token(*tokens: Optional[Token]) -> Optional[Token]:
+    candidates = [t for t in tokens if isinstance(t, dict)]
+    if not candidates:
+        return None
+    return max(candidates, key=_expires_at)
+
+
+def _fernet() -> Fernet:
+    key = salted_hmac("upworkapi.tokens", "fernet", algorithm="sha256").digest()
+    return Fernet(base64.urlsafe_b64encode(key))
+
+
+def _seal(value: Any) -> str:
+    """Encrypt `value` (as JSON) with a key derived from SECRET_KEY."""
+    return _fernet().encrypt(json.dumps(value).encode("utf-8")).decode("ascii")
+
+
+def _unseal(value: Any) -> Any:
+    """The value passed to _seal, or None when missing or tampered with."""
+    if not isinstance(value, str):
+        return None
+    try:
+        return json.loads(_fernet().decrypt(value.encode("ascii")))
+    except (InvalidToken, ValueError):
+        return None
+
+
+def _stored_refresh_token(owner) -> Optional[str]:
+    oldest = timezone.now() - timedelta(seconds=REFRESH_TOKEN_SECONDS)
+    grant = UpworkGrant.objects.filter(owner=str(owner), updated_at__gte=oldest).first()
+    return _unseal(grant.refresh_token) if grant is not None else None
+
+
+def stored_token(owner) -> Optional[Token]:
+    """The shared token of `owner`.
+
+    The access token comes from the cache, where it is kept encrypted and
+    only until it expires; the refresh token comes from the database. With
+    only a refresh token left, the result has no access token and
+    needs_refresh() is true for it.
+    """
+    if not owner:
+        return None
+    token = _unseal(cache.get(_store_key(owner)))
+    token = token if isinstance(token, dict) else None
+    refresh_token = _stored_refresh_token(owner)
+    if refresh_token:
+        token = dict(token or {}, refresh_token=refresh_token)
+    return token
+
+
+def store_token(owner, token: Token) -> None:
+    if not owner or not isinstance(token, dict):
+        return
+    ensure_expires_at(token)
+    if token.get("refresh_token"):
+        UpworkGrant.objects.update_or_create(
+            owner=str(owner), defaults={"refresh_token": _seal(token["refresh_token"])}
+        )
+    lifetime = int(_expires_at(token) - time.time())
+    if lifetime <= 0:
+        cache.delete(_store_key(owner))
+        return
+    access = {k: v for k, v in token.items() if k != "refresh_token"}
+    cache.set(_store_key(owner), _seal(access), lifetime)
+
+
+def forget_token(owner) -> None:
+    if owner:
+        cache.delete(_store_key(owner))
+        UpworkGrant.objects.filter(owner=str(owner)).delete()
+
+
+def refresh_upwork_token(token: Token) -> Token:
+    refresh_token = token.get("refresh_token")
+    if not refresh_token:
+        raise MissingTokenError(description="Missing refresh token.")
+    session = OAuth2Session(settings.UPWORK_PUBLIC_KEY, token=token)
+    refreshed = session.refresh_token(
+        UPWORK_TOKEN_URL,
+        refresh_token=refresh_token,
+        client_id=settings.UPWORK_PUBLIC_KEY,
+        client_secret=settings.UPWORK_SECRET_KEY,
+    )
+    ensure_expires_at(refreshed)
+    return refreshed
+
+
+def fresh_token(owner, token: Optional[Token] = None) -> Optional[Token]:
+    """Return the freshest usable token for `owner`, refreshing at most once.
+
+    Requests, tabs and background jobs of one user share a single stored
+    token. When it nears expiry one caller takes the refresh lock and
+    exchanges the refresh token; the others wait for the stored token to
+    change instead of spending (and invalidating) the same refresh token.
+    Raises InvalidGrantError/MissingTokenError when the grant is gone.
+    """
+    if isinstance(token, dict):
+        ensure_expires_at(token)
+        if not needs_refresh(token):
+            return token
+    current = newest_token(stored_token(owner), token)
+    if current is None or not needs_refresh(current):
+        return current
+
+    lock_key = _lock_key(owner)
+    if cache.add(lock_key, "1", REFRESH_LOCK_SECONDS):
+        try:
+            # Another worker may have finished a refresh since we looked.
+            current = newest_token(stored_token(owner), current)
+            if not needs_refresh(current):
+                return current
+            try:
+                refreshed = refresh_upwork_token(current)
+            except (InvalidGrantError, MissingTokenError):
+                metrics.inc("upworkapi_token_refreshes_total", result="invalid_grant")
+                forget_token(owner)
+                raise
+            metrics.inc("upworkapi_token_refreshes_total", result="refreshed")
+            store_token(owner, refreshed)
+            return refreshed
+        finally:
+            cache.delete(lock_key)
+
+    deadline = time.monotonic() + REFRESH_WAIT_SECONDS
+    while time.monotonic() < deadline:
+        time.sleep(REFRESH_POLL_SECONDS)
+        latest = stored_token(owner)
+        if latest is not None and not needs_refresh(latest):
+            metrics.inc("upworkapi_token_refreshes_total", result="shared")
+            return latest
+        if cache.get(lock_key) is None:
+            break
+    # The other refresh failed or is slow; the current token is still usable
+    # until it actually expires, and the next request will try again.
+    return newest_token(stored_token(owner), current)
@@ -3,12 +3,12 @@ from __future__ import annotations
 
 from datetime import date, datetime
 import os
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
-import requests
 from upwork.routers import reports
 
-from upworkapi.utils import upwork_client
+from upworkapi.services.graphql_batch import GraphQLBatch
+from upworkapi.utils import http_session, upwork_client
 
 
 class UpworkGraphQLError(RuntimeError):
@@ -268,6 +268,7 @@ def fetch_service_fee_history(
 
     combined_rows: List[Dict[str, Any]] = []
     combined_debug: List[Dict[str, Any]] = []
+    failed = False
     for tid in tenant_candidates:
         per_debug = debug_info if (debug and len(tenant_candidates) == 1) else {}
         rows = _fetch_service_fee_history_graphql(
@@ -277,14 +278,20 @@ def fetch_service_fee_history(
             end_date=end_date,
             debug_info=per_debug if debug else None,
         )
-        if rows:
+        if rows is None:
+            failed = True
+        else:
             combined_rows.extend(rows)
         if debug and len(tenant_candidates) > 1:
             per_debug["tenant_id"] = tid
             per_debug["row_count"] = len(rows or [])
+            per_debug["failed"] = rows is None
             combined_debug.append(per_debug)
 
     if debug:
+        # `failed`: a tenant's request failed, so the rows are incomplete and
+        # must not be cached as the period's history.
+        debug_info["failed"] = failed
         debug_info["row_count"] = len(combined_rows)
         if combined_rows:
             debug_info["sample_keys"] = list(combined_rows[0].keys())
@@ -323,6 +330,7 @@ def fetch_transaction_history_rows(
 
     combined_rows: List[Dict[str, Any]] = []
     combined_debug: List[Dict[str, Any]] = []
+    failed = False
     for tid in tenant_candidates:
         per_debug = debug_info if (debug and len(tenant_candidates) == 1) else {}
         rows = _fetch_transaction_history_graphql(
@@ -332,14 +340,20 @@ def fetch_transaction_history_rows(
             end_date=end_date,
             debug_info=per_debug if debug else None,
         )
-        if rows:
+        if rows is None:
+            failed = True
+        else:
             combined_rows.extend(rows)
         if debug and len(tenant_candidates) > 1:
             per_debug["tenant_id"] = tid
             per_debug["row_count"] = len(rows or [])
+            per_debug["failed"] = rows is None
             combined_debug.append(per_debug)
 
     if debug:
+        # `failed`: a tenant's request failed, so the rows are incomplete and
+        # must not be cached as the period's history.
+        debug_info["failed"] = failed
         debug_info["row_count"] = len(combined_rows)
         if combined_rows:
             debug_info["sample_keys"] = list(combined_rows[0].keys())
@@ -390,7 +404,9 @@ def _fetch_finreports_raw(
             req_headers = dict(headers)
             req_headers["Accept"] = "application/json"
             req_headers["User-Agent"] = "upwork-earning-graph/1.0"
-            resp = requests.get(url, headers=req_headers, params=params, timeout=30)
+            resp = http_session().get(
+                url, headers=req_headers, params=params, timeout=30
+            )
             try:
                 return resp.json()
             except Exception:
@@ -432,7 +448,7 @@ def _resolve_provider_id(
     if tenant_id:
         headers["X-Upwork-API-TenantId"] = str(tenant_id)
 
-    resp = requests.get(url, headers=headers, timeout=30)
+    resp = http_session().get(url, headers=headers, timeout=30)
     try:
         payload = resp.json()
     except Exception:
@@ -698,7 +714,7 @@ def _fetch_transaction_history_graphql(
         token, tenant_id, query, variables, debug_info, date_range
     )
     if payload is None:
-        return []
+        return None
 
     rows = (
         ((payload.get("data") or {}).get("transactionHistory") or {}).get(
@@ -709,34 +725,37 @@ def _fetch_transaction_history_graphql(
     if not isinstance(rows, list):
         return []
 
-    out_rows: List[Dict[str, Any]] = []
-    for row in rows:
-        if not isinstance(row, dict):
-            continue
-        amt_obj = row.get("payment") or row.get("transactionAmount") or {}
+    return [transaction_history_row(row) for row in rows if isinstance(row, dict)]
+
+
+def transaction_history_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize one raw `transactionHistoryRow` node."""
+    amt_obj = row.get("payment") or row.get("transactionAmount") or {}
+    amt = 0.0
+    cur = None
+    try:
+        if isinstance(amt_obj, dict):
+            amt = float(amt_obj.get("rawValue") or 0)
+            cur = amt_obj.get("currency")
+    except Exception:
         amt = 0.0
-        cur = None
-        try:
-            if isinstance(amt_obj, dict):
-                amt = float(amt_obj.get("rawValue") or 0)
-                cur = amt_obj.get("currency")
-        except Exception:
-            amt = 0.0
 
-        out_rows.append(
-            {
-                "date": row.get("transactionCreationDate"),
-                "occurred_at": row.get("transactionCreationDate"),
-                "amount": amt,
-                "currency": cur,
-                "kind": row.get("type"),
-                "subtype": row.get("accountingSubtype"),
-                "description": row.get("description") or "",
-                "description_ui": row.get("descriptionUI") or "",
-                "client_name": _assignment_name(row),
-            }
-        )
-    return out_rows
+    return {
+        "date": row.get("transactionCreationDate"),
+        "occurred_at": row.get("transactionCreationDate"),
+        "amount": amt,
+        "currency": cur,
+        "kind": row.get("type"),
+        "subtype": row.get("accountingSubtype"),
+        "description": row.get("description") or "",
+        "description_ui": row.get("descriptionUI") or "",
+        "client_name": _assignment_name(row),
+    }
+
+
+# Batched queries the Upwork schema rejected in this process; these are sent
+# as separate single-field queries instead.
+_REJECTED_BATCHES: Set[str] = set()
 
 
 def _graphql_accounting_entity_ids(
@@ -744,33 +763,10 @@ def _graphql_accounting_entity_ids(
     tenant_id: Optional[str],
     debug_info: Optional[Dict[str, Any]],
 ) -> List[str]:
-    ace_ids: List[str] = []
-
-    query_many = """
-    query accountingEntities {
-      accountingEntities { id }
-    }
-    """
-    payload = _graphql_execute(token, tenant_id, query_many, None, debug_info, None)
-    if payload is not None:
-        entities = (payload.get("data") or {}).get("accountingEntities") or []
-        if isinstance(entities, list):
-            for ent in entities:
-                if isinstance(ent, dict) and ent.get("id"):
-                    ace_ids.append(str(ent.get("id")))
-
-    if not ace_ids:
-        query_one = """
-        query accountingEntity {
-          accountingEntity { id }
-        }
-        """
-        payload = _graphql_execute(token, tenant_id, query_one, None, debug_info, None)
-        if payload is None:
-            return []
-        entity = (payload.get("data") or {}).get("accountingEntity") or {}
-        ace_id = entity.get("id") if isinstance(entity, dict) else None
-        ace_ids = [str(ace_id)] if ace_id else []
+    if "accountingEntities" in _REJECTED_BATCHES:
+        ace_ids = _accounting_entity_ids_one_by_one(token, tenant_id, debug_info)
+    else:
+        ace_ids = _accounting_entity_ids_batched(token, tenant_id, debug_info)
 
     extra_raw = os.getenv("UPWORK_ACE_IDS", "")
     if extra_raw and not tenant_id:
@@ -785,6 +781,77 @@ def _graphql_accounting_entity_ids(
     return ace_ids
 
 
+def _accounting_entity_ids_batched(
+    token: Dict[str, Any],
+    tenant_id: Optional[str],
+    debug_info: Optional[Dict[str, Any]],
+) -> List[str]:
+    # Ask for both the list and the single-entity field in one round-trip;
+    # some accounts only expose one of them, so partial errors are expected.
+    batch = GraphQLBatch("accountingEntities")
+    batch.add("entities", "accountingEntities", "id")
+    batch.add("entity", "accountingEntity", "id")
+    payload = _graphql_execute(
+        token, tenant_id, batch.query(), None, debug_info, None, allow_partial=True
+    )
+    if payload is None:
+        # A field failing validation rejects the whole batch, and a non-null
+        # field error nulls its data. The schema will not change its mind,
+        # so this process asks for each field on its own from now on (the
+        # two requests the lookup cost before batching).
+        _REJECTED_BATCHES.add("accountingEntities")
+        return _accounting_entity_ids_one_by_one(token, tenant_id, debug_info)
+    batch_data, _batch_errors = batch.split(payload)
+
+    entities = batch_data.get("entities") or []
+    if isinstance(entities, list):
+        ace_ids = [
+            str(ent.get("id"))
+            for ent in entities
+            if isinstance(ent, dict) and ent.get("id")
+        ]
+        if ace_ids:
+            return ace_ids
+    entity = batch_data.get("entity") or {}
+    ace_id = entity.get("id") if isinstance(entity, dict) else None
+    return [str(ace_id)] if ace_id else []
+
+
+def _accounting_entity_ids_one_by_one(
+    token: Dict[str, Any],
+    tenant_id: Optional[str],
+    debug_info: Optional[Dict[str, Any]],
+) -> List[str]:
+    query_many = """
+    query accountingEntities {
+      accountingEntities { id }
+    }
+    """
+    payload = _graphql_execute(token, tenant_id, query_many, None, debug_info, None)
+    if payload is not None:
+        entities = (payload.get("data") or {}).get("accountingEntities") or []
+        if isinstance(entities, list):
+            ace_ids = [
+                str(ent.get("id"))
+                for ent in entities
+                if isinstance(ent, dict) and ent.get("id")
+            ]
+            if ace_ids:
+                return ace_ids
+
+    query_one = """
+    query accountingEntity {
+      accountingEntity { id }
+    }
+    """
+    payload = _graphql_execute(token, tenant_id, query_one, None, debug_info, None)
+    if payload is None:
+        return []
+    entity = (payload.get("data") or {}).get("accountingEntity") or {}
+    ace_id = entity.get("id") if isinstance(entity, dict) else None
+    return [str(ace_id)] if ace_id else []
+
+
 def _graphql_execute(
     token: Dict[str, Any],
     tenant_id: Optional[str],
@@ -792,6 +859,7 @@ def _graphql_execute(
     variables: Optional[Dict[str, Any]],
     debug_info: Optional[Dict[str, Any]],
     date_range: Optional[Dict[str, Any]],
+    allow_partial: bool = False,
 ) -> Optional[Dict[str, Any]]:
     access_token = token.get("access_token") or token.get("token")
     if not access_token:
@@ -806,7 +874,7 @@ def _graphql_execute(
     if tenant_id:
         headers["X-Upwork-API-TenantId"] = str(tenant_id)
 
-    resp = requests.post(
+    resp = http_session().post(
         "https://api.upwork.com/graphql",
         headers=headers,
         json={"query": query, "variables": variables or {}},
@@ -834,7 +902,7 @@ def _graphql_execute(
                 "errors": payload.get("errors"),
             }
         )
-    if payload.get("errors"):
+    if payload.get("errors") and not (allow_partial and payload.get("data")):
         return None
     return payload
 
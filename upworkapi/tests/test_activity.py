@@ -0,0 +1,155 @@
+from io import StringIO
+import threading
+import time
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from unittest.mock import patch
+
+from upworkapi.models import UpworkGrant
+from upworkapi.services import activity
+from upworkapi.services.tokens import store_token
+from upworkapi.utils import RateLimiter
+
+
+class ActivityTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_touch_is_throttled_by_the_session(self):
+        session = {"tenant_id": "t1", "freelancer_reference": "~me"}
+
+        self.assertTrue(activity.touch(5, session))
+        self.assertFalse(activity.touch(5, session))
+        session["tenant_id"] = "t2"
+        self.assertTrue(activity.touch(5, session))
+
+        [(user_id, profile)] = activity.active_users(1)
+        self.assertEqual(user_id, "5")
+        self.assertEqual(profile["tenant_id"], "t2")
+
+    def test_active_users_filters_by_age_and_skips_forgotten(self):
+        activity.touch(1, {})
+        activity.touch(2, {})
+        activity.forget(2)
+
+        self.assertEqual([u for u, _p in activity.active_users(1)], ["1"])
+        later = time.time() + 3 * 86400
+        self.assertEqual(activity.active_users(2, now=later), [])
+
+    def test_touch_keeps_the_stored_token_age(self):
+        store_token(1, {"access_token": "a", "refresh_token": "r", "expires_in": 60})
+        stored_at = UpworkGrant.objects.get(owner="1").updated_at
+
+        activity.touch(1, {"freelancer_reference": "~me"})
+
+        grant = UpworkGrant.objects.get(owner="1")
+        self.assertEqual(grant.updated_at, stored_at)
+        self.assertEqual(grant.profile["freelancer_reference"], "~me")
+
+    def test_anonymous_sessions_are_not_recorded(self):
+        self.assertFalse(activity.touch(None, {}))
+        self.assertEqual(activity.active_users(1), [])
+
+
+class RateLimiterTestCase(SimpleTestCase):
+
+    def test_calls_are_paced_across_threads(self):
+        limiter = RateLimiter(50, burst=1)
+        started = time.monotonic()
+        threads = [threading.Thread(target=limiter.wait) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        # The first call is free; five more at 50/s need at least 0.1s.
+        self.assertGreaterEqual(time.monotonic() - started, 0.09)
+
+
+class RefreshActiveCachesCommandTestCase(TransactionTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.token = {"access_token": "a", "expires_at": time.time() + 3600}
+
+    def _call(self, *args):
+        out, err = StringIO(), StringIO()
+        call_command("refresh_active_caches", *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    @patch("upworkapi.management.commands.refresh_active_caches._refresh_user_caches")
+    def test_refreshes_active_users_with_stored_tokens(self, mock_refresh):
+        mock_refresh.return_value = True
+        activity.touch(1, {"tenant_id": "t1", "freelancer_reference": "~one"})
+        activity.touch(2, {"freelancer_reference": "~two"})
+        store_token(1, self.token)
+
+        out, err = self._call("--rate", "0")
+
+        mock_refresh.assert_called_once()
+        self.assertEqual(mock_refresh.call_args.args, ("1",))
+        self.assertEqual(mock_refresh.call_args.kwargs["tenant_id"], "t1")
+        self.assertEqual(mock_refresh.call_args.kwargs["token"], self.token)
+        self.assertIn("no_token=1, refreshed=1", out)
+        self.assertIn("user 2: no_token", err)
+
+    @patch("upworkapi.management.commands.refresh_active_caches._refresh_user_caches")
+    def test_dry_run_only_lists(self, mock_refresh):
+        activity.touch(1, {"freelancer_reference": "~one"})
+        store_token(1, self.token)
+
+        out, _err = self._call("--dry-run")
+
+        mock_refresh.assert_not_called()
+        self.assertIn("1 user(s) active", out)
+
+    @patch("upworkapi.management.commands.refresh_active_caches._refresh_user_caches")
+    def test_concurrency_is_bounded(self, mock_refresh):
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def refresh(*args, **kwargs):
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.02)
+            with lock:
+                running.pop()
+            return True
+
+        mock_refresh.side_effect = refresh
+        for user_id in range(1, 7):
+            activity.touch(user_id, {"freelancer_reference": "~%s" % user_id})
+            store_token(user_id, self.token)
+
+        self._call("--concurrency", "2", "--rate", "0")
+
+        self.assertEqual(mock_refresh.call_count, 6)
+        self.assertLessEqual(max(peak), 2)
+
+    @patch("upworkapi.views.reports._cached_all_time_year_summary")
+    @patch("upworkapi.views.reports._cached_upwork_join_year", return_value=2024)
+    @patch("upworkapi.views.reports._build_dashboard_snapshot")
+    def test_refresh_skips_user_with_running_build(
+        self, mock_snapshot, mock_join_year, mock_summary
+    ):
+        from upworkapi.views.reports import _refresh_user_caches
+
+        cache.add("dashboard_snapshot_lock:1:t1", "1")
+        kwargs = dict(
+            token=self.token,
+            tenant_id="t1",
+            tenant_ids=None,
+            freelancer_reference="~one",
+        )
+        self.assertFalse(_refresh_user_caches(1, **kwargs))
+        mock_snapshot.assert_not_called()
+
+        cache.delete("dashboard_snapshot_lock:1:t1")
+        self.assertTrue(_refresh_user_caches(1, **kwargs))
+        mock_snapshot.assert_called_once()
+        years = sorted(c.kwargs["year"] for c in mock_summary.call_args_list)
+        self.assertEqual(years[0], 2024)
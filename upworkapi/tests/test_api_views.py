@@ -0,0 +1,243 @@
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from unittest.mock import patch
+import time
+
+from oauthlib.oauth2 import InvalidGrantError
+
+from upworkapi.services.transactions import UpworkGraphQLError
+
+
+class ReportApiViewsTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.user = User.objects.create_user(username="testuser", password="pw")
+        self.graph = {"x_axis": ["W1"], "report": [10.0], "total_earning": 10.0}
+
+    def _login(self):
+        self.client.force_login(self.user)
+        session = self.client.session
+        session["token"] = {"access_token": "test"}
+        session.save()
+
+    def test_requires_authentication(self):
+        response = self.client.get(reverse("api_hourly_year", args=[2020]))
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response["Cache-Control"], "no-store")
+
+    def test_requires_token(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("api_hourly_year", args=[2020]))
+        self.assertEqual(response.status_code, 401)
+
+    @patch("upworkapi.views.api._cached_earning_graph_annually")
+    def test_closed_year_is_cacheable_with_etag(self, mock_graph):
+        mock_graph.return_value = self.graph
+        self._login()
+
+        response = self.client.get(reverse("api_hourly_year", args=[2020]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"graph": self.graph})
+        self.assertIn("private", response["Cache-Control"])
+        self.assertIn("max-age=3600", response["Cache-Control"])
+        self.assertTrue(response["ETag"].startswith('"'))
+        self.assertIn("Cookie", response["Vary"])
+
+    @patch("upworkapi.views.api._cached_earning_graph_monthly")
+    def test_if_none_match_returns_not_modified(self, mock_graph):
+        mock_graph.return_value = self.graph
+        self._login()
+        url = reverse("api_hourly_month", args=[2020, 5])
+
+        etag = self.client.get(url)["ETag"]
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    @patch("upworkapi.views.api._cached_earning_graph_annually")
+    def test_upwork_error_returns_bad_gateway(self, mock_graph):
+        mock_graph.side_effect = UpworkGraphQLError("boom")
+        self._login()
+
+        response = self.client.get(reverse("api_hourly_year", args=[2020]))
+
+        self.assertEqual(response.status_code, 502)
+        self.assertIn("boom", response.json()["error"])
+
+    @patch("upworkapi.views.api._cached_earning_graph_annually")
+    def test_expired_grant_returns_unauthorized(self, mock_graph):
+        mock_graph.side_effect = InvalidGrantError()
+        self._login()
+
+        response = self.client.get(reverse("api_hourly_year", args=[2020]))
+
+        self.assertEqual(response.status_code, 401)
+        self.assertNotIn("token", self.client.session)
+
+    @patch("upworkapi.views.api._cached_earning_graph_annually")
+    def test_local_errors_are_not_reported_as_upstream(self, mock_graph):
+        mock_graph.side_effect = KeyError("x")
+        self._login()
+
+        with self.assertRaises(KeyError):
+            self.client.get(reverse("api_hourly_year", args=[2020]))
+
+    @patch("upworkapi.views.reports._fetch_time_report")
+    def test_hourly_details_are_paginated(self, mock_fetch):
+        mock_fetch.return_value = [
+            {
+                "date": "2020-05-%02d" % day,
+                "charges": str(day),
+                "hours": 1.0,
+                "memo": "Task %d" % day,
+                "client_name": "Acme" if day % 2 else "Beta",
+            }
+            for day in range(1, 8)
+        ] + [
+            {
+                "date": "2020-06-01",
+                "charges": "99",
+                "hours": 1.0,
+                "memo": "",
+                "client_name": "Acme",
+            }
+        ]
+        self._login()
+        url = reverse("api_hourly_month_details", args=[2020, 5])
+
+        response = self.client.get(
+            url, {"client": "Acme", "sort": "-amount", "per_page": 3}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([r["amount"] for r in data["rows"]], [7.0, 5.0, 3.0])
+        self.assertEqual(data["rows"][0]["display_date"], "07-05-2020")
+        self.assertEqual(data["pages"], 2)
+        self.assertEqual(data["total_amount"], 16.0)
+        self.assertEqual(data["clients"], ["Acme", "Beta"])
+
+    @patch("upworkapi.views.api._cached_upwork_join_year", return_value=2000)
+    @patch("upworkapi.views.reports.fetch_transaction_history_rows")
+    @patch("upworkapi.views.reports._fetch_time_report")
+    def test_client_trend_spans_years_in_one_request(
+        self, mock_time, mock_txn, _join_year
+    ):
+        def time_rows(token, start, end):
+            return [
+                {
+                    "date": "%s-02-01" % start[:4],
+                    "charges": "90",
+                    "hours": 3.0,
+                    "memo": "",
+                    "client_name": "Acme Corp >",
+                }
+            ]
+
+        mock_time.side_effect = time_rows
+        mock_txn.side_effect = lambda **kw: (
+            [
+                {
+                    "date": "%s-02-05" % kw["start_date"].year,
+                    "amount": -9.0,
+                    "kind": "Service Fee",
+                    "description": "Service Fee - Acme Corp",
+                    "client_name": "Acme Corp",
+                }
+            ],
+            {},
+        )
+        self._login()
+        url = reverse("api_client_trend", args=["Acme Corp"])
+
+        response = self.client.get(url, {"years": 3})
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(len(data["years"]), 3)
+        self.assertEqual(data["totals"]["earnings"], 270.0)
+        self.assertEqual(data["totals"]["effective_rate"], 30.0)
+        self.assertEqual(data["totals"]["fee_share"], 0.1)
+        self.assertEqual(mock_time.call_count, 3)
+
+        self.client.get(url, {"years": 3})
+        self.assertEqual(mock_time.call_count, 3)
+        missing = self.client.get(reverse("api_client_trend", args=["Nobody"]))
+        self.assertEqual(missing.status_code, 404)
+        bad = self.client.get(url, {"years": "five"})
+        self.assertEqual(bad.status_code, 400)
+
+    @patch("upworkapi.views.reports._fetch_time_report")
+    def test_rates_share_the_cached_year_rows(self, mock_fetch):
+        mock_fetch.return_value = [
+            {
+                "date": "2020-03-02",
+                "charges": "120",
+                "hours": 4.0,
+                "memo": "",
+                "client_name": "Acme",
+            }
+        ]
+        self._login()
+
+        self.client.get(reverse("api_hours_year", args=[2020]))
+        response = self.client.get(reverse("api_rates_year", args=[2020]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mock_fetch.call_count, 1)
+        data = response.json()
+        self.assertEqual(data["totals"]["effective_rate"], 30.0)
+        self.assertEqual(data["clients"][0]["client"], "Acme")
+        self.assertEqual(len(data["months"]), 12)
+
+    def test_rejects_invalid_month(self):
+        self._login()
+        response = self.client.get(reverse("api_hourly_month", args=[2020, 13]))
+        self.assertEqual(response.status_code, 400)
+
+    def test_rejects_post(self):
+        self._login()
+        response = self.client.post(reverse("api_hourly_year", args=[2020]))
+        self.assertEqual(response.status_code, 405)
+
+    @patch("upworkapi.views.api._warm_all_time_years_async")
+    @patch("upworkapi.views.api._cached_upwork_join_year", return_value=2020)
+    def test_all_time_cold_cache_returns_accepted(self, _join_year, mock_warm):
+        mock_warm.side_effect = lambda **kw: cache.add(
+            "all_time_warm_lock:%s::testuser" % self.user.id, "1"
+        )
+        self._login()
+
+        response = self.client.get(reverse("api_all_time"))
+
+        self.assertEqual(response.status_code, 202)
+        self.assertTrue(response.json()["warming"])
+        self.assertIn(2020, response.json()["missing_years"])
+        mock_warm.assert_called_once()
+
+    @patch("upworkapi.views.api._warm_all_time_years_async", return_value=False)
+    @patch("upworkapi.views.api._cached_upwork_join_year", return_value=2020)
+    def test_all_time_reports_failed_years(self, _join_year, _warm):
+        cache.set(
+            "all_time_warm_retry:%s::testuser" % self.user.id,
+            {
+                "attempts": 1,
+                "retry_at": time.time() + 120,
+                "failed_years": [2020],
+                "last_error": "boom",
+            },
+        )
+        self._login()
+
+        data = self.client.get(reverse("api_all_time")).json()
+
+        self.assertFalse(data["warming"])
+        self.assertEqual(data["failed_years"], [2020])
+        self.assertEqual(data["last_error"], "boom")
+        self.assertGreater(data["retry_in"], 60)
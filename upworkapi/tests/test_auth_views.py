@@ -42,12 +42,18 @@ class AuthViewTestCase(TestCase):
         )
         self.assertEqual(response.status_code, 400)
 
+    @patch("upworkapi.views.auth._build_dashboard_snapshots_async")
     @patch("upworkapi.views.auth.login")
     @patch("upworkapi.views.auth.graphql.Api")
     @patch("upworkapi.views.auth.upwork_client.get_client")
     @patch("upworkapi.views.auth.authenticate")
     def test_callback_success_flow(
-        self, mock_authenticate, mock_get_client, mock_graphql_api, mock_login
+        self,
+        mock_authenticate,
+        mock_get_client,
+        mock_graphql_api,
+        mock_login,
+        mock_snapshots,
     ):
         session = self.client.session
         session["upwork_oauth_state"] = "test_state"
@@ -88,6 +94,59 @@ class AuthViewTestCase(TestCase):
         self.assertEqual(response.url, reverse("earning_graph"))
         self.assertIn("token", self.client.session)
         self.assertIn("upwork_auth", self.client.session)
+        self.assertEqual(mock_snapshots.call_args.kwargs["user_id"], test_user.id)
+
+    @patch("upworkapi.views.auth._build_dashboard_snapshots_async")
+    @patch("upworkapi.views.auth.login")
+    @patch("upworkapi.views.auth.graphql.Api")
+    @patch("upworkapi.views.auth.upwork_client.get_client")
+    @patch("upworkapi.views.auth.authenticate")
+    def test_callback_survives_a_rejected_tenant_field(
+        self,
+        mock_authenticate,
+        mock_get_client,
+        mock_graphql_api,
+        mock_login,
+        mock_snapshots,
+    ):
+        session = self.client.session
+        session["upwork_oauth_state"] = "test_state"
+        session.save()
+
+        mock_client = MagicMock()
+        mock_client.get_access_token.return_value = {"access_token": "test_token"}
+        mock_get_client.return_value = mock_client
+
+        mock_api = MagicMock()
+        mock_api.execute.side_effect = [
+            {"data": None, "errors": [{"message": "companySelector failed"}]},
+            {
+                "data": {
+                    "user": {
+                        "rid": "test_rid",
+                        "email": "test@example.com",
+                        "photoUrl": None,
+                        "freelancerProfile": {
+                            "fullName": "Test User",
+                            "firstName": "Test",
+                            "lastName": "User",
+                            "personalData": {"profileUrl": None},
+                        },
+                    }
+                }
+            },
+        ]
+        mock_graphql_api.return_value = mock_api
+        mock_authenticate.return_value = User.objects.create_user(username="test_rid")
+
+        response = self.client.get(
+            reverse("callback"), {"code": "test_code", "state": "test_state"}
+        )
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(mock_api.execute.call_count, 2)
+        self.assertNotIn("companySelector", mock_api.execute.call_args[0][0]["query"])
+        self.assertNotIn("tenant_id", self.client.session)
 
     def test_disconnect_clears_session_and_redirects(self):
         session = self.client.session
@@ -0,0 +1,181 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from unittest.mock import patch
+
+from upworkapi.benchmarks.fixtures import TransactionMix, build_dataset, seed_cache
+from upworkapi.benchmarks.load import LoadStep, percentile, run_load
+from upworkapi.benchmarks.runner import compare
+from upworkapi.benchmarks.stub_server import StubUpworkServer, upwork_routed_to
+from upworkapi.services.transactions import transaction_history_row
+from upworkapi.views import reports
+
+
+class StubServerTestCase(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_time_report_is_served_from_the_dataset(self):
+        dataset = build_dataset(years=1, transactions=10, end_year=2020, seed=3)
+        expected = [r for r in dataset.time_report if r["dateWorkedOn"] < "2020-02"]
+
+        with StubUpworkServer(dataset) as server, upwork_routed_to(server.url):
+            rows = reports._fetch_time_report(
+                {"access_token": "x"}, "20200101", "20200131"
+            )
+
+        self.assertEqual(len(rows), len(expected))
+        self.assertEqual(server.calls["timeReport"], 1)
+
+    def test_dataset_round_trips_through_json(self):
+        dataset = build_dataset(years=1, transactions=20, tenants=2, end_year=2020)
+        again = type(dataset).from_json(dataset.to_json())
+        self.assertEqual(again.transactions, dataset.transactions)
+        self.assertEqual(sorted(again.transactions), ["tenant-1", "tenant-2"])
+
+
+class GeneratorTestCase(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def _rows(self, dataset, tenant="tenant-1"):
+        return [transaction_history_row(r) for r in dataset.transactions[tenant]]
+
+    def test_mix_produces_fees_membership_and_connects(self):
+        dataset = build_dataset(years=1, transactions=40, end_year=2020)
+        rows = self._rows(dataset)
+
+        earnings = [r for r in rows if reports._is_txn_earning_row(r)]
+        fees = [r for r in rows if reports._is_txn_fee_row(r)]
+        self.assertEqual(len(earnings), 40)
+        self.assertEqual(len(fees), 40)
+        self.assertEqual(
+            len([r for r in rows if reports._is_txn_membership_row(r)]), 12
+        )
+        self.assertTrue(any(reports._is_txn_connects_row(r) for r in rows))
+
+    def test_fees_and_charges_can_be_disabled(self):
+        mix = TransactionMix(service_fee_rate=0, membership_fee=0, connects_per_month=0)
+        dataset = build_dataset(years=1, transactions=10, mix=mix, end_year=2020)
+        self.assertEqual(len(dataset.transactions["tenant-1"]), 10)
+
+    def test_invoice_descriptions_carry_parseable_work_periods(self):
+        for name in ("mdy", "iso", "month_day", "day_month", "dmy_dash"):
+            dataset = build_dataset(
+                years=1,
+                transactions=20,
+                mix=TransactionMix(hourly=1, fixed=0, bonus=0, milestone=0),
+                description_formats=[name],
+                end_year=2020,
+            )
+            for row in self._rows(dataset):
+                if row["kind"] != "APInvoice":
+                    continue
+                start, end = reports._parse_txn_work_range(row)
+                self.assertIsNotNone(end, (name, row["description"]))
+                self.assertEqual((end - start).days, 6)
+                self.assertLess(end.isoformat(), row["date"][:10])
+
+    def test_seed_cache_serves_reports_without_upstream(self):
+        dataset = build_dataset(years=1, transactions=30, end_year=2020)
+        seed_cache(dataset, user_id=7, years=[2020])
+        request = reports._request_stub(7)
+
+        with patch(
+            "upworkapi.views.reports._fetch_time_report", side_effect=AssertionError
+        ), patch(
+            "upworkapi.views.reports.fetch_transaction_history_rows",
+            side_effect=AssertionError,
+        ):
+            time_rows = reports._cached_time_report_year(request, {}, 2020)
+            txn_rows = reports._cached_transaction_history_year(
+                request, token={}, tenant_id="tenant-1", tenant_ids=None, year=2020
+            )
+
+        self.assertEqual(len(time_rows), len(dataset.time_report))
+        self.assertEqual(len(txn_rows), len(dataset.transactions["tenant-1"]))
+
+
+class CompareTestCase(SimpleTestCase):
+
+    def test_flags_slowdowns_and_extra_upstream_calls(self):
+        baseline = {
+            "cases": {"a": {"cold_ms": 100.0, "warm_ms": 2.0, "upstream_calls": 3}}
+        }
+        current = {
+            "cases": {"a": {"cold_ms": 150.0, "warm_ms": 4.0, "upstream_calls": 4}}
+        }
+
+        regressions = compare(current, baseline, threshold=0.2)
+
+        self.assertEqual(len(regressions), 2)
+        self.assertIn("cold_ms", regressions[0])
+        self.assertIn("upstream_calls", regressions[1])
+
+    def test_small_absolute_changes_are_ignored(self):
+        baseline = {"cases": {"a": {"cold_ms": 2.0, "warm_ms": 1.0}}}
+        current = {"cases": {"a": {"cold_ms": 5.0, "warm_ms": 3.0}}}
+        self.assertEqual(compare(current, baseline), [])
+
+
+class BenchmarkCommandTestCase(SimpleTestCase):
+
+    def test_runs_selected_cases(self):
+        out = StringIO()
+        call_command(
+            "benchmark_reports",
+            "--years",
+            "1",
+            "--transactions",
+            "200",
+            "--repeat",
+            "1",
+            "--only",
+            "timereport",
+            stdout=out,
+        )
+        self.assertIn("view:timereport_graph", out.getvalue())
+        self.assertNotIn("view:fixed_price_graph", out.getvalue())
+
+
+class LoadTestCase(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_percentile_nearest_rank(self):
+        values = [float(v) for v in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 50.0)
+        self.assertEqual(percentile(values, 95), 95.0)
+        self.assertEqual(percentile(values, 99), 99.0)
+        self.assertIsNone(percentile([], 50))
+
+    def test_sessions_share_the_worker_pool(self):
+        dataset = build_dataset(years=1, transactions=50)
+        journey = [LoadStep("timereport", "/timereport/")]
+
+        with StubUpworkServer(dataset) as server, upwork_routed_to(server.url):
+            report = run_load(
+                server, journey, sessions=3, workers=1, rounds=2
+            ).as_dict()
+
+        self.assertEqual(report["overall"]["requests"], 6)
+        self.assertEqual(report["overall"]["errors"], 0)
+        self.assertEqual(report["steps"]["timereport"]["requests"], 6)
+        # Each user fetches its time report once; the second round is cached.
+        self.assertEqual(report["upstream_calls"]["timeReport"], 3)
+        self.assertGreater(report["saturation"], 0)
+
+    def test_failed_requests_are_counted_not_raised(self):
+        dataset = build_dataset(years=1, transactions=10)
+        journey = [LoadStep("missing", "/earning/fixed/1/13")]
+
+        with StubUpworkServer(dataset) as server, upwork_routed_to(server.url):
+            report = run_load(server, journey, sessions=1, workers=1).as_dict()
+
+        self.assertEqual(report["overall"]["errors"], 1)
+        self.assertTrue(report["errors"])
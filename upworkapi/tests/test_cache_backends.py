@@ -0,0 +1,82 @@
+import pickle
+import shutil
+import tempfile
+import zlib
+
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase
+from unittest.mock import patch
+
+from upworkapi.cache_backends import CompressedFileBasedCache
+from upworkapi.services import metrics
+
+
+class CompressedFileBasedCacheTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir, True)
+        self._values = patch.object(metrics, "_values", {})
+        self._values.start()
+        self.addCleanup(self._values.stop)
+
+    def _cache(self, **options):
+        options.setdefault("COMPRESSOR", "zlib")
+        return CompressedFileBasedCache(self.dir, {"OPTIONS": options})
+
+    def _stored(self, cache, key):
+        with open(cache._key_to_file(key), "rb") as f:
+            pickle.load(f)  # expiry
+            return f.read()
+
+    def test_small_values_are_stored_raw(self):
+        cache = self._cache(COMPRESS_MIN_BYTES=1024)
+        cache.set("k", {"a": 1})
+
+        self.assertEqual(self._stored(cache, "k")[:1], b"\x00")
+        self.assertEqual(cache.get("k"), {"a": 1})
+
+    def test_large_values_are_compressed_and_counted(self):
+        cache = self._cache(COMPRESS_MIN_BYTES=1024)
+        rows = [
+            {"date": "2024-01-%02d" % (i % 28 + 1), "memo": "work"} for i in range(500)
+        ]
+        cache.set("rows", rows)
+
+        stored = self._stored(cache, "rows")
+        raw_size = len(pickle.dumps(rows, pickle.HIGHEST_PROTOCOL))
+        self.assertLess(len(stored), raw_size / 5)
+        self.assertEqual(cache.get("rows"), rows)
+
+        values = metrics.snapshot()["values"]
+        codec = (("codec", "zlib"),)
+        self.assertEqual(
+            values["upworkapi_cache_uncompressed_bytes_total"][codec], raw_size
+        )
+        self.assertEqual(
+            values["upworkapi_cache_stored_bytes_total"][codec], len(stored)
+        )
+        self.assertIn(
+            (("op", "decompress"),),
+            values["upworkapi_cache_compression_cpu_seconds_total"],
+        )
+
+    def test_reads_entries_written_by_the_stock_backend(self):
+        FileBasedCache(self.dir, {}).set("k", ["old"] * 10)
+        self.assertEqual(self._cache().get("k"), ["old"] * 10)
+        self.assertEqual(zlib.decompress(self._stored(self._cache(), "k"))[:1], b"\x80")
+
+    def test_touch_keeps_the_value(self):
+        cache = self._cache(COMPRESS_MIN_BYTES=0)
+        cache.set("k", "x" * 2000, 60)
+
+        self.assertTrue(cache.touch("k", 600))
+        self.assertEqual(cache.get("k"), "x" * 2000)
+
+    def test_unknown_or_missing_codec_is_a_configuration_error(self):
+        with self.assertRaises(ImproperlyConfigured):
+            self._cache(COMPRESSOR="lz4")
+        with patch("upworkapi.cache_backends.zstandard", None):
+            with self.assertRaises(ImproperlyConfigured):
+                self._cache(COMPRESSOR="zstd")
@@ -0,0 +1,88 @@
+from django.test import SimpleTestCase
+
+from upworkapi.services.client_analytics import (
+    client_names,
+    client_series,
+    client_year_stats,
+)
+
+
+def _stats(time_rows, fee_rows=()):
+    return client_year_stats(
+        time_rows,
+        fee_rows,
+        time_client=lambda r: r["client_name"],
+        fee_client=lambda r: r["client_name"],
+        fee_date=lambda r: r["date"],
+    )
+
+
+class ClientAnalyticsTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.stats_by_year = {
+            2022: _stats(
+                [
+                    {
+                        "date": "2022-01-10",
+                        "charges": "100",
+                        "hours": 4,
+                        "client_name": "Acme",
+                    },
+                    {
+                        "date": "2022-01-11",
+                        "charges": "50",
+                        "hours": 1,
+                        "client_name": "Acme",
+                    },
+                    {"date": "", "charges": "999", "hours": 1, "client_name": "Acme"},
+                ],
+                [
+                    {
+                        "date": "2022-01-31T00:00:00",
+                        "amount": -15.0,
+                        "client_name": "Acme",
+                    }
+                ],
+            ),
+            2023: _stats(
+                [
+                    {
+                        "date": "2023-06-01",
+                        "charges": "400",
+                        "hours": 8,
+                        "client_name": "Beta",
+                    },
+                    {
+                        "date": "2023-06-02",
+                        "charges": "60",
+                        "hours": 2,
+                        "client_name": "Acme",
+                    },
+                ]
+            ),
+        }
+
+    def test_year_stats_group_by_client_and_month(self):
+        self.assertEqual(
+            self.stats_by_year[2022],
+            {"Acme": {1: {"earnings": 150.0, "hours": 5.0, "fees": 15.0}}},
+        )
+
+    def test_series_covers_every_month_of_every_year(self):
+        series = client_series(self.stats_by_year, "Acme")
+
+        self.assertEqual(len(series["months"]), 24)
+        january = series["months"][0]
+        self.assertEqual(january["period"], "2022-01")
+        self.assertEqual(january["effective_rate"], 30.0)
+        self.assertEqual(january["fee_share"], 0.1)
+        self.assertIsNone(series["months"][1]["effective_rate"])
+        self.assertEqual(
+            [(y["year"], y["earnings"]) for y in series["years"]],
+            [(2022, 150.0), (2023, 60.0)],
+        )
+        self.assertEqual(series["totals"]["effective_rate"], 30.0)
+
+    def test_client_names_by_earnings(self):
+        self.assertEqual(client_names(self.stats_by_year), ["Beta", "Acme"])
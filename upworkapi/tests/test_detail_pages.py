@@ -0,0 +1,61 @@
+from django.test import SimpleTestCase
+
+from upworkapi.services.detail_pages import (
+    MAX_PER_PAGE,
+    detail_query,
+    paginate_details,
+)
+
+
+def _row(day, client, amount):
+    return {
+        "date": "2024-03-%02d" % day,
+        "display_date": "%02d-03-2024" % day,
+        "client": client,
+        "description": "%s - work" % client,
+        "amount": amount,
+    }
+
+
+class PaginateDetailsTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.rows = [
+            _row(3, "Beta", 30.0),
+            _row(1, "Acme", 10.0),
+            _row(2, "Acme", 50.0),
+        ]
+
+    def test_pages_in_date_order(self):
+        page = paginate_details(self.rows, page=2, per_page=2)
+
+        self.assertEqual([r["date"] for r in page["rows"]], ["2024-03-03"])
+        self.assertEqual(page["offset"], 2)
+        self.assertEqual(page["pages"], 2)
+        self.assertEqual(page["total_rows"], 3)
+        self.assertEqual(page["total_amount"], 90.0)
+        self.assertEqual(page["clients"], ["Acme", "Beta"])
+
+    def test_descending_sort_and_client_filter(self):
+        page = paginate_details(self.rows, sort="-amount", client="Acme")
+
+        self.assertEqual([r["amount"] for r in page["rows"]], [50.0, 10.0])
+        self.assertEqual(page["total_amount"], 60.0)
+        self.assertEqual(page["clients"], ["Acme", "Beta"])
+
+    def test_page_past_the_end_is_clamped(self):
+        page = paginate_details(self.rows, page=9, per_page=2)
+        self.assertEqual(page["page"], 2)
+
+        empty = paginate_details([], page=3)
+        self.assertEqual((empty["page"], empty["pages"], empty["rows"]), (1, 1, []))
+
+    def test_query_is_clamped(self):
+        query = detail_query(
+            {"page": "-4", "per_page": "100000", "sort": "memo", "client": " Acme "}
+        )
+        self.assertEqual(
+            query,
+            {"page": 1, "per_page": MAX_PER_PAGE, "sort": "date", "client": "Acme"},
+        )
+        self.assertEqual(detail_query({"page": "x"})["page"], 1)
@@ -0,0 +1,211 @@
+import csv
+import io
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+import pyarrow.parquet
+import requests
+
+
+def _txn_rows(start_date, **kwargs):
+    year = start_date.year
+    return [
+        {
+            "date": "%s-03-10" % year,
+            "amount": 100.0,
+            "kind": "Hourly",
+            "description": "Invoice for hours",
+            "client_name": "Acme Corp",
+            "currency": "USD",
+        },
+        {
+            "date": "%s-03-02" % year,
+            "amount": -10.0,
+            "kind": "Service Fee",
+            "description": "Service Fee - Acme Corp",
+            "client_name": "Acme Corp",
+            "currency": "USD",
+        },
+        {
+            "date": "%s-04-01" % year,
+            "amount": -0.15,
+            "kind": "Connects",
+            "description": "Connects purchase",
+            "currency": "USD",
+        },
+    ]
+
+
+@patch("upworkapi.views.export._cached_upwork_join_year", return_value=2020)
+@patch("upworkapi.views.reports.fetch_transaction_history_rows")
+class TransactionExportTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.user = User.objects.create_user(username="testuser", password="pw")
+        self.url = reverse("export_transactions")
+
+    def _login(self):
+        self.client.force_login(self.user)
+        session = self.client.session
+        session["token"] = {"access_token": "test"}
+        session.save()
+
+    def _csv(self, response):
+        body = b"".join(response.streaming_content).decode("utf-8")
+        return list(csv.DictReader(io.StringIO(body)))
+
+    def test_requires_token(self, mock_txn, _join_year):
+        self.client.force_login(self.user)
+
+        response = self.client.get(self.url)
+
+        self.assertRedirects(response, reverse("auth"), fetch_redirect_response=False)
+        mock_txn.assert_not_called()
+
+    def test_csv_streams_classified_rows_by_year(self, mock_txn, _join_year):
+        mock_txn.side_effect = lambda **kw: (_txn_rows(**kw), {})
+        self._login()
+
+        response = self.client.get(
+            self.url, {"start": "2020-01-01", "end": "2021-12-31"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertIn("2020-01-01-2021-12-31.csv", response["Content-Disposition"])
+        rows = self._csv(response)
+        self.assertEqual(
+            [(r["date"], r["category"]) for r in rows],
+            [
+                ("2020-03-02", "service_fee"),
+                ("2020-03-10", "earning"),
+                ("2020-04-01", "connects"),
+                ("2021-03-02", "service_fee"),
+                ("2021-03-10", "earning"),
+                ("2021-04-01", "connects"),
+            ],
+        )
+        self.assertEqual(rows[1]["client"], "Acme Corp")
+        self.assertEqual(float(rows[1]["amount"]), 100.0)
+        self.assertEqual(mock_txn.call_count, 2)
+
+    def test_range_filters_rows_and_reuses_cached_years(self, mock_txn, _join_year):
+        mock_txn.side_effect = lambda **kw: (_txn_rows(**kw), {})
+        self._login()
+
+        first = self._csv(
+            self.client.get(self.url, {"start": "2020-03-05", "end": "2020-03-31"})
+        )
+        again = self._csv(
+            self.client.get(self.url, {"start": "2020-03-05", "end": "2020-03-31"})
+        )
+
+        self.assertEqual([r["date"] for r in first], ["2020-03-10"])
+        self.assertEqual(first, again)
+        self.assertEqual(mock_txn.call_count, 1)
+
+    def test_defaults_to_join_year(self, mock_txn, _join_year):
+        mock_txn.return_value = ([], {})
+        self._login()
+
+        response = self.client.get(self.url)
+
+        self.assertIn(
+            'filename="upwork-transactions-2020-01-01-', response["Content-Disposition"]
+        )
+
+    def test_bad_range_and_format(self, mock_txn, _join_year):
+        self._login()
+
+        self.assertEqual(
+            self.client.get(self.url, {"start": "2021-13-01"}).status_code, 400
+        )
+        self.assertEqual(
+            self.client.get(
+                self.url, {"start": "2021-05-01", "end": "2021-01-01"}
+            ).status_code,
+            400,
+        )
+        self.assertEqual(self.client.get(self.url, {"format": "xlsx"}).status_code, 400)
+        mock_txn.assert_not_called()
+
+    def test_parquet_round_trips_the_csv_rows(self, mock_txn, _join_year):
+        mock_txn.side_effect = lambda **kw: (_txn_rows(**kw), {})
+        self._login()
+        params = {"start": "2020-01-01", "end": "2021-12-31"}
+
+        csv_rows = self._csv(self.client.get(self.url, params))
+        response = self.client.get(self.url, dict(params, format="parquet"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("2020-01-01-2021-12-31.parquet", response["Content-Disposition"])
+        parquet = pyarrow.parquet.ParquetFile(
+            io.BytesIO(b"".join(response.streaming_content))
+        )
+        self.assertEqual(parquet.num_row_groups, 2)
+        rows = parquet.read().to_pylist()
+        self.assertEqual(rows, [dict(r, amount=float(r["amount"])) for r in csv_rows])
+
+    def test_undated_rows_are_exported_once(self, mock_txn, _join_year):
+        mock_txn.side_effect = lambda **kw: (
+            _txn_rows(**kw) + [{"amount": 1.0, "kind": "Adjustment"}],
+            {},
+        )
+        self._login()
+
+        rows = self._csv(
+            self.client.get(self.url, {"start": "2020-01-01", "end": "2021-12-31"})
+        )
+
+        self.assertEqual(len(rows), 6)
+        self.assertNotIn("", [r["date"] for r in rows])
+
+    def test_upstream_error_before_streaming_is_a_502(self, mock_txn, _join_year):
+        mock_txn.side_effect = requests.ConnectionError("connection reset")
+        self._login()
+
+        response = self.client.get(self.url, {"start": "2020-01-01"})
+
+        self.assertEqual(response.status_code, 502)
+        self.assertFalse(response.streaming)
+        self.assertIn(b"Upwork API error", response.content)
+
+    def _fail_in_2021(self, **kw):
+        if kw["start_date"].year == 2021:
+            raise requests.ConnectionError("connection reset")
+        return _txn_rows(**kw), {}
+
+    def test_csv_ends_with_an_error_row_when_a_later_year_fails(
+        self, mock_txn, _join_year
+    ):
+        mock_txn.side_effect = self._fail_in_2021
+        self._login()
+
+        with self.assertLogs("upworkapi.views.export", level="ERROR"):
+            rows = self._csv(
+                self.client.get(self.url, {"start": "2020-01-01", "end": "2021-12-31"})
+            )
+
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[-1]["date"], "ERROR")
+        self.assertIn("Export incomplete", rows[-1]["description"])
+
+    def test_parquet_download_aborts_when_a_later_year_fails(
+        self, mock_txn, _join_year
+    ):
+        mock_txn.side_effect = self._fail_in_2021
+        self._login()
+
+        response = self.client.get(
+            self.url, {"start": "2020-01-01", "end": "2021-12-31", "format": "parquet"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        with self.assertLogs("upworkapi.views.export", level="ERROR"):
+            with self.assertRaises(requests.ConnectionError):
+                b"".join(response.streaming_content)
@@ -0,0 +1,133 @@
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+from upworkapi.services.graphql_batch import GraphQLBatch
+from upworkapi.services.transactions import _graphql_accounting_entity_ids
+from upworkapi.services.tenant import first_tenant_id, tenant_items
+
+
+class GraphQLBatchTestCase(SimpleTestCase):
+
+    def test_query_composes_aliased_root_fields(self):
+        batch = GraphQLBatch("Profile")
+        batch.add("tenants", "companySelector", "items { title organizationId }")
+        batch.add("user", "user", "rid")
+
+        query = batch.query()
+        self.assertTrue(query.startswith("query Profile {"))
+        self.assertIn(
+            "tenants: companySelector { items { title organizationId } }", query
+        )
+        self.assertIn("  user { rid }", query)
+
+    def test_variables_are_namespaced_per_alias(self):
+        batch = GraphQLBatch()
+        batch.add(
+            "fees",
+            "transactionHistory",
+            "transactionDetail { transactionHistoryRow { type } }",
+            variables={"transactionHistoryFilter": ("TransactionHistoryFilter", {})},
+        )
+
+        payload = batch.payload()
+        self.assertIn(
+            "query Batch($fees_transactionHistoryFilter: TransactionHistoryFilter)",
+            payload["query"],
+        )
+        self.assertIn(
+            "fees: transactionHistory(transactionHistoryFilter: "
+            "$fees_transactionHistoryFilter)",
+            payload["query"],
+        )
+        self.assertEqual(payload["variables"], {"fees_transactionHistoryFilter": {}})
+
+    def test_duplicate_alias_rejected(self):
+        batch = GraphQLBatch()
+        batch.add("user", "user", "rid")
+        with self.assertRaises(ValueError):
+            batch.add("user", "user", "email")
+
+    def test_split_routes_partial_errors_to_alias(self):
+        batch = GraphQLBatch()
+        batch.add("entities", "accountingEntities", "id")
+        batch.add("entity", "accountingEntity", "id")
+
+        data, errors = batch.split(
+            {
+                "data": {"entities": None, "entity": {"id": "42"}},
+                "errors": [{"message": "denied", "path": ["entities"]}],
+            }
+        )
+        self.assertEqual(data["entity"], {"id": "42"})
+        self.assertIsNone(data["entities"])
+        self.assertEqual(len(errors["entities"]), 1)
+        self.assertEqual(errors["entity"], [])
+
+    def test_split_handles_non_dict_response(self):
+        batch = GraphQLBatch()
+        batch.add("user", "user", "rid")
+        data, errors = batch.split(None)
+        self.assertEqual(data, {"user": None})
+        self.assertEqual(errors, {"user": []})
+
+
+class TenantHelpersTestCase(SimpleTestCase):
+
+    def test_tenant_items_and_first_tenant_id(self):
+        items = tenant_items(
+            {"items": [{"title": "Me", "organizationId": 123}, "garbage"]}
+        )
+        self.assertEqual(items, [{"title": "Me", "organizationId": 123}])
+        self.assertEqual(first_tenant_id(items), "123")
+
+    def test_tenant_items_missing(self):
+        self.assertEqual(tenant_items(None), [])
+        self.assertIsNone(first_tenant_id([]))
+
+
+class AccountingEntityIdsTestCase(SimpleTestCase):
+
+    def setUp(self):
+        patcher = patch("upworkapi.services.transactions._REJECTED_BATCHES", set())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch("upworkapi.services.transactions._graphql_execute")
+    def test_batch_result_is_used_when_it_has_ids(self, mock_execute):
+        mock_execute.return_value = {
+            "data": {"entities": [{"id": "1"}, {"id": "2"}], "entity": None}
+        }
+
+        self.assertEqual(_graphql_accounting_entity_ids({}, None, None), ["1", "2"])
+        self.assertEqual(mock_execute.call_count, 1)
+
+    @patch("upworkapi.services.transactions._graphql_execute")
+    def test_rejected_batch_falls_back_to_single_fields(self, mock_execute):
+        # The batch is rejected as a whole (accountingEntities fails
+        # validation); the single-field requests still find the entity.
+        mock_execute.side_effect = [
+            None,
+            None,
+            {"data": {"accountingEntity": {"id": "42"}}},
+        ]
+
+        self.assertEqual(_graphql_accounting_entity_ids({}, None, None), ["42"])
+        queries = [c.args[2] for c in mock_execute.call_args_list]
+        self.assertIn("entities: accountingEntities", queries[0])
+        self.assertIn("accountingEntities { id }", queries[1])
+        self.assertIn("accountingEntity { id }", queries[2])
+
+    @patch("upworkapi.services.transactions._graphql_execute")
+    def test_rejected_batch_is_not_sent_again(self, mock_execute):
+        mock_execute.side_effect = [
+            None,
+            {"data": {"accountingEntities": [{"id": "7"}]}},
+            {"data": {"accountingEntities": [{"id": "7"}]}},
+        ]
+
+        _graphql_accounting_entity_ids({}, None, None)
+        self.assertEqual(_graphql_accounting_entity_ids({}, None, None), ["7"])
+
+        queries = [c.args[2] for c in mock_execute.call_args_list]
+        self.assertEqual(len(queries), 3)
+        self.assertNotIn("entities: accountingEntities", queries[2])
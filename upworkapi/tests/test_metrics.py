@@ -0,0 +1,129 @@
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from unittest.mock import patch
+
+from upworkapi.services import metrics
+
+
+class MetricsRegistryTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.store = caches["metrics"]
+        self.store.clear()
+        self._values = patch.object(metrics, "_values", {})
+        self._histograms = patch.object(metrics, "_histograms", {})
+        self._worker = patch.object(
+            metrics, "_worker", {"pid": None, "id": None, "published": None}
+        )
+        self._values.start()
+        self._histograms.start()
+        self._worker.start()
+
+    def tearDown(self):
+        self._values.stop()
+        self._histograms.stop()
+        self._worker.stop()
+
+    def test_counters_are_summed_across_workers(self):
+        metrics.inc("upworkapi_cache_requests_total", prefix="fixed_tx", result="hit")
+        with patch("upworkapi.services.metrics.os.getpid", return_value=1):
+            metrics.flush(force=True)
+        metrics.inc("upworkapi_cache_requests_total", prefix="fixed_tx", result="hit")
+        with patch("upworkapi.services.metrics.os.getpid", return_value=2):
+            data = metrics.aggregate()
+
+        key = (("prefix", "fixed_tx"), ("result", "hit"))
+        # Worker 1 published one hit, worker 2 has two (cumulative).
+        self.assertEqual(data["values"]["upworkapi_cache_requests_total"][key], 3)
+        self.assertEqual(data["workers"], 2)
+
+    def test_idle_workers_are_retired_without_losing_counts(self):
+        key = (("prefix", "fixed_tx"), ("result", "hit"))
+        metrics.inc("upworkapi_cache_requests_total", prefix="fixed_tx", result="hit")
+        metrics.inc("upworkapi_warm_jobs_running")
+        with patch("upworkapi.services.metrics.os.getpid", return_value=1):
+            metrics.flush(force=True)
+            idle = metrics._worker_key(metrics._worker["id"])
+        snap = self.store.get(idle)
+        snap["flushed_at"] -= metrics.WORKER_TTL_SECONDS + 1
+        self.store.set(idle, snap, None)
+
+        with patch("upworkapi.services.metrics.os.getpid", return_value=2):
+            data = metrics.aggregate()
+
+        self.assertEqual(data["values"]["upworkapi_cache_requests_total"][key], 2)
+        # Worker 1's gauge went with it; worker 2 still reports its own.
+        self.assertEqual(data["values"]["upworkapi_warm_jobs_running"][()], 1)
+        self.assertEqual(data["workers"], 1)
+        self.assertIsNone(self.store.get(idle))
+
+    def test_retired_worker_that_returns_is_not_counted_twice(self):
+        key = (("prefix", "fixed_tx"), ("result", "hit"))
+        metrics.inc("upworkapi_cache_requests_total", prefix="fixed_tx", result="hit")
+        metrics.flush(force=True)
+        idle = metrics._worker_key(metrics._worker["id"])
+        snap = self.store.get(idle)
+        snap["flushed_at"] -= metrics.WORKER_TTL_SECONDS + 1
+        self.store.set(idle, snap, None)
+        metrics._retire(self.store.get(metrics._INDEX_KEY), self.store.get_many([idle]))
+
+        metrics.inc("upworkapi_cache_requests_total", prefix="fixed_tx", result="hit")
+        data = metrics.aggregate()
+
+        self.assertEqual(data["values"]["upworkapi_cache_requests_total"][key], 2)
+        self.assertEqual(data["workers"], 1)
+
+    def test_pruning_keeps_workers_registered_meanwhile(self):
+        self.store.set(metrics._INDEX_KEY, ["gone", "new"], None)
+
+        metrics._retire(["gone"], {})
+
+        self.assertEqual(self.store.get(metrics._INDEX_KEY), ["new"])
+
+    def test_busy_lock_defers_registration_to_the_next_flush(self):
+        self.store.add(metrics._LOCK_KEY, "1")
+        with patch.object(metrics, "LOCK_WAIT_SECONDS", 0):
+            metrics.flush(force=True)
+        self.assertEqual(self.store.get(metrics._INDEX_KEY), None)
+
+        self.store.delete(metrics._LOCK_KEY)
+        metrics.flush(force=True)
+
+        self.assertEqual(self.store.get(metrics._INDEX_KEY), [metrics._worker["id"]])
+
+    def test_histogram_exposition(self):
+        metrics.observe("upworkapi_upstream_request_seconds", 0.3, operation="user")
+
+        text = metrics.render_prometheus(
+            {"values": {}, "histograms": metrics.snapshot()["histograms"]}
+        )
+
+        self.assertIn("# TYPE upworkapi_upstream_request_seconds histogram", text)
+        self.assertIn(
+            'upworkapi_upstream_request_seconds_bucket{operation="user",le="0.25"} 0',
+            text,
+        )
+        self.assertIn(
+            'upworkapi_upstream_request_seconds_bucket{operation="user",le="0.5"} 1',
+            text,
+        )
+        self.assertIn(
+            'upworkapi_upstream_request_seconds_count{operation="user"} 1', text
+        )
+
+
+class MetricsViewTestCase(SimpleTestCase):
+
+    @override_settings(METRICS_TOKEN="s3cret")
+    def test_requires_bearer_token(self):
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 403)
+        response = self.client.get(
+            reverse("metrics"), HTTP_AUTHORIZATION="Bearer s3cret"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"upworkapi_workers", response.content)
+
+    @override_settings(METRICS_TOKEN="", DEBUG=False)
+    def test_hidden_without_token_in_production(self):
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 404)
@@ -0,0 +1,49 @@
+from datetime import date
+
+from django.test import SimpleTestCase
+
+from upworkapi.services.rates import hours_and_earnings, rate_report
+
+
+def _row(day, hours, charges, client="Acme"):
+    return {"date": day, "hours": hours, "charges": charges, "client_name": client}
+
+
+class RateReportTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.sums = hours_and_earnings(
+            [
+                _row("2024-01-01", 8.0, "400"),
+                _row("2024-01-02", 2.0, "60", client="Beta"),
+                _row("2024-02-05", 10.0, "500"),
+                _row("not a date", 5.0, "999"),
+            ],
+            client_of=lambda r: r["client_name"],
+        )
+
+    def test_sums_by_week_month_and_client(self):
+        self.assertEqual(self.sums["weeks"][1], [10.0, 460.0])
+        self.assertEqual(self.sums["months"][2], [10.0, 500.0])
+        self.assertEqual(self.sums["clients"]["Beta"], {1: [2.0, 60.0]})
+
+    def test_rates_and_utilization(self):
+        report = rate_report(self.sums, year=2024, today=date(2024, 2, 9))
+
+        week_one = report["weeks"][0]
+        self.assertEqual(week_one["effective_rate"], 46.0)
+        self.assertEqual(week_one["utilization"], 0.25)
+        self.assertIsNone(report["weeks"][10]["utilization"])
+
+        # 23 weekdays in January 2024 at 8 hours each.
+        january = report["months"][0]
+        self.assertEqual(january["utilization"], round(10 / 184, 4))
+        # February only counts the 7 weekdays up to the 9th.
+        self.assertEqual(report["months"][1]["utilization"], round(10 / 56, 4))
+        self.assertIsNone(report["months"][2]["utilization"])
+
+        acme = report["clients"][0]
+        self.assertEqual(acme["client"], "Acme")
+        self.assertEqual(acme["effective_rate"], 50.0)
+        self.assertEqual(acme["monthly_rates"][:3], [50.0, 50.0, None])
+        self.assertEqual(report["totals"]["utilization"], round(20 / 240, 4))
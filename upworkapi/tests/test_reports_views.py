@@ -2,9 +2,35 @@ from django.test import TestCase, Client
 from django.urls import reverse
 from django.contrib.auth.models import User
 from unittest.mock import patch, MagicMock
-from datetime import datetime
+from datetime import date, datetime, timedelta
+import time
+from types import SimpleNamespace
+from django.core.cache import cache
+from oauthlib.oauth2 import InvalidGrantError
+from upworkapi.services.incremental import merge_incremental_rows
+from upworkapi.services.tokens import store_token
 from upworkapi.views.reports import (
+    _build_dashboard_snapshots_async,
+    _build_total_earning_data,
+    _cache_set,
+    _cached_all_time_year_summaries,
+    _cached_client_month_rows,
+    _cached_client_year_stats,
+    _cached_earning_graph_annually,
+    _cached_earning_graph_monthly,
+    _cached_time_report_summary,
+    _cached_time_report_year,
+    _cached_transaction_history_rows,
+    _cached_timereport_year,
+    _data_version,
     _month_week_ranges,
+    _parse_txn_work_range,
+    _service_fee_summary,
+    _store_year_rows,
+    _time_report_year_key,
+    _track_untracked_data,
+    _update_all_time_rollup,
+    _warm_all_time_years_async,
     earning_graph_annually,
     earning_graph_monthly,
     timereport_weekly,
@@ -65,6 +91,18 @@ class HelperFunctionsTestCase(TestCase):
         detail = {}
         self.assertEqual(_extract_client_name(detail), "Unknown")
 
+    def test_parse_txn_work_range_formats(self):
+        expected = (date(2024, 1, 29), date(2024, 2, 4))
+        for text in (
+            "Invoice for 01/29/2024 - 02/04/2024",
+            "Invoice for 2024-01-29 - 2024-02-04",
+            "Invoice for Jan 29, 2024 - Feb 4, 2024",
+            "Invoice for 29 January 2024 - 4 February 2024",
+            "Invoice for 29-Jan-2024 - 04-Feb-2024",
+        ):
+            self.assertEqual(_parse_txn_work_range({"description": text}), expected)
+        self.assertEqual(_parse_txn_work_range({"description": "Bonus"}), (None, None))
+
 
 class EarningGraphAnnuallyTestCase(TestCase):
 
@@ -310,6 +348,29 @@ class TimereportGraphViewTestCase(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, "upworkapi/timereport.html")
 
+    @patch("upworkapi.views.reports.timereport_weekly")
+    def test_timereport_graph_loads_years_from_the_api(self, mock_timereport):
+        self.client.force_login(self.user)
+        session = self.client.session
+        session["token"] = {"access_token": "test_token"}
+        session.save()
+        mock_timereport.return_value = {
+            "year": "2021",
+            "report": [],
+            "total_hours": 0,
+            "avg_week": 0.0,
+            "work_status": "success",
+            "x_axis": [],
+            "title": "Test",
+            "client_rows": [],
+        }
+
+        response = self.client.get(reverse("timereport_graph"), {"year": "2021"})
+
+        self.assertEqual(mock_timereport.call_args.args[1], "2021")
+        self.assertContains(response, 'data-api-url="/api/v1/hours/0/"')
+        self.assertContains(response, 'id="timereport-data"')
+
 
 class ReportsURLTestCase(TestCase):
 
@@ -320,3 +381,874 @@ class ReportsURLTestCase(TestCase):
     def test_timereport_graph_url_resolves(self):
         url = reverse("timereport_graph")
         self.assertEqual(url, "/timereport/")
+
+
+class TimeReportDatasetTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.request = SimpleNamespace(user=SimpleNamespace(id=1))
+
+    @patch("upworkapi.views.reports.graphql.Api")
+    @patch("upworkapi.views.reports.upwork_client.get_client")
+    def test_annual_and_weekly_share_one_fetch(self, mock_get_client, mock_graphql_api):
+        mock_api = MagicMock()
+        mock_api.execute.return_value = {
+            "data": {
+                "user": {
+                    "freelancerProfile": {
+                        "user": {
+                            "timeReport": [
+                                {
+                                    "dateWorkedOn": "2023-03-06",
+                                    "totalCharges": "50.00",
+                                    "totalHoursWorked": 2.0,
+                                    "memo": "Work",
+                                    "contract": {"offer": {"client": {"name": "Acme"}}},
+                                },
+                                {
+                                    "dateWorkedOn": "2023-03-07",
+                                    "totalCharges": "75.00",
+                                    "totalHoursWorked": 3.0,
+                                    "memo": "More",
+                                    "contract": {"offer": {"client": {"name": "Acme"}}},
+                                },
+                            ]
+                        }
+                    }
+                }
+            }
+        }
+        mock_graphql_api.return_value = mock_api
+        token = {"access_token": "test_token"}
+
+        annual = _cached_earning_graph_annually(self.request, token, "2023")
+        weekly = _cached_timereport_year(self.request, token, "2023")
+
+        self.assertEqual(mock_api.execute.call_count, 1)
+        self.assertEqual(annual["total_earning"], 125.0)
+        self.assertEqual(annual["report"][2]["y"], 125.0)
+        self.assertEqual(weekly["total_hours"], 5.0)
+        self.assertEqual(weekly["client_rows"], [{"name": "Acme", "total": 5.0}])
+
+    @patch("upworkapi.views.reports.graphql.Api")
+    @patch("upworkapi.views.reports.upwork_client.get_client")
+    def test_monthly_is_sliced_from_cached_year(
+        self, mock_get_client, mock_graphql_api
+    ):
+        mock_api = MagicMock()
+        mock_api.execute.return_value = {
+            "data": {
+                "user": {
+                    "freelancerProfile": {
+                        "user": {
+                            "timeReport": [
+                                {"dateWorkedOn": "2023-02-28", "totalCharges": "10"},
+                                {"dateWorkedOn": "2023-03-01", "totalCharges": "20"},
+                                {"dateWorkedOn": "2023-03-31", "totalCharges": "30"},
+                            ]
+                        }
+                    }
+                }
+            }
+        }
+        mock_graphql_api.return_value = mock_api
+        token = {"access_token": "test_token"}
+
+        _cached_earning_graph_annually(self.request, token, "2023")
+        march = _cached_earning_graph_monthly(self.request, token, 2023, 3)
+        february = _cached_earning_graph_monthly(self.request, token, 2023, 2)
+
+        self.assertEqual(mock_api.execute.call_count, 1)
+        self.assertEqual(march["total_earning"], 50.0)
+        self.assertEqual(len(march["detail_earning"]), 2)
+        self.assertEqual(sum(march["report"]), 50.0)
+        self.assertEqual(february["total_earning"], 10.0)
+
+
+class IncrementalRefreshTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.request = SimpleNamespace(user=SimpleNamespace(id=1))
+
+    def test_merge_replaces_window_and_dedupes(self):
+        base = [
+            {"date": "2024-01-10", "charges": "10"},
+            {"date": "2024-03-01", "charges": "20"},
+            {"date": "", "charges": "5"},
+        ]
+        fresh = [
+            {"date": "2024-03-01", "charges": "25"},
+            {"date": "", "charges": "5"},
+        ]
+        merged = merge_incremental_rows(
+            base, fresh, since=date(2024, 2, 15), date_of=lambda r: r["date"]
+        )
+        self.assertEqual(
+            merged,
+            [
+                {"date": "2024-01-10", "charges": "10"},
+                {"date": "", "charges": "5"},
+                {"date": "2024-03-01", "charges": "25"},
+            ],
+        )
+
+    def test_merge_keeps_genuine_duplicates(self):
+        row = {"date": "2024-03-01", "charges": "20"}
+        merged = merge_incremental_rows(
+            [], [dict(row), dict(row)], since="2024-02-01", date_of=lambda r: r["date"]
+        )
+        self.assertEqual(len(merged), 2)
+
+    @patch("upworkapi.views.reports._fetch_time_report")
+    def test_current_year_refresh_only_fetches_trailing_window(self, mock_fetch):
+        year = date.today().year
+        mock_fetch.return_value = [
+            {
+                "date": f"{year}-01-01",
+                "charges": "10",
+                "hours": 1.0,
+                "memo": "",
+                "client_name": "Acme",
+            }
+        ]
+        token = {"access_token": "test_token"}
+
+        _cached_time_report_year(self.request, token, year)
+        key = "timereport_rows:1:%s" % year
+        entry = cache.get(key)
+        entry["refreshed_at"] -= 3600
+        cache.set(key, entry)
+        mock_fetch.return_value = []
+        rows = _cached_time_report_year(self.request, token, year)
+
+        self.assertEqual(mock_fetch.call_count, 2)
+        first_start = mock_fetch.call_args_list[0][0][1]
+        second_start = mock_fetch.call_args_list[1][0][1]
+        self.assertEqual(first_start, f"{year}0101")
+        expected = max(date(year, 1, 1), date.today() - timedelta(days=30))
+        self.assertEqual(second_start, expected.strftime("%Y%m%d"))
+        if expected > date(year, 1, 1):
+            self.assertEqual(len(rows), 1)
+
+    @patch("upworkapi.views.reports._fetch_time_report")
+    def test_stale_base_is_refetched_in_full(self, mock_fetch):
+        year = date.today().year
+        mock_fetch.return_value = []
+        token = {"access_token": "test_token"}
+        key = "timereport_rows:1:%s" % year
+
+        _cached_time_report_year(self.request, token, year)
+        entry = cache.get(key)
+        entry["refreshed_at"] -= 3600
+        cache.set(key, entry)
+        _cached_time_report_year(self.request, token, year)
+        base_fetched_at = cache.get(key)["base_fetched_at"]
+        self.assertEqual(base_fetched_at, entry["base_fetched_at"])
+
+        entry = cache.get(key)
+        entry["refreshed_at"] -= 3600
+        entry["base_fetched_at"] -= 86400
+        cache.set(key, entry)
+        _cached_time_report_year(self.request, token, year)
+
+        starts = [c[0][1] for c in mock_fetch.call_args_list]
+        self.assertEqual(starts[0], f"{year}0101")
+        self.assertEqual(starts[2], f"{year}0101")
+        self.assertGreater(cache.get(key)["base_fetched_at"], base_fetched_at)
+
+    def _txn_rows(self, *, failed=False, rows=None):
+        return rows or [], {"failed": failed, "graphql_attempts": [{"errors": "x"}]}
+
+    @patch("upworkapi.views.reports.fetch_transaction_history_rows")
+    def test_failed_refresh_keeps_previous_rows(self, mock_fetch):
+        today = date.today()
+        row = {"date": today.isoformat(), "amount": 5.0, "kind": "Hourly"}
+        mock_fetch.return_value = self._txn_rows(rows=[row])
+        _cached_transaction_history_rows(
+            self.request,
+            token={},
+            tenant_id="t1",
+            start_date=date(today.year, 1, 1),
+            end_date=today,
+        )
+        key = "txn_rows:1:t1:%s" % today.year
+        entry = cache.get(key)
+        entry["refreshed_at"] -= 3600
+        cache.set(key, entry)
+
+        mock_fetch.return_value = self._txn_rows(failed=True)
+        rows, debug = _cached_transaction_history_rows(
+            self.request,
+            token={},
+            tenant_id="t1",
+            start_date=date(today.year, 1, 1),
+            end_date=today,
+            debug=True,
+        )
+
+        self.assertEqual(rows, [row])
+        self.assertEqual(cache.get(key)["rows"], [row])
+        self.assertEqual(debug["failed_years"], [today.year])
+        self.assertEqual(debug["graphql_attempts"], [{"errors": "x"}])
+
+    @patch("upworkapi.views.reports.fetch_transaction_history_rows")
+    def test_failed_fetch_is_not_cached(self, mock_fetch):
+        mock_fetch.return_value = self._txn_rows(failed=True)
+        args = dict(
+            token={},
+            tenant_id="t1",
+            start_date=date(2020, 1, 1),
+            end_date=date(2020, 12, 31),
+        )
+
+        self.assertEqual(_cached_transaction_history_rows(self.request, **args), [])
+        mock_fetch.return_value = self._txn_rows(rows=[{"date": "2020-05-01"}])
+        rows = _cached_transaction_history_rows(self.request, **args)
+
+        self.assertEqual(rows, [{"date": "2020-05-01"}])
+        self.assertEqual(mock_fetch.call_count, 2)
+
+    @patch("upworkapi.views.reports.fetch_transaction_history_rows")
+    def test_undated_rows_are_not_repeated_per_year(self, mock_fetch):
+        mock_fetch.side_effect = lambda **kw: self._txn_rows(
+            rows=[{"date": "%s-05-01" % kw["start_date"].year}, {"date": None}]
+        )
+
+        rows, debug = _cached_transaction_history_rows(
+            self.request,
+            token={},
+            tenant_id="t1",
+            start_date=date(2020, 1, 1),
+            end_date=date(2021, 12, 31),
+            debug=True,
+        )
+
+        self.assertEqual([r["date"] for r in rows], ["2020-05-01", "2021-05-01"])
+        self.assertEqual(debug["row_count"], 2)
+        self.assertEqual(debug["failed_years"], [])
+
+
+class YearSummaryTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.request = SimpleNamespace(user=SimpleNamespace(id=1))
+        self.token = {"access_token": "test_token"}
+        self.rows = [
+            {
+                "date": "2023-01-05",
+                "charges": "40",
+                "hours": 2.0,
+                "memo": "Build",
+                "client_name": "Acme",
+            },
+            {
+                "date": "2023-03-07",
+                "charges": "60",
+                "hours": 3.0,
+                "memo": "Fix",
+                "client_name": "Unknown",
+            },
+        ]
+
+    @patch("upworkapi.views.reports._fetch_time_report")
+    def test_summary_only_paths_skip_detail_rows(self, mock_fetch):
+        mock_fetch.return_value = self.rows
+        full = _cached_earning_graph_annually(self.request, self.token, "2023")
+        self.assertEqual(len(full["detail_earning"]), 2)
+
+        # Without the detail entry a summary read must still be served.
+        cache.delete(_time_report_year_key(1, 2023))
+        summary = _cached_earning_graph_annually(
+            self.request, self.token, "2023", include_detail=False
+        )
+
+        self.assertEqual(mock_fetch.call_count, 1)
+        self.assertEqual(summary["detail_earning"], [])
+        self.assertEqual(summary["report"], full["report"])
+        self.assertEqual(summary["total_earning"], 100.0)
+        self.assertEqual(summary["client_totals"], {"Acme": 40.0, "Unknown": 60.0})
+
+    @patch("upworkapi.views.reports._fetch_time_report")
+    def test_summary_is_derived_from_rows_cached_without_one(self, mock_fetch):
+        _store_year_rows(_time_report_year_key(1, 2023), 2023, self.rows)
+
+        summary = _cached_time_report_summary(self.request, self.token, 2023)
+
+        mock_fetch.assert_not_called()
+        self.assertEqual(summary["month_totals"][0], 40.0)
+        self.assertEqual(summary["month_totals"][2], 60.0)
+        self.assertEqual(
+            summary["unknown_details"],
+            [{"date": "07-03-2023", "description": "Unknown - Fix", "amount": 60.0}],
+        )
+
+
+class ClientIndexTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.user = User.objects.create_user(username="testuser", password="pw")
+        self.client.force_login(self.user)
+        session = self.client.session
+        session["token"] = {"access_token": "test"}
+        session.save()
+        self.rows = [
+            {
+                "date": "2023-04-03",
+                "charges": "20",
+                "hours": 1.0,
+                "memo": "A",
+                "client_name": "Acme Corp >",
+            },
+            {
+                "date": "2023-04-04",
+                "charges": "30",
+                "hours": 1.0,
+                "memo": "B",
+                "client_name": "Beta",
+            },
+            {
+                "date": "2023-04-05",
+                "charges": "25",
+                "hours": 1.0,
+                "memo": "C",
+                "client_name": "Acme Corp",
+            },
+            {
+                "date": "2023-05-01",
+                "charges": "40",
+                "hours": 1.0,
+                "memo": "D",
+                "client_name": "Acme Corp",
+            },
+        ]
+
+    @patch("upworkapi.views.reports._fetch_time_report")
+    def test_drill_down_is_served_from_the_index(self, mock_fetch):
+        mock_fetch.return_value = self.rows
+        url = reverse("earning_month_client_detail", args=[2023, 4, "Acme Corp"])
+
+        self.client.get(url)
+        response = self.client.get(url)
+
+        self.assertEqual(mock_fetch.call_count, 1)
+        self.assertEqual(
+            [r["description"] for r in response.context["rows"]],
+            ["Acme Corp > - A", "Acme Corp - C"],
+        )
+        self.assertEqual(response.context["total"], 45.0)
+
+    @patch("upworkapi.views.reports._fetch_time_report")
+    def test_stale_index_is_rebuilt(self, mock_fetch):
+        mock_fetch.return_value = self.rows
+        request = SimpleNamespace(user=SimpleNamespace(id=self.user.id))
+        _cached_client_month_rows(request, {}, 2023, 4, "Beta")
+        key = "timereport_clients:%s:2023" % self.user.id
+        cache.set(key, {"version": "old", "months": {4: {"Beta": [0]}}})
+
+        rows = _cached_client_month_rows(request, {}, 2023, 4, "Beta")
+
+        self.assertEqual([r["memo"] for r in rows], ["B"])
+        self.assertNotEqual(cache.get(key)["version"], "old")
+
+
+class ClientYearStatsTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.request = SimpleNamespace(user=SimpleNamespace(id=3))
+        self.rows = [
+            {
+                "date": "2022-02-01",
+                "charges": "90",
+                "hours": 3.0,
+                "memo": "",
+                "client_name": "Acme",
+            }
+        ]
+
+    def _stats(self):
+        return _cached_client_year_stats(
+            self.request, token={}, tenant_id="t1", tenant_ids=None, year=2022
+        )
+
+    @patch(
+        "upworkapi.views.reports.fetch_transaction_history_rows", return_value=([], {})
+    )
+    @patch("upworkapi.views.reports._fetch_time_report")
+    def test_stale_stats_are_only_recomputed_when_rows_change(
+        self, mock_time, _mock_txn
+    ):
+        mock_time.return_value = self.rows
+        self._stats()
+        key = "client_stats:3:t1:2022"
+
+        def age():
+            entry = cache.get(key)
+            entry["refreshed_at"] -= 3600
+            cache.set(key, entry)
+            cache.delete("timereport_rows:3:2022")
+
+        age()
+        with patch(
+            "upworkapi.views.reports.client_analytics.client_year_stats"
+        ) as mock_build:
+            self.assertEqual(self._stats()["Acme"][2]["earnings"], 90.0)
+        mock_build.assert_not_called()
+
+        age()
+        mock_time.return_value = self.rows * 2
+        self.assertEqual(self._stats()["Acme"][2]["earnings"], 180.0)
+
+
+class FixedPriceDetailPageTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.user = User.objects.create_user(username="testuser", password="pw")
+        self.client.force_login(self.user)
+        session = self.client.session
+        session["token"] = {"access_token": "test"}
+        session.save()
+
+    @patch("upworkapi.views.reports._cached_transaction_history_rows")
+    @patch("upworkapi.views.reports._cached_fixed_price_transactions")
+    def test_month_page_renders_only_the_first_page(self, mock_fixed, mock_fees):
+        mock_fees.return_value = ([], {"endpoint": "transactionHistory/all"})
+        mock_fixed.return_value = [
+            {
+                "occurred_at": "2023-04-%02dT10:00:00" % (i % 28 + 1),
+                "amount": 10.0,
+                "client_name": "Acme",
+                "description": "Milestone %d" % i,
+            }
+            for i in range(120)
+        ]
+
+        response = self.client.get(reverse("fixed_price_month_detail", args=[2023, 4]))
+
+        self.assertEqual(response.status_code, 200)
+        page = response.context["detail_page"]
+        self.assertEqual(len(page["rows"]), 50)
+        self.assertEqual(page["total_rows"], 120)
+        self.assertEqual(page["total_amount"], 1200.0)
+        self.assertContains(response, "Milestone", count=50)
+        self.assertEqual(
+            response.context["service_fee_debug"],
+            {"endpoint": "transactionHistory/all"},
+        )
+        self.assertEqual(
+            response.context["detail_url"], "/api/v1/fixed/2023/4/details/"
+        )
+
+
+class AllTimeWarmProgressViewTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.user = User.objects.create_user(username="testuser", password="testpass")
+
+    def test_progress_requires_login(self):
+        response = self.client.get(reverse("all_time_warm_progress"))
+        self.assertEqual(response.status_code, 302)
+
+    def test_progress_while_warming(self):
+        self.client.force_login(self.user)
+        cache.set("all_time_warm_lock:%s::testuser" % self.user.id, "1")
+        cache.set(
+            "all_time_warm_progress:%s::testuser" % self.user.id,
+            {"total": 4, "done": 1, "missing_years": [2022, 2023, 2024]},
+        )
+
+        response = self.client.get(reverse("all_time_warm_progress"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Cache-Control"], "no-store")
+        data = response.json()
+        self.assertEqual(data["done"], 1)
+        self.assertEqual(data["total"], 4)
+        self.assertTrue(data["warming"])
+        self.assertFalse(data["complete"])
+
+    def test_progress_complete_when_lock_released(self):
+        self.client.force_login(self.user)
+        cache.set(
+            "all_time_warm_progress:%s::testuser" % self.user.id,
+            {"total": 4, "done": 4, "missing_years": []},
+        )
+
+        data = self.client.get(reverse("all_time_warm_progress")).json()
+        self.assertFalse(data["warming"])
+        self.assertTrue(data["complete"])
+
+    def test_failed_years_are_not_complete(self):
+        self.client.force_login(self.user)
+        cache.set(
+            "all_time_warm_progress:%s::testuser" % self.user.id,
+            {
+                "total": 2,
+                "done": 2,
+                "missing_years": [2021],
+                "failed_years": [2021],
+                "last_error": "boom",
+            },
+        )
+
+        data = self.client.get(reverse("all_time_warm_progress")).json()
+        self.assertFalse(data["complete"])
+        self.assertEqual(data["failed_years"], [2021])
+        self.assertEqual(data["last_error"], "boom")
+
+
+class AllTimeRollupTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.request = SimpleNamespace(user=SimpleNamespace(id=7))
+
+    def _summary(self, hourly, clients):
+        return {
+            "hourly_total": hourly,
+            "fixed_total": 0.0,
+            "client_totals": clients,
+            "unknown_rows": [],
+        }
+
+    def _read(self, years):
+        return _cached_all_time_year_summaries(
+            self.request, tenant_id="t1", freelancer_reference="me", years=years
+        )
+
+    def test_series_precomputed_on_write(self):
+        _update_all_time_rollup(
+            7,
+            tenant_id="t1",
+            freelancer_reference="me",
+            summaries=[(2020, self._summary(0.0, {}))],
+        )
+        _update_all_time_rollup(
+            7,
+            tenant_id="t1",
+            freelancer_reference="me",
+            summaries=[
+                (2021, self._summary(100.0, {"Acme": 100.0})),
+                (2022, self._summary(50.0, {"Beta": 50.0})),
+            ],
+        )
+
+        summaries, missing, series = self._read([2020, 2021, 2022])
+
+        self.assertEqual(missing, [])
+        self.assertEqual(len(summaries), 3)
+        self.assertEqual(series["years"], [2021, 2022])
+        self.assertEqual(series["totals"], [100.0, 50.0])
+        self.assertEqual([r["name"] for r in series["client_rows"]], ["Acme", "Beta"])
+        self.assertEqual(
+            series["yearly_client_pie"][-1],
+            [{"name": "Acme", "y": 100.0}, {"name": "Beta", "y": 50.0}],
+        )
+
+    def test_year_summary_missing_from_rollup_is_folded_in(self):
+        cache.set("all_time_year:7:t1:me:2021", self._summary(10.0, {"Acme": 10.0}))
+
+        summaries, missing, series = self._read([2021, 2022])
+
+        self.assertEqual(missing, [2022])
+        self.assertEqual(series["totals"], [10.0])
+        rollup = cache.get("all_time_rollup:7:t1:me")
+        self.assertIn(2021, rollup["years"])
+
+    def test_expired_rollup_year_is_missing(self):
+        with patch("upworkapi.views.reports.time.time", return_value=1000.0):
+            _update_all_time_rollup(
+                7,
+                tenant_id="t1",
+                freelancer_reference="me",
+                summaries=[(2021, self._summary(10.0, {}))],
+            )
+
+        _summaries, missing, _series = self._read([2021])
+
+        self.assertEqual(missing, [2021])
+
+    @patch("upworkapi.views.reports._service_fee_summary", return_value=([], 0.0, {}))
+    @patch("upworkapi.views.reports._cached_upwork_join_year")
+    def test_all_time_view_reads_rollup(self, mock_join_year, _fees):
+        user = User.objects.create_user(username="me", password="pw")
+        current_year = datetime.now().year
+        mock_join_year.return_value = current_year
+        _update_all_time_rollup(
+            user.id,
+            tenant_id=None,
+            freelancer_reference="me",
+            summaries=[(current_year, self._summary(25.0, {"Acme": 25.0}))],
+        )
+        client = Client()
+        client.force_login(user)
+        session = client.session
+        session["token"] = {"access_token": "test"}
+        session.save()
+
+        response = client.get(reverse("all_time_earning_graph"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["graph"]["total_earning"], 25.0)
+        self.assertEqual(response.context["client_rows"][0]["name"], "Acme")
+
+
+class ConditionalReportTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.user = User.objects.create_user(username="testuser", password="pw")
+        self.client.force_login(self.user)
+        session = self.client.session
+        session["token"] = {"access_token": "test"}
+        session.save()
+        self.rows = [
+            {
+                "date": "%s-03-04" % datetime.now().year,
+                "charges": 50.0,
+                "hours": 2.0,
+                "memo": "",
+                "client_name": "Acme",
+            }
+        ]
+
+    @patch("upworkapi.views.reports._fetch_time_report")
+    def test_unchanged_data_returns_not_modified(self, mock_fetch):
+        mock_fetch.return_value = self.rows
+        url = reverse("timereport_graph")
+
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        self.assertIn("no-cache", first["Cache-Control"])
+
+        second = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.content, b"")
+        self.assertEqual(mock_fetch.call_count, 1)
+
+    @patch("upworkapi.views.reports._fetch_time_report")
+    def test_changed_data_changes_etag(self, mock_fetch):
+        mock_fetch.return_value = self.rows
+        url = reverse("timereport_graph")
+        etag = self.client.get(url)["ETag"]
+
+        key = "timereport_rows:%s:%s" % (self.user.id, datetime.now().year)
+        entry = cache.get(key)
+        entry["rows"] = self.rows * 2
+        _cache_set(key, entry, 60, version=_data_version(entry["rows"]))
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    @patch("upworkapi.views.reports._fetch_time_report")
+    def test_missing_version_skips_etag(self, mock_fetch):
+        mock_fetch.return_value = self.rows
+        url = reverse("timereport_graph")
+        self.client.get(url)
+        cache.delete("ver:timereport_rows:%s:%s" % (self.user.id, datetime.now().year))
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header("ETag"))
+
+    @patch("upworkapi.views.reports.timereport_weekly", wraps=timereport_weekly)
+    @patch("upworkapi.views.reports._fetch_time_report")
+    def test_unchanged_data_skips_the_view(self, mock_fetch, mock_weekly):
+        mock_fetch.return_value = self.rows
+        url = reverse("timereport_graph")
+        etag = self.client.get(url)["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(mock_weekly.call_count, 1)
+
+    @patch("upworkapi.views.reports.timereport_weekly")
+    @patch("upworkapi.views.reports._fetch_time_report")
+    def test_untracked_data_skips_etag(self, mock_fetch, mock_weekly):
+        mock_fetch.return_value = self.rows
+
+        def weekly(token, year, request=None):
+            _track_untracked_data()
+            return timereport_weekly(token, year, request=request)
+
+        mock_weekly.side_effect = weekly
+        url = reverse("timereport_graph")
+
+        first = self.client.get(url)
+        second = self.client.get(url, HTTP_IF_NONE_MATCH='"stale"')
+
+        self.assertFalse(first.has_header("ETag"))
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(mock_weekly.call_count, 2)
+
+
+class _InlineThread:
+    def __init__(self, target, **kwargs):
+        self.target = target
+
+    def start(self):
+        self.target()
+
+
+@patch("upworkapi.views.reports.threading.Thread", _InlineThread)
+class WarmAllTimeTokenTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.old = {"access_token": "old", "expires_at": time.time() + 30}
+        self.new = {"access_token": "new", "expires_at": time.time() + 3600}
+
+    def _warm(self):
+        return _warm_all_time_years_async(
+            user_id=5,
+            token=self.old,
+            tenant_id=None,
+            tenant_ids=None,
+            freelancer_reference="me",
+            years=[2021, 2022],
+        )
+
+    @patch("upworkapi.views.reports._cached_all_time_year_summary")
+    def test_uses_token_from_shared_store(self, mock_summary):
+        store_token(5, self.new)
+
+        self.assertTrue(self._warm())
+
+        tokens = [
+            c.kwargs["token"]["access_token"] for c in mock_summary.call_args_list
+        ]
+        self.assertEqual(tokens, ["new", "new"])
+        progress = cache.get("all_time_warm_progress:5::me")
+        self.assertEqual(progress["missing_years"], [])
+        self.assertIsNone(cache.get("all_time_warm_lock:5::me"))
+
+    @patch("upworkapi.services.tokens.refresh_upwork_token")
+    @patch("upworkapi.views.reports._cached_all_time_year_summary")
+    def test_expired_grant_stops_and_reports_missing_years(
+        self, mock_summary, mock_refresh
+    ):
+        mock_refresh.side_effect = InvalidGrantError()
+        self.old["refresh_token"] = "r"
+
+        self._warm()
+
+        mock_summary.assert_not_called()
+        progress = cache.get("all_time_warm_progress:5::me")
+        self.assertEqual(progress["missing_years"], [2021, 2022])
+        self.assertIn("Session expired", progress["last_error"])
+
+    @patch("upworkapi.views.reports._cached_all_time_year_summary")
+    def test_failed_year_is_not_retried_with_the_same_token(self, mock_summary):
+        store_token(5, self.new)
+        mock_summary.side_effect = RuntimeError("boom")
+
+        self._warm()
+
+        self.assertEqual(mock_summary.call_count, 2)
+
+    @patch("upworkapi.views.reports._cached_all_time_year_summary")
+    def test_failed_years_back_off_before_warming_again(self, mock_summary):
+        store_token(5, self.new)
+
+        def summary(req, **kw):
+            if kw["year"] == 2022:
+                raise RuntimeError("boom")
+
+        mock_summary.side_effect = summary
+
+        self.assertTrue(self._warm())
+        progress = cache.get("all_time_warm_progress:5::me")
+        self.assertEqual(progress["failed_years"], [2022])
+        self.assertEqual(progress["last_error"], "boom")
+        retry = cache.get("all_time_warm_retry:5::me")
+        self.assertEqual(retry["attempts"], 1)
+        calls = mock_summary.call_count
+        self.assertFalse(self._warm())
+        self.assertEqual(mock_summary.call_count, calls)
+
+        retry["retry_at"] = time.time() - 1
+        cache.set("all_time_warm_retry:5::me", retry)
+        mock_summary.side_effect = None
+        self.assertTrue(self._warm())
+        self.assertIsNone(cache.get("all_time_warm_retry:5::me"))
+
+
+@patch("upworkapi.views.reports.threading.Thread", _InlineThread)
+@patch("upworkapi.views.reports.fetch_service_fee_history", return_value=([], {}))
+@patch("upworkapi.views.reports.fetch_fixed_price_transactions", return_value=[])
+@patch("upworkapi.views.reports.fetch_transaction_history_rows", return_value=([], {}))
+@patch("upworkapi.views.reports._fetch_time_report", return_value=[])
+class DashboardSnapshotTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.token = {"access_token": "t", "expires_at": time.time() + 3600}
+
+    def _build(self, years):
+        return _build_dashboard_snapshots_async(
+            user_id=5,
+            token=self.token,
+            tenant_id="t1",
+            tenant_ids=None,
+            freelancer_reference="me",
+            years=years,
+        )
+
+    def test_pages_read_the_snapshot(self, mock_time, mock_txn, mock_fixed, mock_fees):
+        self.assertTrue(self._build([2022]))
+
+        request = SimpleNamespace(
+            user=SimpleNamespace(id=5),
+            session={
+                "token": self.token,
+                "tenant_id": "t1",
+                "freelancer_reference": "me",
+            },
+        )
+        _cached_earning_graph_annually(request, self.token, "2022")
+        _build_total_earning_data(request, self.token, "t1", 2022)
+        _service_fee_summary(
+            request, start_date=date(2022, 1, 1), end_date=date(2022, 12, 31)
+        )
+        _cached_transaction_history_rows(
+            request,
+            token=self.token,
+            tenant_id="t1",
+            start_date=date(2022, 1, 1),
+            end_date=date(2022, 12, 31),
+        )
+
+        for mock in (mock_time, mock_txn, mock_fixed, mock_fees):
+            self.assertEqual(mock.call_count, 1, mock)
+        self.assertIsNone(cache.get("dashboard_snapshot_lock:5:t1"))
+
+    def test_failed_year_does_not_stop_the_others(
+        self, mock_time, mock_txn, mock_fixed, mock_fees
+    ):
+        mock_time.side_effect = [RuntimeError("boom"), []]
+
+        self._build([2022, 2021])
+
+        self.assertEqual(mock_time.call_count, 2)
+        self.assertEqual(mock_fixed.call_count, 1)
+        self.assertIsNone(cache.get("dashboard_snapshot_lock:5:t1"))
+
+    def test_running_build_is_not_duplicated(
+        self, mock_time, mock_txn, mock_fixed, mock_fees
+    ):
+        cache.add("dashboard_snapshot_lock:5:t1", "1")
+
+        self.assertFalse(self._build([2022]))
+        mock_time.assert_not_called()
@@ -0,0 +1,111 @@
+import json
+from datetime import timedelta
+from types import SimpleNamespace
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import Client, SimpleTestCase, TestCase
+from django.urls import reverse
+from unittest.mock import patch
+
+from upworkapi.services import timing
+
+
+class TimingRecorderTestCase(SimpleTestCase):
+
+    def tearDown(self):
+        timing.end()
+
+    def test_recording_is_noop_outside_a_request(self):
+        timing.record("graphql", "x", 5.0)
+        self.assertIsNone(timing.end())
+
+    def test_server_timing_aggregates_categories(self):
+        timing.begin()
+        timing.record("graphql", "timeReport", 40.0)
+        timing.record("graphql", "user", 10.0)
+        timing.record_cache("timereport_rows", True)
+        timing.record_cache("fixed_tx", False)
+        summary = timing.end()
+
+        header = timing.server_timing(summary)
+
+        self.assertIn('graphql;dur=50.0;desc="2"', header)
+        self.assertIn('cache;desc="hit 1 miss 1"', header)
+        self.assertIn("total;dur=", header)
+        self.assertNotIn("timeReport", header)
+
+    def test_http_hook_records_graphql_operation(self):
+        timing.begin()
+        request = SimpleNamespace(
+            url="https://api.upwork.com/graphql",
+            path_url="/graphql",
+            body=json.dumps({"query": "query TimeReport { timeReport { x } }"}),
+            headers={"X-Upwork-API-TenantId": "t1"},
+        )
+        response = SimpleNamespace(
+            request=request,
+            elapsed=timedelta(milliseconds=120),
+            status_code=200,
+            content=b"{}",
+        )
+
+        timing.record_http_response(response)
+        span = timing.end()["spans"][0]
+
+        self.assertEqual(span["category"], "graphql")
+        self.assertEqual(span["name"], "TimeReport")
+        self.assertEqual(span["tenant"], "t1")
+        self.assertEqual(span["bytes"], 2)
+        self.assertEqual(span["duration_ms"], 120.0)
+
+    def test_rest_operations_use_route_templates(self):
+        def operation(path):
+            request = SimpleNamespace(
+                url="https://www.upwork.com" + path, path_url=path, body=None
+            )
+            return timing.upstream_operation(request)
+
+        self.assertEqual(
+            operation("/gds/finreports/v2/providers/~0123abc/billings?tq=x"),
+            ("http", "/gds/finreports/v2/providers/{ref}/billings"),
+        )
+        self.assertEqual(
+            operation("/api/profiles/v1/providers/~0123abc.json"),
+            ("http", "/api/profiles/v1/providers/{profile_key}.json"),
+        )
+        self.assertEqual(
+            operation("/api/v3/oauth2/token"), ("http", "/api/v3/oauth2/token")
+        )
+        self.assertEqual(operation("/api/hr/v2/users/jdoe"), ("http", "other"))
+
+
+class RequestTimingMiddlewareTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="testuser", password="pw")
+        self.client = Client()
+        self.client.force_login(self.user)
+        session = self.client.session
+        session["token"] = {"access_token": "test"}
+        session.save()
+
+    @patch("upworkapi.views.reports._fetch_time_report", return_value=[])
+    def test_report_page_has_server_timing(self, _fetch):
+        response = self.client.get(reverse("timereport_graph"))
+
+        header = response["Server-Timing"]
+        self.assertIn("aggregate;dur=", header)
+        self.assertIn("render;dur=", header)
+        self.assertIn("cache;desc=", header)
+
+    def test_debug_timing_requires_staff(self):
+        response = self.client.get(reverse("debug_timing"))
+        self.assertEqual(response.status_code, 403)
+
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get(reverse("debug_timing"))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("requests", response.json())
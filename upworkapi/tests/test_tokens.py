@@ -0,0 +1,109 @@
+import threading
+import time
+
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TransactionTestCase
+from oauthlib.oauth2 import InvalidGrantError
+from unittest.mock import patch
+
+from upworkapi.middleware import UpworkTokenRefreshMiddleware
+from upworkapi.models import UpworkGrant
+from upworkapi.services.tokens import fresh_token, store_token, stored_token
+
+
+def _token(access, expires_in):
+    return {
+        "access_token": access,
+        "refresh_token": "r-" + access,
+        "expires_at": time.time() + expires_in,
+    }
+
+
+class FreshTokenTestCase(TransactionTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    @patch("upworkapi.services.tokens.refresh_upwork_token")
+    def test_valid_token_is_returned_untouched(self, mock_refresh):
+        token = _token("a", 3600)
+        self.assertIs(fresh_token(1, token), token)
+        mock_refresh.assert_not_called()
+
+    @patch("upworkapi.services.tokens.refresh_upwork_token")
+    def test_expiring_token_is_refreshed_once_and_shared(self, mock_refresh):
+        old = _token("old", 30)
+        mock_refresh.return_value = _token("new", 3600)
+
+        first = fresh_token(1, dict(old))
+        second = fresh_token(1, dict(old))
+
+        self.assertEqual(first["access_token"], "new")
+        self.assertEqual(second["access_token"], "new")
+        self.assertEqual(mock_refresh.call_count, 1)
+        self.assertEqual(stored_token(1)["access_token"], "new")
+
+    @patch("upworkapi.services.tokens.REFRESH_POLL_SECONDS", 0.01)
+    @patch("upworkapi.services.tokens.refresh_upwork_token")
+    def test_waits_for_refresh_in_progress(self, mock_refresh):
+        cache.add("upwork_token_refresh_lock:1", "1")
+        timer = threading.Timer(0.05, store_token, args=(1, _token("other", 3600)))
+        timer.start()
+
+        token = fresh_token(1, _token("old", 30))
+        timer.join()
+
+        self.assertEqual(token["access_token"], "other")
+        mock_refresh.assert_not_called()
+
+    @patch("upworkapi.services.tokens.refresh_upwork_token")
+    def test_invalid_grant_forgets_stored_token(self, mock_refresh):
+        store_token(1, _token("old", 30))
+        mock_refresh.side_effect = InvalidGrantError()
+
+        with self.assertRaises(InvalidGrantError):
+            fresh_token(1, _token("old", 30))
+        self.assertIsNone(stored_token(1))
+
+    def test_cache_holds_only_the_encrypted_access_token(self):
+        store_token(1, _token("a", 600))
+
+        raw = cache.get("upwork_token:1")
+        self.assertIsInstance(raw, str)
+        self.assertNotIn("r-a", raw)
+        self.assertNotIn('"a"', raw)
+        self.assertNotEqual(UpworkGrant.objects.get(owner="1").refresh_token, "r-a")
+        self.assertEqual(stored_token(1)["refresh_token"], "r-a")
+
+    @patch("upworkapi.services.tokens.cache.set")
+    def test_access_token_is_cached_no_longer_than_it_lives(self, mock_set):
+        store_token(1, _token("a", 600))
+
+        self.assertLessEqual(mock_set.call_args.args[2], 600)
+
+    @patch("upworkapi.services.tokens.refresh_upwork_token")
+    def test_refreshes_from_stored_grant_once_access_token_is_gone(self, mock_refresh):
+        store_token(1, _token("old", 600))
+        cache.delete("upwork_token:1")
+        mock_refresh.return_value = _token("new", 3600)
+
+        token = fresh_token(1)
+
+        self.assertEqual(token["access_token"], "new")
+        self.assertEqual(mock_refresh.call_args.args[0]["refresh_token"], "r-old")
+
+
+class TokenMiddlewareFastPathTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.middleware = UpworkTokenRefreshMiddleware(lambda r: HttpResponse("ok"))
+
+    def test_exempt_path_does_not_load_session(self):
+        request = RequestFactory().get("/about/", HTTP_COOKIE="sessionid=abc")
+        # No request.session attribute: touching it would raise.
+        self.assertEqual(self.middleware(request).status_code, 200)
+
+    def test_request_without_session_cookie_is_skipped(self):
+        request = RequestFactory().get("/earning/")
+        self.assertEqual(self.middleware(request).status_code, 200)
@@ -1,6 +1,6 @@
 from django.test import SimpleTestCase
 from django.urls import reverse, resolve
-from upworkapi.views import auth, reports, debug
+from upworkapi.views import api, auth, export, reports, debug
 
 
 class URLPatternsTestCase(SimpleTestCase):
@@ -19,6 +19,17 @@ class URLPatternsTestCase(SimpleTestCase):
         url = "/callback"
         self.assertEqual(resolve(url).func, auth.callback)
 
+    def test_export_transactions_url_pattern(self):
+        url = reverse("export_transactions")
+        self.assertEqual(url, "/export/transactions/")
+        self.assertEqual(resolve(url).func, export.transactions)
+
+    def test_client_trend_url_accepts_slashes_in_client_name(self):
+        url = reverse("api_client_trend", args=["Acme/Co"])
+        match = resolve(url)
+        self.assertEqual(match.func, api.client_trend)
+        self.assertEqual(match.kwargs["client_name"], "Acme/Co")
+
     def test_logout_url_pattern(self):
         url = reverse("logout")
         self.assertEqual(url, "/logout/")
@@ -50,6 +61,21 @@ class URLPatternsTestCase(SimpleTestCase):
         self.assertEqual(url, "/earning/2024/1/client/TestClient/")
         self.assertEqual(resolve(url).func, reports.earning_month_client_detail)
 
+    def test_all_time_warm_progress_url_pattern(self):
+        url = reverse("all_time_warm_progress")
+        self.assertEqual(url, "/earning/all-time/progress/")
+        self.assertEqual(resolve(url).func, reports.all_time_warm_progress)
+
+    def test_api_hourly_month_url_pattern(self):
+        url = reverse("api_hourly_month", kwargs={"year": 2024, "month": 3})
+        self.assertEqual(url, "/api/v1/hourly/2024/3/")
+        self.assertEqual(resolve(url).func, api.hourly_month)
+
+    def test_api_all_time_url_pattern(self):
+        url = reverse("api_all_time")
+        self.assertEqual(url, "/api/v1/all-time/")
+        self.assertEqual(resolve(url).func, api.all_time)
+
     def test_debug_session_url_pattern(self):
         url = "/debug/session/"
         self.assertEqual(resolve(url).func, debug.session_dump)
@@ -0,0 +1,59 @@
+import threading
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+from upworkapi import utils
+from upworkapi.utils import http_session, upwork_client
+
+
+class UpworkClientFactoryTestCase(SimpleTestCase):
+
+    def test_get_client_returns_independent_clients(self):
+        first = upwork_client.get_client({"access_token": "a"})
+        second = upwork_client.get_client({"access_token": "b"})
+
+        self.assertIsNot(first, second)
+        first.set_org_uid_header("tenant-1")
+        self.assertIsNone(second.get_actual_config().tenant_id)
+        self.assertFalse(hasattr(upwork_client, "client"))
+
+    def test_get_client_does_not_share_token_dict(self):
+        token = {"access_token": "a"}
+        client = upwork_client.get_client(token)
+        client.get_actual_config().token["access_token"] = "changed"
+        self.assertEqual(token["access_token"], "a")
+
+    @override_settings(UPWORK_PUBLIC_KEY="overridden-key")
+    def test_get_client_reads_current_settings(self):
+        client = upwork_client.get_client()
+        self.assertEqual(client.get_actual_config().client_id, "overridden-key")
+
+    def test_get_client_mounts_the_shared_adapter(self):
+        client = upwork_client.get_client({"access_token": "a"})
+        self.assertIs(
+            client._Client__oauth.get_adapter("https://api.upwork.com"),
+            utils._http_adapter,
+        )
+
+    def test_get_client_reports_a_missing_oauth_session(self):
+        class RenamedClient:
+            def __init__(self, config):
+                self.config = config
+
+        with patch("upworkapi.utils.upwork.Client", RenamedClient):
+            with self.assertLogs("upworkapi.utils", level="ERROR"):
+                client = upwork_client.get_client({"access_token": "a"})
+        self.assertIsInstance(client, RenamedClient)
+
+    def test_http_session_is_per_thread(self):
+        sessions = []
+        t = threading.Thread(target=lambda: sessions.append(http_session()))
+        t.start()
+        t.join()
+
+        self.assertIs(http_session(), http_session())
+        self.assertIsNot(sessions[0], http_session())
+        self.assertIs(
+            sessions[0].get_adapter("https://api.upwork.com"),
+            http_session().get_adapter("https://api.upwork.com"),
+        )
@@ -1,33 +1,119 @@
+import logging
+import threading
+import time
+
 from django.conf import settings
+import requests
+from requests.adapters import HTTPAdapter
 import upwork
 
+from upworkapi.services import metrics, timing
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """Token bucket shared by threads: `rate` calls per second, `burst` at once."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = float(rate)
+        self.burst = max(int(burst), 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+
+
+class PacedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that waits on an optional RateLimiter before each send."""
+
+    limiter = None
+
+    def send(self, request, **kwargs):
+        if self.limiter is not None:
+            self.limiter.wait()
+        return super().send(request, **kwargs)
+
+
+# One connection pool per worker process, shared by every Upwork client and
+# raw `requests` call. urllib3 pools are thread-safe; sessions are not, so each
+# thread gets its own lightweight session mounted on the shared adapter.
+_http_adapter = PacedHTTPAdapter(pool_connections=4, pool_maxsize=16)
+
+
+def pace_upwork_calls(rate=None, burst=1):
+    """Limit this process's Upwork calls to `rate` per second (None: no limit).
+
+    Meant for batch jobs sharing the API quota with the web workers.
+    """
+    _http_adapter.limiter = RateLimiter(rate, burst) if rate else None
+
+
+_local = threading.local()
+
+
+def http_session() -> requests.Session:
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.mount("https://", _http_adapter)
+        session.mount("http://", _http_adapter)
+        session.hooks["response"].extend(
+            [timing.record_http_response, metrics.record_upstream_response]
+        )
+        _local.session = session
+    return session
+
 
 class UpworkClient:
-    client = None
+    """Factory for per-token Upwork clients.
 
-    def __init__(self):
-        self.get_client()
+    Every call returns a fresh `upwork.Client` (its config is mutated by
+    `set_org_uid_header` and token refreshes, so it must not be shared), and
+    all clients reuse the pooled HTTP adapter. Nothing is stored on the
+    factory itself.
+    """
 
     def get_client(self, token=None):
+        config = {
+            "client_id": settings.UPWORK_PUBLIC_KEY,
+            "client_secret": settings.UPWORK_SECRET_KEY,
+            "redirect_uri": settings.UPWORK_CALLBACK_URL,
+        }
         if token:
-            config = upwork.Config(
-                {
-                    "client_id": settings.UPWORK_PUBLIC_KEY,
-                    "client_secret": settings.UPWORK_SECRET_KEY,
-                    "redirect_uri": settings.UPWORK_CALLBACK_URL,
-                    "token": token,
-                }
-            )
-        else:
-            config = upwork.Config(
-                {
-                    "client_id": settings.UPWORK_PUBLIC_KEY,
-                    "client_secret": settings.UPWORK_SECRET_KEY,
-                    "redirect_uri": settings.UPWORK_CALLBACK_URL,
-                }
+            # Copy so the OAuth session's token updater never writes into the
+            # caller's (e.g. request.session) dict.
+            config["token"] = dict(token) if isinstance(token, dict) else token
+        client = upwork.Client(upwork.Config(config))
+        # python-upwork-oauth2 keeps its OAuth2Session private; if a release
+        # renames it the client still works, but without pooling, pacing or
+        # metrics, so say so instead of carrying on quietly.
+        oauth = getattr(client, "_Client__oauth", None)
+        if not isinstance(oauth, requests.Session):
+            logger.error(
+                "upwork.Client has no _Client__oauth session; Upwork calls "
+                "made through it are not rate limited or recorded."
             )
-        self.client = upwork.Client(config)
-        return self.client
+            return client
+        oauth.mount("https://", _http_adapter)
+        oauth.mount("http://", _http_adapter)
+        oauth.hooks["response"].extend(
+            [timing.record_http_response, metrics.record_upstream_response]
+        )
+        return client
 
 
 upwork_client = UpworkClient()
@@ -0,0 +1,347 @@
+from calendar import monthrange
+from datetime import date, datetime
+from functools import wraps
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, JsonResponse
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.http import quote_etag
+from django.views.decorators.http import require_GET
+from oauthlib.oauth2 import (
+    InvalidGrantError,
+    MissingTokenError,
+    OAuth2Error,
+    TokenExpiredError,
+)
+import requests
+
+from upworkapi.services import client_analytics
+from upworkapi.services.detail_pages import detail_query, paginate_details
+from upworkapi.services.transactions import UpworkGraphQLError
+from upworkapi.views.reports import (
+    _all_time_warm_status,
+    _build_total_earning_data,
+    _build_transaction_earning_data,
+    _cached_all_time_year_summaries,
+    _cached_client_year_stats,
+    _cached_earning_graph_annually,
+    _cached_earning_graph_monthly,
+    _cached_fixed_price_transactions,
+    _cached_time_report_rates,
+    _cached_timereport_year,
+    _cached_upwork_join_year,
+    _fixed_detail_rows,
+    _fixed_price_year_data,
+    _hourly_detail_rows,
+    _profile_key_from_url,
+    _warm_all_time_years_async,
+)
+
+
+# Closed periods only change through late Upwork adjustments; open ones change
+# as work is logged, so browsers revalidate them much sooner.
+CLOSED_PERIOD_MAX_AGE = 3600
+OPEN_PERIOD_MAX_AGE = 60
+CLIENT_TREND_YEARS = 5
+MAX_CLIENT_TREND_YEARS = 20
+# Failures of the Upwork calls themselves; anything else is a bug here and
+# is left to propagate (and reach Sentry).
+UPSTREAM_ERRORS = (requests.RequestException, OAuth2Error, UpworkGraphQLError)
+
+
+def _period_closed(year, month=None):
+    year = int(year)
+    if month:
+        end_dt = date(year, int(month), monthrange(year, int(month))[1])
+    else:
+        end_dt = date(year, 12, 31)
+    return date.today() > end_dt
+
+
+def _json_error(message, status):
+    response = JsonResponse({"error": message}, status=status)
+    response["Cache-Control"] = "no-store"
+    return response
+
+
+def _api_response(request, payload, *, closed):
+    body = json.dumps(payload, cls=DjangoJSONEncoder, sort_keys=True)
+    etag = quote_etag(hashlib.sha256(body.encode("utf-8")).hexdigest()[:32])
+
+    response = HttpResponse(body, content_type="application/json")
+    response["ETag"] = etag
+    patch_cache_control(
+        response,
+        private=True,
+        max_age=CLOSED_PERIOD_MAX_AGE if closed else OPEN_PERIOD_MAX_AGE,
+    )
+    patch_vary_headers(response, ["Cookie"])
+    return get_conditional_response(request, etag=etag, response=response)
+
+
+def api_view(view):
+    """JSON flavour of the report views' login/token/error handling."""
+
+    @require_GET
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return _json_error("Authentication required.", 401)
+        token = request.session.get("token")
+        if not token:
+            return _json_error("Missing token. Please login again.", 401)
+        if "month" in kwargs and not 1 <= int(kwargs["month"]) <= 12:
+            return _json_error("Wrong month format.", 400)
+        try:
+            return view(request, token, *args, **kwargs)
+        except (InvalidGrantError, MissingTokenError, TokenExpiredError):
+            request.session.pop("token", None)
+            return _json_error("Session expired. Please login again.", 401)
+        except UPSTREAM_ERRORS as exc:
+            return _json_error(f"Upwork API error: {exc}", 502)
+
+    return wrapper
+
+
+def _freelancer_reference(request):
+    return (
+        request.session.get("freelancer_reference")
+        or _profile_key_from_url(
+            (request.session.get("upwork_auth") or {}).get("profile_url")
+        )
+        or request.user.username
+    )
+
+
+@api_view
+def hourly_year(request, token, year):
+    graph = _cached_earning_graph_annually(request, token, str(year))
+    return _api_response(request, {"graph": graph}, closed=_period_closed(year))
+
+
+@api_view
+def hourly_month(request, token, year, month):
+    graph = _cached_earning_graph_monthly(request, token, int(year), int(month))
+    return _api_response(request, {"graph": graph}, closed=_period_closed(year, month))
+
+
+@api_view
+def hours_year(request, token, year):
+    graph = dict(_cached_timereport_year(request, token, str(year)))
+    graph.pop("client_pie_data", None)
+    return _api_response(request, {"graph": graph}, closed=_period_closed(year))
+
+
+@api_view
+def rates_year(request, token, year):
+    data = _cached_time_report_rates(request, token, year)
+    return _api_response(request, data, closed=_period_closed(year))
+
+
+@api_view
+def earnings_year(request, token, year, month=None):
+    graph, client_rows, _client_pie_data = _build_total_earning_data(
+        request=request,
+        token=token,
+        tenant_id=request.session.get("tenant_id"),
+        year=year,
+        month=month,
+        include_detail=bool(month),
+    )
+    return _api_response(
+        request,
+        {"graph": graph, "client_rows": client_rows},
+        closed=_period_closed(year, month),
+    )
+
+
+@api_view
+def fixed_year(request, token, year):
+    rows = _cached_fixed_price_transactions(
+        request,
+        token=token,
+        freelancer_reference=_freelancer_reference(request),
+        tenant_id=request.session.get("tenant_id"),
+        tenant_ids=request.session.get("tenant_ids"),
+        start_date=date(int(year), 1, 1),
+        end_date=date(int(year), 12, 31),
+    )
+    data = _fixed_price_year_data(rows)
+    data.pop("client_pie_data", None)
+    data["year"] = str(year)
+    return _api_response(request, data, closed=_period_closed(year))
+
+
+def _fixed_rows_for(request, token, year, month):
+    return _fixed_detail_rows(
+        request,
+        token=token,
+        tenant_id=request.session.get("tenant_id"),
+        tenant_ids=request.session.get("tenant_ids"),
+        freelancer_reference=_freelancer_reference(request),
+        year=year,
+        month=month,
+    )
+
+
+def _details_response(request, rows, year, month):
+    page = paginate_details(rows, **detail_query(request.GET))
+    return _api_response(request, page, closed=_period_closed(year, month))
+
+
+@api_view
+def hourly_details(request, token, year, month=None):
+    rows = _hourly_detail_rows(request, token, year, month)
+    return _details_response(request, rows, year, month)
+
+
+@api_view
+def earnings_details(request, token, year, month=None):
+    rows = _hourly_detail_rows(request, token, year, month) + _fixed_rows_for(
+        request, token, year, month
+    )
+    return _details_response(request, rows, year, month)
+
+
+@api_view
+def fixed_details(request, token, year, month=None):
+    rows = _fixed_rows_for(request, token, year, month)
+    return _details_response(request, rows, year, month)
+
+
+@api_view
+def net_year(request, token, year, month=None):
+    data = _build_transaction_earning_data(
+        request, token=token, year=str(year), month=month, net_view=True
+    )
+    payload = {
+        "graph": data["graph"],
+        "client_rows": data["client_rows"],
+        "service_fee_total": data["service_fee_total"],
+        "membership_total": data["membership_total"],
+        "connect_total": data["connect_total"],
+    }
+    return _api_response(request, payload, closed=_period_closed(year, month))
+
+
+def _trend_years(request):
+    try:
+        years = int(request.GET.get("years") or CLIENT_TREND_YEARS)
+    except ValueError:
+        return None
+    return min(max(years, 1), MAX_CLIENT_TREND_YEARS)
+
+
+def _client_stats_by_year(request, token, years):
+    """Cached per-client stats for the last `years` years (from joining)."""
+    tenant_id = request.session.get("tenant_id")
+    current = datetime.now().year
+    start_year = max(
+        current - years + 1,
+        int(
+            _cached_upwork_join_year(
+                request,
+                token=token,
+                tenant_id=tenant_id,
+                freelancer_reference=_freelancer_reference(request),
+            )
+        ),
+    )
+    return {
+        y: _cached_client_year_stats(
+            request,
+            token=token,
+            tenant_id=tenant_id,
+            tenant_ids=request.session.get("tenant_ids"),
+            year=y,
+        )
+        for y in range(start_year, current + 1)
+    }
+
+
+@api_view
+def clients(request, token):
+    years = _trend_years(request)
+    if years is None:
+        return _json_error("Wrong years format.", 400)
+    stats_by_year = _client_stats_by_year(request, token, years)
+    payload = {
+        "years": sorted(stats_by_year),
+        "clients": client_analytics.client_names(stats_by_year),
+    }
+    return _api_response(request, payload, closed=False)
+
+
+@api_view
+def client_trend(request, token, client_name):
+    years = _trend_years(request)
+    if years is None:
+        return _json_error("Wrong years format.", 400)
+    stats_by_year = _client_stats_by_year(request, token, years)
+    if client_name not in client_analytics.client_names(stats_by_year):
+        return _json_error("Unknown client.", 404)
+    series = client_analytics.client_series(stats_by_year, client_name)
+    return _api_response(request, series, closed=False)
+
+
+@api_view
+def all_time(request, token):
+    tenant_id = request.session.get("tenant_id")
+    freelancer_reference = _freelancer_reference(request)
+    start_year = _cached_upwork_join_year(
+        request,
+        token=token,
+        tenant_id=tenant_id,
+        freelancer_reference=freelancer_reference,
+    )
+    years = list(range(int(start_year), datetime.now().year + 1))
+    _summaries, missing_years, series = _cached_all_time_year_summaries(
+        request,
+        tenant_id=tenant_id,
+        freelancer_reference=freelancer_reference,
+        years=years,
+    )
+
+    if missing_years:
+        _warm_all_time_years_async(
+            user_id=request.user.id,
+            token=token,
+            tenant_id=tenant_id,
+            tenant_ids=request.session.get("tenant_ids"),
+            freelancer_reference=freelancer_reference,
+            years=list(missing_years),
+        )
+        status = _all_time_warm_status(request.user.id, tenant_id, freelancer_reference)
+        response = JsonResponse(
+            {
+                "warming": status["warming"],
+                "done": status["done"],
+                "total": status["total"] or len(missing_years),
+                "missing_years": missing_years,
+                "failed_years": status["failed_years"],
+                "last_error": status["last_error"],
+                "retry_in": status["retry_in"],
+            },
+            status=202,
+        )
+        response["Cache-Control"] = "no-store"
+        return response
+
+    payload = {
+        "years": [
+            {"year": y, "total": total}
+            for y, total in zip(series["years"], series["totals"])
+        ],
+        "total_earning": round(sum(series["totals"]), 2),
+        "client_rows": [
+            {"name": r["name"], "total": round(r["total"], 2)}
+            for r in series["client_rows"]
+        ],
+    }
+    return _api_response(request, payload, closed=False)
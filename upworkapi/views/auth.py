@@ -12,7 +12,16 @@ from upworkapi.utils import upwork_client
 import traceback
 from django.http import HttpResponse, HttpResponseBadRequest
 import json
-from upworkapi.services.tenant import get_tenant_id, list_tenants
+from upworkapi.services import activity
+from upworkapi.services.graphql_batch import GraphQLBatch
+from upworkapi.services.tenant import (
+    COMPANY_SELECTOR_SELECTION,
+    first_tenant_id,
+    list_tenants,
+    tenant_items,
+)
+from upworkapi.services.tokens import forget_token, store_token
+from upworkapi.views.reports import _build_dashboard_snapshots_async
 import logging
 
 
@@ -21,6 +30,19 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+USER_SELECTION = """
+    rid
+    email
+    photoUrl
+    freelancerProfile {
+        fullName
+        firstName
+        lastName
+        personalData { profileUrl }
+    }
+"""
+
+
 def auth_view(request):
     client = upwork_client.get_client()
     authorization_url, state = client.get_authorization_url()
@@ -72,39 +94,32 @@ def callback(request):
 
         request.session["access_token"] = access_token
 
-        tenant_items = list_tenants(access_token)
-        if tenant_items:
+        # Tenants and the user profile come back in a single round-trip.
+        batch = GraphQLBatch("CallbackProfile")
+        batch.add("tenants", "companySelector", COMPANY_SELECTOR_SELECTION)
+        batch.add("user", "user", USER_SELECTION)
+
+        data = graphql.Api(client).execute(batch.payload())
+        batch_data, _batch_errors = batch.split(data)
+        if not batch_data.get("user"):
+            # Tenants are optional: an error in companySelector can reject or
+            # null the whole batch, so ask for the user on its own before
+            # giving up on the login.
+            data = graphql.Api(client).execute(
+                {"query": "query { user { %s } }" % USER_SELECTION}
+            )
+
+        items = tenant_items(batch_data.get("tenants"))
+        if items:
             request.session["tenant_ids"] = [
-                str(t.get("organizationId"))
-                for t in tenant_items
-                if t.get("organizationId")
-            ]
-            request.session["tenant_names"] = [
-                t.get("title") or "" for t in tenant_items
+                str(t.get("organizationId")) for t in items if t.get("organizationId")
             ]
+            request.session["tenant_names"] = [t.get("title") or "" for t in items]
 
-        tenant_id = get_tenant_id(access_token)
+        tenant_id = first_tenant_id(items)
         if tenant_id:
             request.session["tenant_id"] = tenant_id
 
-        query = """
-        query {
-            user {
-                rid
-                email
-                photoUrl
-                freelancerProfile {
-                    fullName
-                    firstName
-                    lastName
-                    personalData { profileUrl }
-                }
-            }
-        }
-        """
-
-        data = graphql.Api(client).execute({"query": query})
-
         # Kalau GraphQL gagal, tampilkan response mentah
         if (
             not isinstance(data, dict)
@@ -140,6 +155,7 @@ def callback(request):
             )
 
         login(request, auth_user)
+        store_token(auth_user.id, token)
 
         profile_url = user_data["freelancerProfile"]["personalData"].get("profileUrl")
         request.session["upwork_auth"] = {
@@ -151,6 +167,19 @@ def callback(request):
         if profile_key:
             request.session["freelancer_reference"] = profile_key
 
+        activity.touch(auth_user.id, request.session)
+        try:
+            _build_dashboard_snapshots_async(
+                user_id=auth_user.id,
+                token=token,
+                tenant_id=request.session.get("tenant_id"),
+                tenant_ids=request.session.get("tenant_ids"),
+                freelancer_reference=profile_key or auth_user.username,
+            )
+        except Exception:
+            # Snapshots only save time; never fail the login over them.
+            logger.exception("Could not start dashboard snapshot build.")
+
         messages.success(request, "Authentication Success.")
         return redirect("earning_graph")
 
@@ -209,6 +238,8 @@ def disconnect(request):
     if "upwork_auth" in request.session:
         del request.session["upwork_auth"]
         del request.session["token"]
+        forget_token(request.user.id)
+        activity.forget(request.user.id)
         logout(request)
         messages.success(request, "Disconnect Success.")
     return redirect("home")
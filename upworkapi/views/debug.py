@@ -1,5 +1,8 @@
+from django.conf import settings
 from django.http import JsonResponse
 
+from upworkapi.services import timing
+
 
 def session_dump(request):
     return JsonResponse(
@@ -12,3 +15,10 @@ def session_dump(request):
             "user": getattr(request.user, "username", None),
         }
     )
+
+
+def timing_dump(request):
+    """Recent per-request span summaries from this worker process."""
+    if not (settings.DEBUG or request.user.is_staff):
+        return JsonResponse({"error": "Not allowed."}, status=403)
+    return JsonResponse({"requests": timing.recent_summaries()})
@@ -0,0 +1,201 @@
+import csv
+import io
+import logging
+from datetime import date
+from itertools import chain
+
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.http import HttpResponse, StreamingHttpResponse
+from django.shortcuts import redirect
+from django.views.decorators.http import require_GET
+from oauthlib.oauth2 import InvalidGrantError, MissingTokenError, TokenExpiredError
+import pyarrow
+import pyarrow.parquet
+
+from upworkapi.services import metrics
+from upworkapi.views.api import UPSTREAM_ERRORS
+from upworkapi.views.reports import (
+    TXN_EXPORT_FIELDS,
+    _cached_upwork_join_year,
+    _session_freelancer_reference,
+    _transaction_history_windows,
+    _txn_export_row,
+    _txn_row_date,
+)
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+class _Echo:
+    """Pseudo-buffer for csv.writer: write() hands the line back instead of
+    storing it, so each row can be yielded as soon as it is formatted."""
+
+    def write(self, value):
+        return value
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file for ParquetWriter that keeps bytes only until drained."""
+
+    def __init__(self):
+        super().__init__()
+        self.chunks = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def _csv_stream(windows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(TXN_EXPORT_FIELDS)
+    count = 0
+    try:
+        for window in windows:
+            for row in window:
+                yield writer.writerow([row[f] for f in TXN_EXPORT_FIELDS])
+                count += 1
+    except UPSTREAM_ERRORS as exc:
+        # The status line is long gone; a last row that cannot pass for a
+        # transaction is the only way to tell the reader the file is short.
+        logger.exception("Transaction export failed after %s rows.", count)
+        metrics.inc("upworkapi_export_errors_total", format="csv")
+        error = dict.fromkeys(TXN_EXPORT_FIELDS, "")
+        error["date"] = "ERROR"
+        error["description"] = "Export incomplete: Upwork API error: %s" % exc
+        yield writer.writerow([error[f] for f in TXN_EXPORT_FIELDS])
+        return
+    metrics.inc("upworkapi_export_rows_total", count, format="csv")
+
+
+def _parquet_schema():
+    return pyarrow.schema(
+        [
+            (f, pyarrow.float64() if f == "amount" else pyarrow.string())
+            for f in TXN_EXPORT_FIELDS
+        ]
+    )
+
+
+def _parquet_stream(windows):
+    # One row group per window: only the current year's rows are held as
+    # Arrow columns, and the encoded bytes leave as soon as it is written.
+    schema = _parquet_schema()
+    sink = _ChunkSink()
+    writer = pyarrow.parquet.ParquetWriter(sink, schema)
+    count = 0
+    try:
+        for window in windows:
+            if not window:
+                continue
+            writer.write_table(pyarrow.Table.from_pylist(window, schema=schema))
+            count += len(window)
+            yield sink.drain()
+    except UPSTREAM_ERRORS:
+        # Without its footer the file is unreadable rather than short; raising
+        # makes the server drop the connection so the download fails too.
+        logger.exception("Transaction export failed after %s rows.", count)
+        metrics.inc("upworkapi_export_errors_total", format="parquet")
+        raise
+    writer.close()
+    yield sink.drain()
+    metrics.inc("upworkapi_export_rows_total", count, format="parquet")
+
+
+def _export_range(request, token):
+    """start/end from the query (ISO dates); by default from January 1st of
+    the join year through today. Raises ValueError on a bad range."""
+    today = date.today()
+    end_date = min(
+        date.fromisoformat(request.GET.get("end") or today.isoformat()), today
+    )
+    if request.GET.get("start"):
+        start_date = date.fromisoformat(request.GET["start"])
+    else:
+        join_year = _cached_upwork_join_year(
+            request,
+            token=token,
+            tenant_id=request.session.get("tenant_id"),
+            freelancer_reference=_session_freelancer_reference(request),
+        )
+        start_date = date(int(join_year), 1, 1)
+    if start_date > end_date:
+        raise ValueError("start is after end")
+    return start_date, end_date
+
+
+@login_required(login_url="/")
+@require_GET
+def transactions(request):
+    """Transaction history between two dates as a CSV or Parquet download.
+
+    Rows are read from the per-year transaction cache one year at a time
+    and written out as they are classified, so memory does not grow with
+    the size of the range.
+    """
+    fmt = request.GET.get("format") or "csv"
+    if fmt not in EXPORT_FORMATS:
+        return HttpResponse("Unknown export format.", status=400)
+
+    token = request.session.get("token")
+    if not token:
+        messages.warning(request, "Missing token. Please login again.")
+        return redirect("auth")
+
+    try:
+        try:
+            start_date, end_date = _export_range(request, token)
+        except ValueError:
+            return HttpResponse("Wrong date format.", status=400)
+        windows = _transaction_history_windows(
+            request,
+            token=token,
+            tenant_id=request.session.get("tenant_id"),
+            tenant_ids=request.session.get("tenant_ids"),
+            start_date=start_date,
+            end_date=end_date,
+        )
+        # Load the first year before answering so an expired session still
+        # redirects, and an Upwork failure gets a 502, instead of cutting the
+        # download short.
+        first = next(windows, [])
+    except (InvalidGrantError, MissingTokenError, TokenExpiredError):
+        request.session.pop("token", None)
+        messages.warning(request, "Session expired. Please login again.")
+        return redirect("auth")
+    except UPSTREAM_ERRORS as exc:
+        return HttpResponse(
+            f"Upwork API error: {exc}", status=502, content_type="text/plain"
+        )
+
+    rows = (
+        [_txn_export_row(r) for r in sorted(window, key=_txn_row_date)]
+        for window in chain([first], windows)
+    )
+    stream = _csv_stream(rows) if fmt == "csv" else _parquet_stream(rows)
+    response = StreamingHttpResponse(stream, content_type=EXPORT_FORMATS[fmt])
+    response["Content-Disposition"] = (
+        'attachment; filename="upwork-transactions-%s-%s.%s"'
+        % (start_date.isoformat(), end_date.isoformat(), fmt)
+    )
+    response["Cache-Control"] = "no-store"
+    return response
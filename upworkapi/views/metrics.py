@@ -0,0 +1,20 @@
+import hmac
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+
+from upworkapi.services.metrics import render_prometheus
+
+
+def metrics_view(request):
+    """Prometheus text exposition, summed across all worker processes."""
+    token = settings.METRICS_TOKEN
+    if token:
+        expected = "Bearer %s" % token
+        if not hmac.compare_digest(request.headers.get("Authorization", ""), expected):
+            return HttpResponse("Forbidden.", status=403, content_type="text/plain")
+    elif not settings.DEBUG:
+        raise Http404()
+    return HttpResponse(
+        render_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -1,8 +1,10 @@
 from calendar import month_name, monthrange
 from collections import defaultdict
 from datetime import date, datetime, timedelta
+from functools import wraps
 import time
 import calendar
+import hashlib
 import json
 import re
 import threading
@@ -12,22 +14,42 @@ from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.core.cache import cache
+from django.db import connections
+from django.http import JsonResponse
 from django.shortcuts import redirect, render
-from oauthlib.oauth2 import InvalidGrantError
+from django.template.response import TemplateResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from oauthlib.oauth2 import InvalidGrantError, MissingTokenError
 from upwork.routers import graphql
 
 from upworkapi.services.transactions import (
+    UpworkGraphQLError,
     fetch_fixed_price_transactions,
     fetch_service_fee_history,
     fetch_transaction_history_rows,
 )
+from upworkapi.services import client_analytics, metrics, rates, timing
+from upworkapi.services.detail_pages import paginate_details
+from upworkapi.services.incremental import merge_incremental_rows
+from upworkapi.services.tokens import fresh_token
 from upworkapi.utils import upwork_client
 
 
 CACHE_TTL_SECONDS = 900
 ALL_TIME_CACHE_SECONDS = 21600
 ALL_TIME_WARM_LOCK_SECONDS = 3600
+# After a warm job leaves years missing, wait this long before warming again,
+# doubling per consecutive failed job up to the max.
+ALL_TIME_WARM_RETRY_SECONDS = 60
+ALL_TIME_WARM_MAX_RETRY_SECONDS = 3600
 JOIN_YEAR_CACHE_SECONDS = 86400 * 30
+# Current-year rows are kept this long, and are refetched in full once the
+# last full fetch behind their incremental merges is this old.
+INCREMENTAL_BASE_SECONDS = 86400
+INCREMENTAL_WINDOW_DAYS = 30
+SNAPSHOT_LOCK_SECONDS = 900
 
 
 def _cache_key(prefix: str, *parts) -> str:
@@ -43,11 +65,185 @@ def _date_key(d) -> str:
     return str(d)
 
 
+def _close_thread_connections():
+    # Background jobs read the stored token from the database on their own
+    # thread; close what they opened (not a connection inside a transaction,
+    # as when a test runs the job inline).
+    for conn in connections.all(initialized_only=True):
+        if not conn.in_atomic_block:
+            conn.close()
+
+
 def _request_stub(user_id):
     # Many cached helpers only use request.user.id for cache keys.
     return SimpleNamespace(user=SimpleNamespace(id=user_id))
 
 
+# Data keys read or written while a conditional_report view runs on this
+# thread, mapped to their version (None until looked up).
+_data_versions = threading.local()
+
+
+def _data_version(value) -> str:
+    raw = json.dumps(value, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _track_data_version(key, version=None):
+    seen = getattr(_data_versions, "seen", None)
+    if seen is None:
+        return
+    if version is not None:
+        seen[key] = version
+    else:
+        seen.setdefault(key, None)
+
+
+def _track_untracked_data():
+    """Mark the running view as built from data that has no cache version
+    (fetched without caching, or a failed refresh), so it gets no ETag."""
+    if getattr(_data_versions, "seen", None) is not None:
+        _data_versions.untracked = True
+
+
+def _cache_get(key):
+    value = cache.get(key)
+    prefix = key.split(":", 1)[0]
+    timing.record_cache(prefix, value is not None)
+    metrics.inc(
+        "upworkapi_cache_requests_total",
+        prefix=prefix,
+        result="hit" if value is not None else "miss",
+    )
+    if value is not None:
+        _track_data_version(key)
+    return value
+
+
+def _cache_set(key, value, timeout, *, version=None):
+    """cache.set that also stores a content version for conditional GETs."""
+    version = version or _data_version(value)
+    cache.set_many({key: value, "ver:" + key: version}, timeout)
+    _track_data_version(key, version)
+
+
+def _page_etag(request, versions, template_name):
+    return _data_version(
+        {
+            "data": versions,
+            "user": request.user.id,
+            "tenant": request.session.get("tenant_id"),
+            "path": request.get_full_path(),
+            "template": template_name,
+            "today": date.today(),
+            "session": request.session.session_key,
+        }
+    )
+
+
+def _seen_data_version(request, template_name):
+    """ETag of the page from the versions of the data keys the view touched,
+    or None when a key has no version or the view used untracked data."""
+    if getattr(_data_versions, "untracked", False):
+        return None
+    seen = getattr(_data_versions, "seen", None) or {}
+    pending = ["ver:" + k for k, v in seen.items() if v is None]
+    found = cache.get_many(pending) if pending else {}
+    if len(found) != len(pending):
+        return None
+    versions = {k: v for k, v in seen.items() if v is not None}
+    versions.update({k[len("ver:") :]: v for k, v in found.items()})
+    return _page_etag(request, versions, template_name)
+
+
+def _etag_deps_key(request):
+    page = _data_version(
+        [
+            request.get_full_path(),
+            request.session.get("tenant_id"),
+            request.session.session_key,
+        ]
+    )
+    return _cache_key("etag_deps", request.user.id, page)
+
+
+def _unchanged_page_etag(request):
+    """ETag of the last rendered page if none of its data changed since.
+
+    Reads only the stored versions of the keys the page was built from, so
+    a matching If-None-Match is answered without running the view.
+    """
+    deps = cache.get(_etag_deps_key(request))
+    if deps is None:
+        return None
+    keys = deps["keys"]
+    found = cache.get_many(["ver:" + k for k in keys]) if keys else {}
+    if len(found) != len(keys):
+        return None
+    versions = {k: found["ver:" + k] for k in keys}
+    etag = quote_etag(_page_etag(request, versions, deps["template"]))
+    return etag if etag == deps["etag"] else None
+
+
+def conditional_report(view):
+    """Answer If-None-Match with 304 before a report template is rendered.
+
+    The view must return a TemplateResponse. Its ETag is derived from the
+    versions of the cache entries the view touched, and the keys are kept
+    for CACHE_TTL_SECONDS so a revalidation whose data versions are all
+    unchanged gets a 304 without running the view. Pages carrying flash
+    messages, or built from data that bypassed the cache, are served
+    without an ETag.
+    """
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return view(request, *args, **kwargs)
+
+        if request.META.get("HTTP_IF_NONE_MATCH") and not len(
+            messages.get_messages(request)
+        ):
+            etag = _unchanged_page_etag(request)
+            if etag:
+                response = get_conditional_response(request, etag=etag)
+                if response is not None:
+                    response["ETag"] = etag
+                    patch_cache_control(response, private=True, no_cache=True)
+                    return response
+
+        _data_versions.seen = {}
+        _data_versions.untracked = False
+        try:
+            response = view(request, *args, **kwargs)
+            if (
+                not isinstance(response, TemplateResponse)
+                or response.status_code != 200
+                or len(messages.get_messages(request))
+            ):
+                return response
+            etag = _seen_data_version(request, response.template_name)
+            keys = sorted(_data_versions.seen)
+        finally:
+            _data_versions.seen = None
+            _data_versions.untracked = False
+        if not etag:
+            cache.delete(_etag_deps_key(request))
+            return response
+
+        etag = quote_etag(etag)
+        cache.set(
+            _etag_deps_key(request),
+            {"etag": etag, "keys": keys, "template": response.template_name},
+            CACHE_TTL_SECONDS,
+        )
+        response["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return get_conditional_response(request, etag=etag, response=response)
+
+    return wrapper
+
+
 def _dig(obj, path, default=None):
     cur = obj
     for p in path:
@@ -106,7 +302,7 @@ def _cached_upwork_join_year(request, *, token, tenant_id, freelancer_reference)
         tenant_id or "",
         freelancer_reference or "",
     )
-    cached = cache.get(key)
+    cached = _cache_get(key)
     if cached is not None:
         try:
             return int(cached)
@@ -151,10 +347,65 @@ def _cached_upwork_join_year(request, *, token, tenant_id, freelancer_reference)
     if not year or year < 2000 or year > current_year:
         year = 2010
 
-    cache.set(key, year, JOIN_YEAR_CACHE_SECONDS)
+    _cache_set(key, year, JOIN_YEAR_CACHE_SECONDS)
     return year
 
 
+def _all_time_warm_keys(user_id, tenant_id, freelancer_reference):
+    """Lock, progress and retry keys of a user's all-time warming job."""
+    parts = (user_id, tenant_id or "", freelancer_reference)
+    return (
+        _cache_key("all_time_warm_lock", *parts),
+        _cache_key("all_time_warm_progress", *parts),
+        _cache_key("all_time_warm_retry", *parts),
+    )
+
+
+def _all_time_warm_status(user_id, tenant_id, freelancer_reference):
+    """Progress of the warming job as reported to the page and the API.
+
+    `complete` is only true when nothing failed; years that failed are in
+    `failed_years` with `last_error`, and `retry_in` is how long until
+    another job may start for them.
+    """
+    lock_key, progress_key, retry_key = _all_time_warm_keys(
+        user_id, tenant_id, freelancer_reference
+    )
+    # Progress changes without a data version; pages showing it get no ETag.
+    _track_untracked_data()
+    progress = cache.get(progress_key) or {}
+    retry = cache.get(retry_key) or {}
+    done = int(progress.get("done") or 0)
+    total = int(progress.get("total") or 0)
+    warming = cache.get(lock_key) is not None
+    failed_years = progress.get("failed_years")
+    if failed_years is None and not warming:
+        failed_years = retry.get("failed_years")
+    failed_years = failed_years or []
+    return {
+        "done": done,
+        "total": total,
+        "missing_years": progress.get("missing_years") or [],
+        "failed_years": failed_years,
+        "last_error": progress.get("last_error") or retry.get("last_error") or "",
+        "warming": warming,
+        "complete": bool(
+            (not warming or (total and done >= total)) and not failed_years
+        ),
+        "retry_in": max(0, int(retry.get("retry_at", 0) - time.time())),
+    }
+
+
+def _warm_failure_message(status):
+    years = ", ".join(str(y) for y in status["failed_years"]) or "Some years"
+    message = "%s could not be loaded from Upwork" % years
+    if status["last_error"]:
+        message += ": %s" % status["last_error"]
+    if status["retry_in"]:
+        message += ". Retrying in %s min." % (status["retry_in"] // 60 + 1)
+    return message
+
+
 def _warm_all_time_years_async(
     *,
     user_id,
@@ -167,12 +418,12 @@ def _warm_all_time_years_async(
     if not years:
         return False
 
-    lock_key = _cache_key(
-        "all_time_warm_lock", user_id, tenant_id or "", freelancer_reference
-    )
-    progress_key = _cache_key(
-        "all_time_warm_progress", user_id, tenant_id or "", freelancer_reference
+    lock_key, progress_key, retry_key = _all_time_warm_keys(
+        user_id, tenant_id, freelancer_reference
     )
+    retry = cache.get(retry_key)
+    if retry is not None and time.time() < retry["retry_at"]:
+        return False
 
     if not cache.add(lock_key, "1", ALL_TIME_WARM_LOCK_SECONDS):
         return False
@@ -183,77 +434,628 @@ def _warm_all_time_years_async(
             "total": len(years),
             "done": 0,
             "missing_years": list(years),
+            "failed_years": [],
             "started_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
             "last_error": "",
         },
         ALL_TIME_WARM_LOCK_SECONDS,
     )
 
+    def _warm_year(req, y):
+        # Warming can outlive the request's token, so each year asks the
+        # shared store for the current one (refreshing it if needed).
+        year_token = fresh_token(user_id, token)
+        try:
+            _cached_all_time_year_summary(
+                req,
+                token=year_token,
+                tenant_id=tenant_id,
+                tenant_ids=tenant_ids,
+                freelancer_reference=freelancer_reference,
+                year=int(y),
+            )
+        except (InvalidGrantError, MissingTokenError):
+            raise
+        except Exception:
+            # A refresh may have landed mid-year; retry once with it.
+            retry_token = fresh_token(user_id, token)
+            # Stored tokens come back as fresh copies; compare the values.
+            if (retry_token or {}).get("access_token") == (year_token or {}).get(
+                "access_token"
+            ):
+                raise
+            _cached_all_time_year_summary(
+                req,
+                token=retry_token,
+                tenant_id=tenant_id,
+                tenant_ids=tenant_ids,
+                freelancer_reference=freelancer_reference,
+                year=int(y),
+            )
+
+    def _set_progress(done, missing_years, failed_years, last_error):
+        cache.set(
+            progress_key,
+            {
+                "total": len(years),
+                "done": done,
+                "missing_years": missing_years,
+                "failed_years": failed_years,
+                "started_at": cache.get(progress_key, {}).get("started_at"),
+                "last_error": last_error,
+            },
+            ALL_TIME_WARM_LOCK_SECONDS,
+        )
+
+    def _schedule_retry(failed_years, last_error):
+        if not failed_years:
+            cache.delete(retry_key)
+            return
+        attempts = (cache.get(retry_key) or {}).get("attempts", 0) + 1
+        delay = min(
+            ALL_TIME_WARM_RETRY_SECONDS * 2 ** (attempts - 1),
+            ALL_TIME_WARM_MAX_RETRY_SECONDS,
+        )
+        cache.set(
+            retry_key,
+            {
+                "attempts": attempts,
+                "retry_at": time.time() + delay,
+                "failed_years": failed_years,
+                "last_error": last_error,
+            },
+            ALL_TIME_CACHE_SECONDS,
+        )
+
     def _run():
+        started = time.monotonic()
+        metrics.inc("upworkapi_warm_jobs_running")
         try:
             req = _request_stub(user_id)
             done = 0
+            failed = []
             last_error = ""
             for y in years:
                 try:
-                    _cached_all_time_year_summary(
+                    _warm_year(req, y)
+                except (InvalidGrantError, MissingTokenError) as exc:
+                    # The grant is gone; remaining years would fail the same way.
+                    last_error = "Session expired: %s" % exc
+                    break
+                except Exception as exc:
+                    last_error = str(exc)
+                    failed.append(y)
+                done += 1
+                _set_progress(done, failed + list(years[done:]), failed, last_error)
+            # Years left after a break failed too: nothing will warm them.
+            failed = failed + list(years[done:])
+            _set_progress(done, failed, failed, last_error)
+            _schedule_retry(failed, last_error)
+        finally:
+            cache.delete(lock_key)
+            metrics.dec("upworkapi_warm_jobs_running")
+            metrics.observe("upworkapi_warm_job_seconds", time.monotonic() - started)
+            metrics.flush(force=True)
+            _close_thread_connections()
+
+    t = threading.Thread(target=_run, name="all_time_warm", daemon=True)
+    t.start()
+    return True
+
+
+def _build_dashboard_snapshot(
+    req, *, token, tenant_id, tenant_ids, freelancer_reference, year
+):
+    """Fill every cache entry the report pages read for one year."""
+    start_dt = date(int(year), 1, 1)
+    end_dt = date(int(year), 12, 31)
+    _cached_time_report_year(req, token, year)
+    _cached_transaction_history_year(
+        req, token=token, tenant_id=tenant_id, tenant_ids=tenant_ids, year=year
+    )
+    _cached_fixed_price_transactions(
+        req,
+        token=token,
+        freelancer_reference=freelancer_reference,
+        tenant_id=tenant_id,
+        tenant_ids=tenant_ids,
+        start_date=start_dt,
+        end_date=end_dt,
+    )
+    _cached_service_fee_history(
+        req,
+        token=token,
+        tenant_id=tenant_id,
+        tenant_ids=tenant_ids,
+        start_date=start_dt,
+        end_date=end_dt,
+    )
+
+
+def _build_dashboard_snapshots_async(
+    *,
+    user_id,
+    token,
+    tenant_id,
+    tenant_ids,
+    freelancer_reference,
+    years=None,
+):
+    """Precompute the dashboard data for `years` (current and previous).
+
+    Started right after login so the first report pages and the common
+    year switch read warm caches: hourly rows, transaction history (which
+    the net and earnings pages aggregate), fixed-price payments and fees.
+    """
+    if years is None:
+        current_year = date.today().year
+        years = [current_year, current_year - 1]
+    lock_key = _cache_key("dashboard_snapshot_lock", user_id, tenant_id or "")
+    if not years or not cache.add(lock_key, "1", SNAPSHOT_LOCK_SECONDS):
+        return False
+
+    def _run():
+        req = _request_stub(user_id)
+        result = "ok"
+        try:
+            for y in years:
+                try:
+                    _build_dashboard_snapshot(
                         req,
-                        token=token,
+                        token=fresh_token(user_id, token),
                         tenant_id=tenant_id,
                         tenant_ids=tenant_ids,
                         freelancer_reference=freelancer_reference,
                         year=int(y),
                     )
-                except Exception as exc:
-                    last_error = str(exc)
-                done += 1
-                cache.set(
-                    progress_key,
-                    {
-                        "total": len(years),
-                        "done": done,
-                        "missing_years": list(years[done:]),
-                        "started_at": cache.get(progress_key, {}).get("started_at"),
-                        "last_error": last_error,
-                    },
-                    ALL_TIME_WARM_LOCK_SECONDS,
-                )
+                except (InvalidGrantError, MissingTokenError):
+                    result = "expired"
+                    break
+                except Exception:
+                    # The page will fetch whatever is missing on demand.
+                    result = "partial"
         finally:
             cache.delete(lock_key)
+            metrics.inc("upworkapi_snapshot_builds_total", result=result)
+            metrics.flush()
+            _close_thread_connections()
 
-    t = threading.Thread(target=_run, name="all_time_warm", daemon=True)
+    t = threading.Thread(target=_run, name="dashboard_snapshot", daemon=True)
     t.start()
     return True
 
 
-def _cached_earning_graph_annually(request, token, year):
-    key = _cache_key("hourly_year", request.user.id, year)
-    cached = cache.get(key)
-    if cached is not None:
-        return cached
-    data = earning_graph_annually(token, year)
-    cache.set(key, data, CACHE_TTL_SECONDS)
-    return data
+def _refresh_user_caches(
+    user_id, *, token, tenant_id, tenant_ids, freelancer_reference, all_time=True
+):
+    """Refresh, synchronously, what a returning user's first visit reads.
+
+    Covers the current year's dashboard data and, with `all_time`, every
+    year missing from the all-time rollup. Entries that are still fresh
+    cost nothing. Returns False when a build for the user is already
+    running. Token errors propagate.
+    """
+    lock_key = _cache_key("dashboard_snapshot_lock", user_id, tenant_id or "")
+    if not cache.add(lock_key, "1", SNAPSHOT_LOCK_SECONDS):
+        return False
+    try:
+        req = _request_stub(user_id)
+        current_year = date.today().year
+        _build_dashboard_snapshot(
+            req,
+            token=fresh_token(user_id, token),
+            tenant_id=tenant_id,
+            tenant_ids=tenant_ids,
+            freelancer_reference=freelancer_reference,
+            year=current_year,
+        )
+        if all_time:
+            start_year = _cached_upwork_join_year(
+                req,
+                token=fresh_token(user_id, token),
+                tenant_id=tenant_id,
+                freelancer_reference=freelancer_reference,
+            )
+            _summaries, missing_years, _series = _cached_all_time_year_summaries(
+                req,
+                tenant_id=tenant_id,
+                freelancer_reference=freelancer_reference,
+                years=list(range(int(start_year), current_year + 1)),
+            )
+            for y in missing_years:
+                _cached_all_time_year_summary(
+                    req,
+                    token=fresh_token(user_id, token),
+                    tenant_id=tenant_id,
+                    tenant_ids=tenant_ids,
+                    freelancer_reference=freelancer_reference,
+                    year=int(y),
+                )
+        return True
+    finally:
+        cache.delete(lock_key)
+
+
+def _incremental_year_entry(key, year, fetch, date_of, *, on_store=None):
+    """Cached rows for a calendar year, refreshed incrementally when current.
+
+    Past years are refetched in full once stale. For the current year the
+    previous rows are kept and only the trailing INCREMENTAL_WINDOW_DAYS are
+    requested again (to pick up late adjustments), so a refresh costs the
+    same in December as in January. The merged rows keep the time of the
+    last full fetch (`base_fetched_at`); once that is INCREMENTAL_BASE_SECONDS
+    old the year is refetched in full, so older rows are corrected too.
+    `on_store(rows, refreshed_at, version)` runs after each refresh, for
+    entries derived from the rows.
+
+    `fetch(start, end)` returns (rows, debug); rows is None when the upstream
+    request failed. A failed refresh is neither merged nor cached: the
+    previous rows are served (or no rows, if there were none) with the debug
+    info of the failed attempt. Returns the entry dict (rows, refreshed_at,
+    debug).
+    """
+    now = time.time()
+    entry = _cache_get(key)
+    if entry is not None and now - entry["refreshed_at"] < CACHE_TTL_SECONDS:
+        return entry
+
+    year = int(year)
+    today = date.today()
+    start_dt = date(year, 1, 1)
+    end_dt = date(year, 12, 31)
+    is_current = year == today.year
+    base_fetched_at = now
+    if (
+        entry is not None
+        and is_current
+        and now - entry.get("base_fetched_at", 0) < INCREMENTAL_BASE_SECONDS
+    ):
+        since = max(start_dt, today - timedelta(days=INCREMENTAL_WINDOW_DAYS))
+        fresh, debug = fetch(since, end_dt)
+        rows = None
+        if fresh is not None:
+            rows = merge_incremental_rows(
+                entry["rows"], fresh, since=since, date_of=date_of
+            )
+        base_fetched_at = entry["base_fetched_at"]
+    else:
+        rows, debug = fetch(start_dt, end_dt)
+
+    if rows is None:
+        _track_untracked_data()
+        if entry is not None:
+            return dict(entry, debug=debug)
+        return {"rows": [], "refreshed_at": now, "debug": debug}
+
+    version = _store_year_rows(
+        key, year, rows, refreshed_at=now, base_fetched_at=base_fetched_at, debug=debug
+    )
+    if on_store is not None:
+        on_store(rows, now, version)
+    return {
+        "rows": rows,
+        "refreshed_at": now,
+        "base_fetched_at": base_fetched_at,
+        "debug": debug,
+    }
+
+
+def _incremental_year_rows(key, year, fetch, date_of, *, on_store=None):
+    return _incremental_year_entry(key, year, fetch, date_of, on_store=on_store)["rows"]
+
+
+def _year_rows_timeout(year):
+    is_current = int(year) == date.today().year
+    return INCREMENTAL_BASE_SECONDS if is_current else CACHE_TTL_SECONDS
+
+
+def _store_year_rows(
+    key, year, rows, *, refreshed_at=None, base_fetched_at=None, debug=None
+):
+    # The version covers the rows only; debug info is diagnostics. Rows
+    # stored without base_fetched_at count as a full fetch.
+    version = _data_version(rows)
+    refreshed_at = refreshed_at or time.time()
+    _cache_set(
+        key,
+        {
+            "rows": rows,
+            "refreshed_at": refreshed_at,
+            "base_fetched_at": base_fetched_at or refreshed_at,
+            "debug": debug,
+        },
+        _year_rows_timeout(year),
+        version=version,
+    )
+    return version
+
+
+def _txn_row_date(row):
+    return str(row.get("date") or row.get("occurred_at") or "")[:10]
+
+
+def _time_report_year_key(user_id, year):
+    return _cache_key("timereport_rows", user_id, int(year))
+
+
+def _transaction_history_year_key(user_id, *, tenant_id, tenant_ids, year):
+    tenant_key = ""
+    if tenant_ids:
+        tenant_key = ",".join(sorted(str(t) for t in tenant_ids if str(t)))
+    return _cache_key("txn_rows", user_id, tenant_key or (tenant_id or ""), int(year))
+
+
+def _time_report_summary_key(user_id, year):
+    return _cache_key("timereport_summary", user_id, int(year))
+
+
+def _store_time_report_entry(key, year, value, *, version):
+    # Written beside the rows rather than through _cache_set: pages that
+    # only read the rows must not have derived entries in their ETag. The
+    # entry still gets a "ver:" key, so pages that read it are versioned.
+    cache.set_many(
+        {key: value, "ver:" + key: version or _data_version(value)},
+        _year_rows_timeout(year),
+    )
+    return value
+
+
+def _store_time_report_summary(user_id, year, rows, *, refreshed_at, version):
+    return _store_time_report_entry(
+        _time_report_summary_key(user_id, year),
+        year,
+        dict(_time_report_summary(rows), refreshed_at=refreshed_at),
+        version=version,
+    )
+
+
+def _time_report_rates_key(user_id, year):
+    return _cache_key("timereport_rates", user_id, int(year))
+
+
+def _store_time_report_rates(user_id, year, rows, *, refreshed_at, version):
+    sums = rates.hours_and_earnings(
+        rows, client_of=lambda r: _normalize_client_name(r.get("client_name") or "")
+    )
+    return _store_time_report_entry(
+        _time_report_rates_key(user_id, year),
+        year,
+        dict(sums, refreshed_at=refreshed_at),
+        version=version,
+    )
+
+
+def _time_report_client_index_key(user_id, year):
+    return _cache_key("timereport_clients", user_id, int(year))
+
+
+def _store_time_report_client_index(user_id, year, rows, *, version):
+    index = {"version": version, "months": _time_report_client_index(rows)}
+    return _store_time_report_entry(
+        _time_report_client_index_key(user_id, year), year, index, version=version
+    )
+
+
+def _store_time_report_derived(user_id, year, rows, *, refreshed_at, version):
+    for store in (_store_time_report_summary, _store_time_report_rates):
+        store(user_id, year, rows, refreshed_at=refreshed_at, version=version)
+    _store_time_report_client_index(user_id, year, rows, version=version)
+
+
+def _cached_time_report_year(request, token, year):
+    key = _time_report_year_key(request.user.id, year)
+    return _incremental_year_rows(
+        key,
+        year,
+        lambda s, e: (_fetch_time_report(token, _date_key(s), _date_key(e)), None),
+        lambda r: r.get("date") or "",
+        on_store=lambda rows, refreshed_at, version: _store_time_report_derived(
+            request.user.id, year, rows, refreshed_at=refreshed_at, version=version
+        ),
+    )
+
+
+def _cached_client_month_rows(request, token, year, month, client_name):
+    """Time report rows of one client in one month, found via the client index.
+
+    The index (month -> client -> row offsets) is written with the year
+    rows and carries their version; an index that does not match the rows
+    (missing, or left from an earlier refresh) is rebuilt from them.
+    """
+    rows = _cached_time_report_year(request, token, year)
+    version = cache.get("ver:" + _time_report_year_key(request.user.id, year))
+    index = _cache_get(_time_report_client_index_key(request.user.id, year))
+    if index is None or version is None or index["version"] != version:
+        index = _store_time_report_client_index(
+            request.user.id, year, rows, version=version
+        )
+    offsets = index["months"].get(int(month), {}).get(client_name) or []
+    return [rows[i] for i in offsets]
+
+
+def _cached_time_report_derived(request, token, year, key, store):
+    """An entry derived from a cached time report year, without its rows.
+
+    Derived entries are written next to the rows on every refresh with the
+    same refreshed_at and version, so they go stale together with them.
+    Only when one is missing (rows seeded, or cached before it existed) are
+    the rows read to build it.
+    """
+    entry = _cache_get(key)
+    if entry is not None and time.time() - entry["refreshed_at"] < CACHE_TTL_SECONDS:
+        return entry
+
+    seen = getattr(_data_versions, "seen", None)
+    tracked = dict(seen) if seen is not None else None
+    rows = _cached_time_report_year(request, token, year)
+    entry = cache.get(key)
+    if entry is None or time.time() - entry["refreshed_at"] >= CACHE_TTL_SECONDS:
+        rows_key = _time_report_year_key(request.user.id, year)
+        rows_entry = cache.get(rows_key) or {}
+        entry = store(
+            request.user.id,
+            year,
+            rows,
+            refreshed_at=rows_entry.get("refreshed_at") or time.time(),
+            version=cache.get("ver:" + rows_key),
+        )
+    if tracked is not None:
+        # The page depends on the derived entry, not on the rows behind it.
+        seen.clear()
+        seen.update(tracked)
+    _track_data_version(key)
+    return entry
+
+
+def _cached_time_report_summary(request, token, year):
+    """Totals of a cached time report year (see _time_report_summary)."""
+    return _cached_time_report_derived(
+        request,
+        token,
+        year,
+        _time_report_summary_key(request.user.id, year),
+        _store_time_report_summary,
+    )
+
+
+def _cached_time_report_rates(request, token, year, *, today=None):
+    """Effective hourly rates and utilization for a cached time report year."""
+    sums = _cached_time_report_derived(
+        request,
+        token,
+        year,
+        _time_report_rates_key(request.user.id, year),
+        _store_time_report_rates,
+    )
+    return rates.rate_report(sums, year=int(year), today=today)
+
+
+def _fetch_transaction_history_year_rows(*, token, tenant_id, tenant_ids, start, end):
+    rows, debug = fetch_transaction_history_rows(
+        token=token,
+        tenant_id=tenant_id,
+        tenant_ids=tenant_ids,
+        start_date=start,
+        end_date=end,
+        debug=True,
+    )
+    return (None if debug.get("failed") else rows), debug
+
+
+def _cached_transaction_history_entry(request, *, token, tenant_id, tenant_ids, year):
+    key = _transaction_history_year_key(
+        request.user.id, tenant_id=tenant_id, tenant_ids=tenant_ids, year=year
+    )
+    return _incremental_year_entry(
+        key,
+        year,
+        lambda s, e: _fetch_transaction_history_year_rows(
+            token=token, tenant_id=tenant_id, tenant_ids=tenant_ids, start=s, end=e
+        ),
+        _txn_row_date,
+    )
+
+
+def _cached_transaction_history_year(request, *, token, tenant_id, tenant_ids, year):
+    return _cached_transaction_history_entry(
+        request, token=token, tenant_id=tenant_id, tenant_ids=tenant_ids, year=year
+    )["rows"]
+
+
+def _transaction_history_windows(
+    request, *, token, tenant_id, tenant_ids=None, start_date, end_date, debugs=None
+):
+    """Yield the cached transaction rows in [start_date, end_date] one
+    calendar year at a time, so callers can stream long ranges.
+
+    Rows without a date cannot be placed in a range and are left out.
+    When `debugs` is a list, each year's fetch debug info is appended to it.
+    """
+    start_key = start_date.isoformat()
+    end_key = end_date.isoformat()
+    last_year = min(end_date.year, date.today().year)
+    for year in range(start_date.year, last_year + 1):
+        entry = _cached_transaction_history_entry(
+            request,
+            token=token,
+            tenant_id=tenant_id,
+            tenant_ids=tenant_ids,
+            year=year,
+        )
+        if debugs is not None:
+            debugs.append(dict(entry.get("debug") or {}, year=year))
+        window = []
+        for row in entry["rows"]:
+            d = _txn_row_date(row)
+            if d and start_key <= d <= end_key:
+                window.append(row)
+        yield window
+
+
+def _transaction_history_debug(debugs, rows):
+    """One debug dict for a range, from the per-year fetch debug infos."""
+    info = {
+        "endpoint": "transactionHistory/all",
+        "graphql_attempts": [],
+        "ace_ids": [],
+        "row_count": len(rows),
+        "sample_keys": list(rows[0].keys()) if rows else [],
+        "sample_row": rows[0] if rows else {},
+        "failed_years": [],
+    }
+    for d in debugs:
+        info["graphql_attempts"].extend(d.get("graphql_attempts") or [])
+        for ace_id in d.get("ace_ids") or []:
+            if ace_id not in info["ace_ids"]:
+                info["ace_ids"].append(ace_id)
+        if d.get("tenants"):
+            info.setdefault("tenants", []).extend(d["tenants"])
+        if d.get("failed"):
+            info["failed_years"].append(d["year"])
+    return info
+
+
+def _cached_transaction_history_rows(
+    request,
+    *,
+    token,
+    tenant_id,
+    tenant_ids=None,
+    start_date,
+    end_date,
+    debug=False,
+):
+    """Cached transaction rows in a date range; with debug=True returns
+    (rows, debug_info) built from the fetches that produced them."""
+    rows = []
+    debugs = []
+    for window in _transaction_history_windows(
+        request,
+        token=token,
+        tenant_id=tenant_id,
+        tenant_ids=tenant_ids,
+        start_date=start_date,
+        end_date=end_date,
+        debugs=debugs,
+    ):
+        rows.extend(window)
+    if debug:
+        return rows, _transaction_history_debug(debugs, rows)
+    return rows
+
+
+def _cached_earning_graph_annually(request, token, year, *, include_detail=True):
+    return earning_graph_annually(
+        token, year, request=request, include_detail=include_detail
+    )
 
 
 def _cached_earning_graph_monthly(request, token, year, month):
-    key = _cache_key("hourly_month", request.user.id, year, month)
-    cached = cache.get(key)
-    if cached is not None:
-        return cached
-    data = earning_graph_monthly(token, year, month)
-    cache.set(key, data, CACHE_TTL_SECONDS)
-    return data
+    return earning_graph_monthly(token, year, month, request=request)
 
 
 def _cached_timereport_year(request, token, year):
-    key = _cache_key("timereport_year", request.user.id, year)
-    cached = cache.get(key)
-    if cached is not None:
-        return cached
-    data = timereport_weekly(token, year)
-    cache.set(key, data, CACHE_TTL_SECONDS)
-    return data
+    return timereport_weekly(token, year, request=request)
 
 
 def _cached_fixed_price_transactions(
@@ -268,6 +1070,7 @@ def _cached_fixed_price_transactions(
     debug=False,
 ):
     if debug:
+        _track_untracked_data()
         return fetch_fixed_price_transactions(
             token=token,
             freelancer_reference=freelancer_reference,
@@ -289,7 +1092,7 @@ def _cached_fixed_price_transactions(
         _date_key(start_date),
         _date_key(end_date),
     )
-    cached = cache.get(key)
+    cached = _cache_get(key)
     if cached is not None:
         return cached
 
@@ -302,7 +1105,7 @@ def _cached_fixed_price_transactions(
         end_date=end_date,
         debug=debug,
     )
-    cache.set(key, rows, CACHE_TTL_SECONDS)
+    _cache_set(key, rows, CACHE_TTL_SECONDS)
     return rows
 
 
@@ -322,34 +1125,20 @@ def _cached_all_time_year_summary(
         freelancer_reference,
         year,
     )
-    cached = cache.get(key)
+    cached = _cache_get(key)
     if cached is not None:
         return cached
 
-    hourly_graph = _cached_earning_graph_annually(request, token, str(year))
-    hourly_total = float(hourly_graph.get("total_earning") or 0)
-    hourly_details = hourly_graph.get("detail_earning") or []
+    hourly = _cached_time_report_summary(request, token, year)
+    hourly_total = float(hourly["total_earning"] or 0)
 
     year_client_totals = defaultdict(float)
-    _accumulate_client_totals(year_client_totals, hourly_details)
+    for client, amount in hourly["client_totals"].items():
+        year_client_totals[client] += amount
 
-    unknown_rows = []
-    for d in hourly_details:
-        client = _client_from_detail(d)
-        if client != "Unknown" or _is_excluded_client_label(d, client):
-            continue
-        amt = _amount_from_detail(d)
-        if not amt:
-            continue
-        unknown_rows.append(
-            {
-                "year": year,
-                "source": "hourly",
-                "date": d.get("date") or "",
-                "description": d.get("description") or "",
-                "amount": amt,
-            }
-        )
+    unknown_rows = [
+        dict(d, year=year, source="hourly") for d in hourly["unknown_details"]
+    ]
 
     start_dt = date(year, 1, 1)
     end_dt = date(year, 12, 31)
@@ -388,10 +1177,228 @@ def _cached_all_time_year_summary(
         "client_totals": dict(year_client_totals),
         "unknown_rows": unknown_rows,
     }
-    cache.set(key, summary, ALL_TIME_CACHE_SECONDS)
+    _cache_set(key, summary, ALL_TIME_CACHE_SECONDS)
+    _update_all_time_rollup(
+        request.user.id,
+        tenant_id=tenant_id,
+        freelancer_reference=freelancer_reference,
+        summaries=[(year, summary)],
+    )
     return summary
 
 
+def _all_time_rollup_key(user_id, tenant_id, freelancer_reference):
+    return _cache_key("all_time_rollup", user_id, tenant_id or "", freelancer_reference)
+
+
+@timing.timed("aggregate")
+def _all_time_series(summaries):
+    """Precompute the all-time page series from [(year, summary)] pairs."""
+    years = []
+    totals = []
+    yearly_client_totals = []
+    client_totals = defaultdict(float)
+    unknown_rows = []
+    for y, summary in sorted(summaries, key=lambda item: int(item[0])):
+        year_totals = summary.get("client_totals") or {}
+        yearly_client_totals.append(year_totals)
+        for name, total in year_totals.items():
+            client_totals[name] += float(total or 0)
+        unknown_rows.extend(summary.get("unknown_rows") or [])
+        totals.append(
+            round(
+                float(summary.get("hourly_total") or 0)
+                + float(summary.get("fixed_total") or 0),
+                2,
+            )
+        )
+        years.append(int(y))
+
+    # Leading years without earnings are noise before the first contract.
+    first_idx = 0
+    for i, total in enumerate(totals):
+        if total > 0:
+            first_idx = i
+            break
+    years = years[first_idx:] or years
+    totals = totals[first_idx:] or totals
+    yearly_client_totals = yearly_client_totals[first_idx:] or yearly_client_totals
+
+    total_sum = sum(client_totals.values()) if client_totals else 0.0
+    client_rows = [
+        {
+            "name": name,
+            "total": float(total),
+            "percent": (float(total) / total_sum * 100.0) if total_sum else 0.0,
+        }
+        for name, total in sorted(
+            client_totals.items(), key=lambda x: x[1], reverse=True
+        )
+        if not _is_excluded_client_label({"description": name}, name)
+    ]
+
+    # Year-by-year cumulative pie data for animation (aligned with years).
+    # Ordering follows overall totals (client_rows) for stable slice ordering.
+    client_order = [r["name"] for r in client_rows]
+    cumulative = defaultdict(float)
+    yearly_pie = []
+    for year_totals in yearly_client_totals:
+        for name, total in year_totals.items():
+            if _is_excluded_client_label({"description": name}, name):
+                continue
+            cumulative[name] += float(total or 0)
+        points = []
+        for name in client_order:
+            val = float(cumulative.get(name) or 0)
+            if val > 0:
+                points.append({"name": name, "y": round(val, 2)})
+        yearly_pie.append(points)
+
+    return {
+        "years": years,
+        "totals": totals,
+        "client_rows": client_rows,
+        "yearly_client_pie": yearly_pie,
+        "unknown_rows": sorted(
+            unknown_rows, key=lambda row: abs(row.get("amount") or 0), reverse=True
+        ),
+    }
+
+
+def _fresh_rollup_years(rollup):
+    cutoff = time.time() - ALL_TIME_CACHE_SECONDS
+    return {
+        int(y): entry
+        for y, entry in ((rollup or {}).get("years") or {}).items()
+        if float(entry.get("stored_at") or 0) > cutoff
+    }
+
+
+def _update_all_time_rollup(user_id, *, tenant_id, freelancer_reference, summaries):
+    """Fold year summaries into the per-user all-time rollup.
+
+    The rollup keeps every year's summary plus the series derived from them,
+    so the all-time views read one entry instead of one per year. Each year
+    ages out on the same schedule as its own summary entry.
+    """
+    if not summaries:
+        return None
+    key = _all_time_rollup_key(user_id, tenant_id, freelancer_reference)
+    years = _fresh_rollup_years(cache.get(key))
+    now = time.time()
+    for y, summary in summaries:
+        years[int(y)] = {"summary": summary, "stored_at": now}
+    rollup = {
+        "years": years,
+        "series": _all_time_series([(y, e["summary"]) for y, e in years.items()]),
+    }
+    _cache_set(key, rollup, ALL_TIME_CACHE_SECONDS, version=_data_version(years))
+    return rollup
+
+
+def _cached_all_time_year_summaries(request, *, tenant_id, freelancer_reference, years):
+    """Return ([(year, summary)], missing_years, series) without fetching.
+
+    Reads the all-time rollup first; years it lacks (e.g. lost to a concurrent
+    rollup write) are looked up individually and folded back in.
+    """
+    key = _all_time_rollup_key(request.user.id, tenant_id, freelancer_reference)
+    rollup = _cache_get(key)
+    rollup_years = _fresh_rollup_years(rollup)
+
+    summaries = []
+    missing_years = []
+    repaired = []
+    for y in years:
+        entry = rollup_years.get(int(y))
+        if entry is not None:
+            summaries.append((y, entry["summary"]))
+            continue
+        summary_key = _cache_key(
+            "all_time_year",
+            request.user.id,
+            tenant_id or "",
+            freelancer_reference,
+            y,
+        )
+        summary = _cache_get(summary_key)
+        if summary is None:
+            missing_years.append(y)
+            continue
+        summaries.append((y, summary))
+        repaired.append((y, summary))
+
+    if repaired:
+        rollup = _update_all_time_rollup(
+            request.user.id,
+            tenant_id=tenant_id,
+            freelancer_reference=freelancer_reference,
+            summaries=repaired,
+        )
+
+    # The stored series is only reusable when it was built from exactly the
+    # years being shown (no expired or out-of-range years mixed in).
+    if rollup and set(rollup["years"]) == {int(y) for y, _ in summaries}:
+        series = rollup["series"]
+    else:
+        series = _all_time_series(summaries)
+    return summaries, missing_years, series
+
+
+def _cached_client_year_stats(request, *, token, tenant_id, tenant_ids, year):
+    """Per-client monthly earnings, hours and fees for one year.
+
+    Built from the cached time report and transaction history years and
+    tagged with their versions. Once stale the source rows are re-read
+    (refreshing them as usual) and the stats are only recomputed when one
+    of their versions changed.
+    """
+    tenant_key = ""
+    if tenant_ids:
+        tenant_key = ",".join(sorted(str(t) for t in tenant_ids if str(t)))
+    key = _cache_key(
+        "client_stats", request.user.id, tenant_key or (tenant_id or ""), int(year)
+    )
+    entry = _cache_get(key)
+    now = time.time()
+    if entry is not None and now - entry["refreshed_at"] < CACHE_TTL_SECONDS:
+        return entry["stats"]
+
+    time_rows = _cached_time_report_year(request, token, year)
+    txn_rows = _cached_transaction_history_year(
+        request, token=token, tenant_id=tenant_id, tenant_ids=tenant_ids, year=year
+    )
+    versions = [
+        cache.get("ver:" + _time_report_year_key(request.user.id, year))
+        or _data_version(time_rows),
+        cache.get(
+            "ver:"
+            + _transaction_history_year_key(
+                request.user.id, tenant_id=tenant_id, tenant_ids=tenant_ids, year=year
+            )
+        )
+        or _data_version(txn_rows),
+    ]
+    if entry is None or entry["versions"] != versions:
+        stats = client_analytics.client_year_stats(
+            time_rows,
+            [r for r in txn_rows if _is_txn_fee_row(r)],
+            time_client=lambda r: _normalize_client_name(
+                r.get("client_name") or "Unknown"
+            ),
+            fee_client=lambda r: _normalize_client_name(_extract_client_name(r)),
+            fee_date=_txn_row_date,
+        )
+    else:
+        stats = entry["stats"]
+    _cache_set(
+        key,
+        {"stats": stats, "versions": versions, "refreshed_at": now},
+        ALL_TIME_CACHE_SECONDS,
+    )
+    return stats
+
+
 def _cached_hourly_service_fees(
     request,
     *,
@@ -411,7 +1418,7 @@ def _cached_hourly_service_fees(
         _date_key(start_date),
         _date_key(end_date),
     )
-    cached = cache.get(key)
+    cached = _cache_get(key)
     if cached is not None:
         return cached
 
@@ -422,10 +1429,46 @@ def _cached_hourly_service_fees(
         start_date=start_date,
         end_date=end_date,
     )
-    cache.set(key, rows, CACHE_TTL_SECONDS)
+    _cache_set(key, rows, CACHE_TTL_SECONDS)
     return rows
 
 
+def _cached_service_fee_history(
+    request,
+    *,
+    token,
+    tenant_id,
+    tenant_ids=None,
+    start_date,
+    end_date,
+):
+    tenant_key = ""
+    if tenant_ids:
+        tenant_key = ",".join(sorted(str(t) for t in tenant_ids if str(t)))
+    key = _cache_key(
+        "service_fee",
+        request.user.id,
+        tenant_key or (tenant_id or ""),
+        _date_key(start_date),
+        _date_key(end_date),
+    )
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached["rows"], cached["debug"]
+
+    rows, debug_info = fetch_service_fee_history(
+        token=token,
+        tenant_id=tenant_id,
+        tenant_ids=tenant_ids,
+        start_date=start_date,
+        end_date=end_date,
+        debug=True,
+    )
+    rows = rows or []
+    _cache_set(key, {"rows": rows, "debug": debug_info}, CACHE_TTL_SECONDS)
+    return rows, debug_info
+
+
 def _service_fee_summary(
     request,
     *,
@@ -434,20 +1477,16 @@ def _service_fee_summary(
     include_rows=False,
     debug=False,
 ):
-    result = fetch_service_fee_history(
+    rows, debug_info = _cached_service_fee_history(
+        request,
         token=request.session.get("token"),
         tenant_id=request.session.get("tenant_id"),
         tenant_ids=request.session.get("tenant_ids"),
         start_date=start_date,
         end_date=end_date,
-        debug=debug,
     )
-    if debug:
-        rows, debug_info = result
-    else:
-        rows = result
+    if not debug:
         debug_info = None
-    rows = rows or []
     rows.sort(key=lambda x: x.get("date") or x.get("occurred_at") or "")
     for row in rows:
         row["display_date"] = _display_date_str(
@@ -515,6 +1554,47 @@ def _is_txn_fixed_bonus_context(row) -> bool:
     return False
 
 
+TXN_EXPORT_FIELDS = (
+    "date",
+    "effective_date",
+    "category",
+    "client",
+    "kind",
+    "subtype",
+    "description",
+    "amount",
+    "currency",
+)
+
+
+def _txn_category(row) -> str:
+    """Bucket of a transaction row, as total_earning_graph_trx counts it."""
+    if _is_txn_earning_row(row):
+        return "earning"
+    if _is_txn_fee_row(row):
+        return "service_fee"
+    if _is_txn_connects_row(row):
+        return "connects"
+    if _is_txn_membership_row(row):
+        return "membership"
+    return "other"
+
+
+def _txn_export_row(row):
+    effective = _effective_txn_date_any(row)
+    return {
+        "date": _txn_row_date(row),
+        "effective_date": effective.isoformat() if effective else "",
+        "category": _txn_category(row),
+        "client": _normalize_client_name(row.get("client_name") or "Unknown"),
+        "kind": row.get("kind") or "",
+        "subtype": row.get("subtype") or "",
+        "description": row.get("description_ui") or row.get("description") or "",
+        "amount": float(row.get("amount") or 0),
+        "currency": row.get("currency") or "",
+    }
+
+
 def _parse_txn_date(row) -> date | None:
     raw = row.get("date") or row.get("occurred_at")
     if not raw:
@@ -531,18 +1611,18 @@ def _parse_txn_date(row) -> date | None:
 def _parse_txn_work_range(row) -> tuple[date | None, date | None]:
     text = f"{row.get('description_ui') or ''} {row.get('description') or ''}"
     patterns = [
-        (r"(\\d{2}/\\d{2}/\\d{4})\\s*-\\s*(\\d{2}/\\d{2}/\\d{4})", ["%m/%d/%Y"]),
-        (r"(\\d{4}-\\d{2}-\\d{2})\\s*-\\s*(\\d{4}-\\d{2}-\\d{2})", ["%Y-%m-%d"]),
+        (r"(\d{2}/\d{2}/\d{4})\s*-\s*(\d{2}/\d{2}/\d{4})", ["%m/%d/%Y"]),
+        (r"(\d{4}-\d{2}-\d{2})\s*-\s*(\d{4}-\d{2}-\d{2})", ["%Y-%m-%d"]),
         (
-            r"([A-Za-z]{3,9}\\s+\\d{1,2},\\s+\\d{4})\\s*-\\s*([A-Za-z]{3,9}\\s+\\d{1,2},\\s+\\d{4})",
+            r"([A-Za-z]{3,9}\s+\d{1,2},\s+\d{4})\s*-\s*([A-Za-z]{3,9}\s+\d{1,2},\s+\d{4})",
             ["%b %d, %Y", "%B %d, %Y"],
         ),
         (
-            r"(\\d{1,2}\\s+[A-Za-z]{3,9}\\s+\\d{4})\\s*-\\s*(\\d{1,2}\\s+[A-Za-z]{3,9}\\s+\\d{4})",
+            r"(\d{1,2}\s+[A-Za-z]{3,9}\s+\d{4})\s*-\s*(\d{1,2}\s+[A-Za-z]{3,9}\s+\d{4})",
             ["%d %b %Y", "%d %B %Y"],
         ),
         (
-            r"(\\d{2}-[A-Za-z]{3}-\\d{4})\\s*-\\s*(\\d{2}-[A-Za-z]{3}-\\d{4})",
+            r"(\d{2}-[A-Za-z]{3}-\d{4})\s*-\s*(\d{2}-[A-Za-z]{3}-\d{4})",
             ["%d-%b-%Y"],
         ),
     ]
@@ -636,40 +1716,30 @@ def _month_week_ranges(year: int, month: int):
     return ranges
 
 
-def earning_graph_annually(token, year):
-    client = upwork_client.get_client(token)
+# Every field the hourly, earnings and time-report views need, so one
+# timeReport pull per (user, year) serves all of them.
+TIME_REPORT_FIELDS = """
+    dateWorkedOn
+    totalCharges
+    totalHoursWorked
+    memo
+    contract {
+        offer {
+            client { name }
+        }
+    }
+"""
 
-    list_month = [
-        "Jan",
-        "Feb",
-        "Mar",
-        "Apr",
-        "May",
-        "Jun",
-        "Jul",
-        "Aug",
-        "Sep",
-        "Oct",
-        "Nov",
-        "Dec",
-    ]
 
-    start_date = f"{year}0101"
-    end_date = f"{year}1231"
+def _fetch_time_report(token, start_date, end_date):
+    client = upwork_client.get_client(token)
 
     query = """query User {
         user {
             freelancerProfile {
                 user {
                     timeReport(timeReportDate_bt: { rangeStart: "%s", rangeEnd: "%s" }) {
-                        dateWorkedOn
-                        totalCharges
-                        memo
-                        contract {
-                            offer {
-                                client { name }
-                            }
-                        }
+                        %s
                     }
                 }
             }
@@ -677,40 +1747,152 @@ def earning_graph_annually(token, year):
     }""" % (
         start_date,
         end_date,
+        TIME_REPORT_FIELDS,
     )
 
     response = graphql.Api(client).execute({"query": query})
-    rows = response["data"]["user"]["freelancerProfile"]["user"]["timeReport"]
+    rows = _dig(response, ("data", "user", "freelancerProfile", "user", "timeReport"))
+    if not isinstance(rows, list):
+        errors = response.get("errors") if isinstance(response, dict) else None
+        raise UpworkGraphQLError("timeReport: %s" % (errors or "no data"))
+    return [_time_report_row(r) for r in rows]
 
-    month_totals = {i: 0.0 for i in range(1, 13)}
-    total_earning = 0.0
+
+def _time_report_row(r):
+    client_name = (
+        ((r.get("contract") or {}).get("offer") or {}).get("client") or {}
+    ).get("name") or "Unknown"
+    return {
+        "date": r["dateWorkedOn"],
+        "charges": r.get("totalCharges") or 0,
+        "hours": float(r.get("totalHoursWorked") or 0),
+        "memo": r.get("memo") or "",
+        "client_name": client_name,
+    }
+
+
+def _time_report_year_rows(token, year, request=None):
+    if request is not None:
+        return _cached_time_report_year(request, token, year)
+    _track_untracked_data()
+    return _fetch_time_report(token, f"{year}0101", f"{year}1231")
+
+
+def earning_graph_annually(token, year, request=None, include_detail=True):
+    """Monthly earnings chart for a year.
+
+    With include_detail=False only the cached year summary is read and
+    detail_earning is left empty; client totals come from the summary.
+    """
+    if request is None:
+        _track_untracked_data()
+        return _annual_graph_from_rows(
+            _fetch_time_report(token, f"{year}0101", f"{year}1231"), year
+        )
+    summary = _cached_time_report_summary(request, token, year)
     detail = []
+    if include_detail:
+        detail = _annual_detail_from_rows(
+            _cached_time_report_year(request, token, year)
+        )
+    return _annual_graph(summary, year, detail)
 
-    for r in rows:
-        dt = datetime.strptime(r["dateWorkedOn"], "%Y-%m-%d").date()
-        amt = float((r.get("totalCharges") or 0) or 0)
 
-        month_totals[dt.month] += amt
+def _time_report_detail(r, dt):
+    return {
+        "date": _display_date(dt, fallback=r["date"]),
+        "month": str(dt.month),
+        "amount": r["charges"],
+        "description": f"{r['client_name']} - {r['memo']}",
+        "client_name": r["client_name"],
+    }
+
+
+@timing.timed("aggregate")
+def _time_report_summary(rows):
+    month_totals = [0.0] * 12
+    total_earning = 0.0
+    client_totals = defaultdict(float)
+    unknown_details = []
+
+    for r in rows:
+        dt = datetime.strptime(r["date"], "%Y-%m-%d").date()
+        amt = float(r["charges"] or 0)
+        month_totals[dt.month - 1] += amt
         total_earning += amt
 
-        client_name = (
-            ((r.get("contract") or {}).get("offer") or {}).get("client") or {}
-        ).get("name") or "Unknown"
+        d = _time_report_detail(r, dt)
+        client = _client_from_detail(d)
+        if _is_excluded_client_label(d, client):
+            continue
+        client_totals[client] += _amount_from_detail(d)
+        if client == "Unknown" and _amount_from_detail(d):
+            unknown_details.append(
+                {
+                    "date": d["date"],
+                    "description": d["description"],
+                    "amount": _amount_from_detail(d),
+                }
+            )
 
-        memo = r.get("memo") or ""
-        detail.append(
-            {
-                "date": _display_date(dt, fallback=r["dateWorkedOn"]),
-                "month": str(dt.month),
-                "amount": r.get("totalCharges") or 0,
-                "description": f"{client_name} - {memo}",
-                "client_name": client_name,
-            }
-        )
+    return {
+        "month_totals": month_totals,
+        "total_earning": total_earning,
+        "client_totals": dict(client_totals),
+        "unknown_details": unknown_details,
+    }
 
-    report = [{"y": round(month_totals[i], 2), "month": str(i)} for i in range(1, 13)]
 
-    total_earning = round(total_earning, 2)
+@timing.timed("aggregate")
+def _time_report_client_index(rows):
+    """{month: {client: [row offsets]}} for a year of time report rows."""
+    index = defaultdict(lambda: defaultdict(list))
+    for offset, r in enumerate(rows):
+        try:
+            month = datetime.strptime(r["date"], "%Y-%m-%d").month
+        except Exception:
+            continue
+        client = _normalize_client_name(r.get("client_name") or "Unknown")
+        index[month][client].append(offset)
+    return {month: dict(clients) for month, clients in index.items()}
+
+
+@timing.timed("aggregate")
+def _annual_detail_from_rows(rows):
+    detail = []
+    for r in rows:
+        dt = datetime.strptime(r["date"], "%Y-%m-%d").date()
+        detail.append(_time_report_detail(r, dt))
+    return detail
+
+
+def _annual_graph_from_rows(rows, year):
+    return _annual_graph(
+        _time_report_summary(rows), year, _annual_detail_from_rows(rows)
+    )
+
+
+def _annual_graph(summary, year, detail):
+    list_month = [
+        "Jan",
+        "Feb",
+        "Mar",
+        "Apr",
+        "May",
+        "Jun",
+        "Jul",
+        "Aug",
+        "Sep",
+        "Oct",
+        "Nov",
+        "Dec",
+    ]
+    report = [
+        {"y": round(total, 2), "month": str(i)}
+        for i, total in enumerate(summary["month_totals"], start=1)
+    ]
+
+    total_earning = round(summary["total_earning"], 2)
     tooltip = "'<b>'+this.x+'</b><br/>'+this.series.name+': $ '+this.y"
 
     return {
@@ -718,6 +1900,7 @@ def earning_graph_annually(token, year):
         "x_axis": list_month,
         "report": report,
         "detail_earning": detail,
+        "client_totals": dict(summary["client_totals"]),
         "total_earning": total_earning,
         "charity": round(total_earning * 0.025, 2),
         "title": "Year : %s ($ %s)" % (year, total_earning),
@@ -725,57 +1908,39 @@ def earning_graph_annually(token, year):
     }
 
 
-def earning_graph_monthly(token, year, month):
-    client = upwork_client.get_client(token)
+def earning_graph_monthly(token, year, month, request=None):
+    if request is not None:
+        # Week buckets are clipped to the month, so the cached year already
+        # holds every row a month needs; no adjacent-year days are required.
+        rows = _cached_time_report_year(request, token, year)
+        return _monthly_graph_from_rows(rows, year, month)
 
-    year_str = str(year)
-    month_str = f"{month:02d}"
     count_day = monthrange(year, month)[1]
     first_day = date(year, month, 1)
     last_day = date(year, month, count_day)
     # Query a padded range and filter by dateWorkedOn to avoid missing edge data.
     query_start = first_day - timedelta(days=7)
     query_end = last_day + timedelta(days=7)
-    start_date = query_start.strftime("%Y%m%d")
-    end_date = query_end.strftime("%Y%m%d")
-
-    query = """query User {
-            user {
-                freelancerProfile {
-                    user {
-                        timeReport(timeReportDate_bt: { rangeStart: "%s", rangeEnd: "%s" }) {
-                            dateWorkedOn
-                            totalCharges
-                            memo
-                            contract {
-                                offer {
-                                    client {
-                                        name
-                                    }
-                                }
-                            }
-                        }
-                    }
-                }
-            }
-        }
-    """ % (
-        start_date,
-        end_date,
+    _track_untracked_data()
+    rows = _fetch_time_report(
+        token, query_start.strftime("%Y%m%d"), query_end.strftime("%Y%m%d")
     )
+    return _monthly_graph_from_rows(rows, year, month)
 
-    response = graphql.Api(client).execute({"query": query})
 
-    earning_report = response["data"]["user"]["freelancerProfile"]["user"]["timeReport"]
-    filtered_report = []
-    for r in earning_report:
+@timing.timed("aggregate")
+def _monthly_graph_from_rows(rows, year, month):
+    year_str = str(year)
+    month_str = f"{month:02d}"
+
+    earning_report = []
+    for r in rows:
         try:
-            d = datetime.strptime(r["dateWorkedOn"], "%Y-%m-%d").date()
+            d = datetime.strptime(r["date"], "%Y-%m-%d").date()
         except Exception:
             continue
         if d.year == year and d.month == month:
-            filtered_report.append(r)
-    earning_report = filtered_report
+            earning_report.append((d, r))
 
     week_ranges = _month_week_ranges(year, month)
     x_axis = [wlabel for (wlabel, _, _) in week_ranges]
@@ -784,24 +1949,19 @@ def earning_graph_monthly(token, year, month):
     list_report = []
     total_earning = 0.0
 
-    for m in earning_report:
-        d = datetime.strptime(m["dateWorkedOn"], "%Y-%m-%d").date()
-        amt = float(m["totalCharges"])
+    for d, m in earning_report:
+        amt = float(m["charges"] or 0)
 
         for wlabel, ws, we in week_ranges:
             if ws <= d <= we:
                 week_totals[wlabel] += amt
-                contract = m.get("contract") or {}
-                client_name = ((contract.get("offer") or {}).get("client") or {}).get(
-                    "name"
-                ) or "Unknown"
                 list_report.append(
                     {
-                        "date": _display_date(d, fallback=m["dateWorkedOn"]),
+                        "date": _display_date(d, fallback=m["date"]),
                         "week": wlabel,
-                        "amount": m["totalCharges"],
-                        "description": "%s - %s" % (client_name, m["memo"]),
-                        "client_name": client_name,
+                        "amount": m["charges"],
+                        "description": "%s - %s" % (m["client_name"], m["memo"]),
+                        "client_name": m["client_name"],
                     }
                 )
                 break
@@ -827,67 +1987,48 @@ def earning_graph_monthly(token, year, month):
     return data
 
 
-def timereport_weekly(token, year):
-    client = upwork_client.get_client(token)
-    current_week = datetime.now().isocalendar()[1] - 1
-    if current_week == 0:
-        current_week = 1
+def timereport_weekly(token, year, request=None):
+    rows = _time_report_year_rows(token, year, request=request)
+    return _weekly_hours_from_rows(rows, year)
+
+
+@timing.timed("aggregate")
+def _weekly_hours_from_rows(rows, year):
     last_week = datetime.strptime("%s1231" % year, "%Y%m%d").isocalendar()[1]
     if last_week == 1:
         last_week = 52
     list_week = [str(i) for i in range(1, last_week + 1)]
-    query = """query User {
-            user {
-                freelancerProfile {
-                    user {
-                        timeReport(timeReportDate_bt: { rangeStart: "%s0101", rangeEnd: "%s1231" }) {
-                            dateWorkedOn
-                            totalHoursWorked
-                            contract {
-                                offer {
-                                    client { name }
-                                }
-                            }
-                        }
-                    }
-                }
-            }
-        }
-    """ % (
-        year,
-        year,
-    )
-    response = graphql.Api(client).execute({"query": query})
 
     weeks = {}
     total_hours = 0.0
     weekly_report = []
-    earning_report = response["data"]["user"]["freelancerProfile"]["user"]["timeReport"]
     per_client = defaultdict(float)
     min_date = None
     max_date = None
     raw_total_hours = 0.0
-    for m in earning_report:
+    for m in rows:
         try:
-            d = datetime.strptime(m["dateWorkedOn"], "%Y-%m-%d").date()
+            d = datetime.strptime(m["date"], "%Y-%m-%d").date()
             if min_date is None or d < min_date:
                 min_date = d
             if max_date is None or d > max_date:
                 max_date = d
         except Exception:
             d = None
-        week_num = datetime.strptime(m["dateWorkedOn"], "%Y-%m-%d").isocalendar()[1]
-        raw_total_hours += float(m.get("totalHoursWorked") or 0)
-        if weeks.get(week_num):
-            weeks[week_num].append(m["totalHoursWorked"])
-        else:
-            weeks[week_num] = [m["totalHoursWorked"]]
-        client_name = (
-            ((m.get("contract") or {}).get("offer") or {}).get("client") or {}
-        ).get("name") or "Unknown"
-        per_client[_normalize_client_name(client_name)] += float(
-            m.get("totalHoursWorked") or 0
-        )
+        week_num = datetime.strptime(m["date"], "%Y-%m-%d").isocalendar()[1]
+        raw_total_hours += m["hours"]
+        weeks.setdefault(week_num, []).append(m["hours"])
+        per_client[_normalize_client_name(m["client_name"])] += m["hours"]
+
+    selected_year = int(year)
+    today = date.today()
+    if selected_year == today.year:
+        divisor_week = today.isocalendar()[1]
+    else:
+        divisor_week = last_week
+    if divisor_week < 1:
+        divisor_week = 1
+
     for week in list_week:
         if weeks.get(int(week)):
             hours = sum(weeks.get(int(week)))
@@ -896,18 +2037,7 @@ def timereport_weekly(token, year):
         total_hours += hours
         weekly_report.append(hours)
 
-        selected_year = int(year)
-        today = date.today()
-
-        if selected_year == today.year:
-            divisor_week = today.isocalendar()[1]
-        else:
-            divisor_week = last_week
-
-        if divisor_week < 1:
-            divisor_week = 1
-
-        avg_week = round(total_hours / divisor_week, 1)
+    avg_week = round(total_hours / divisor_week, 1)
 
     work_status = "success"
     if avg_week < 20:
@@ -924,7 +2054,6 @@ def timereport_weekly(token, year):
         [{"name": r["name"], "y": float(r["total"])} for r in client_rows if r["total"]]
     )
 
-    total_hours = round(total_hours, 2)
     total_hours = round(total_hours, 2)
     raw_total_hours = round(raw_total_hours, 2)
     data = {
@@ -938,7 +2067,7 @@ def timereport_weekly(token, year):
         "tooltip": tooltip,
         "client_rows": client_rows,
         "client_pie_data": client_pie_data,
-        "row_count": len(earning_report),
+        "row_count": len(rows),
         "raw_total_hours": raw_total_hours,
         "min_date": min_date.isoformat() if min_date else None,
         "max_date": max_date.isoformat() if max_date else None,
@@ -966,6 +2095,16 @@ def _profile_key_from_url(url):
     return None
 
 
+def _session_freelancer_reference(request):
+    return (
+        request.session.get("freelancer_reference")
+        or _profile_key_from_url(
+            (request.session.get("upwork_auth") or {}).get("profile_url")
+        )
+        or request.user.username
+    )
+
+
 def _extract_client_name(detail):
     def dget(k):
         return _get(detail, k, None)
@@ -1045,6 +2184,15 @@ def _accumulate_client_totals(client_totals, details):
         client_totals[client] += amount
 
 
+def _accumulate_graph_client_totals(client_totals, graph):
+    """Client totals of a graph, from its summary totals when it has them."""
+    if "client_totals" in graph:
+        for client, amount in graph["client_totals"].items():
+            client_totals[client] += amount
+    else:
+        _accumulate_client_totals(client_totals, graph.get("detail_earning") or [])
+
+
 def _amount_from_detail(detail) -> float:
     raw = _get(detail, "amount", 0) or 0
     s = str(raw).replace("$", "").replace(",", "").strip()
@@ -1054,6 +2202,87 @@ def _amount_from_detail(detail) -> float:
         return 0.0
 
 
+def _period_bounds(year, month=None):
+    year = int(year)
+    if month:
+        return date(year, int(month), 1), date(
+            year, int(month), monthrange(year, int(month))[1]
+        )
+    return date(year, 1, 1), date(year, 12, 31)
+
+
+def _detail_row(occurred, client, description, amount):
+    occurred = str(occurred or "")[:10]
+    return {
+        "date": occurred,
+        "display_date": _display_date_str(occurred) or occurred,
+        "client": client,
+        "description": description,
+        "amount": amount,
+    }
+
+
+def _hourly_detail_rows(request, token, year, month=None):
+    """Detail rows for paginate_details, read from the cached year rows."""
+    prefix = "%04d-%02d" % (int(year), int(month)) if month else "%04d" % int(year)
+    details = []
+    for r in _cached_time_report_year(request, token, year):
+        if not str(r.get("date") or "").startswith(prefix):
+            continue
+        description = f"{r['client_name']} - {r['memo']}"
+        client = _client_from_detail(
+            {"client_name": r["client_name"], "description": description}
+        )
+        details.append(
+            _detail_row(r["date"], client, description, float(r["charges"] or 0))
+        )
+    return details
+
+
+def _fixed_detail_rows(
+    request,
+    *,
+    token,
+    tenant_id,
+    tenant_ids,
+    freelancer_reference,
+    year,
+    month=None,
+):
+    """Detail rows for paginate_details from the cached fixed-price rows."""
+    start_dt, end_dt = _period_bounds(year, month)
+    rows = _cached_fixed_price_transactions(
+        request,
+        token=token,
+        freelancer_reference=freelancer_reference,
+        tenant_id=tenant_id,
+        tenant_ids=tenant_ids,
+        start_date=start_dt,
+        end_date=end_dt,
+    )
+    return _fixed_rows_as_details(rows)
+
+
+def _fixed_rows_as_details(rows):
+    details = []
+    for r in rows:
+        amt = float(r.get("amount") or 0.0)
+        if amt == 0:
+            continue
+        client = _normalize_client_name(
+            r.get("client_name") or r.get("client") or "Unknown"
+        )
+        details.append(
+            _detail_row(
+                r.get("occurred_at"),
+                client,
+                f'{client} - {r.get("description") or ""}',
+                amt,
+            )
+        )
+    return details
+
+
 def _build_total_earning_data(
     request, token, tenant_id, year, month=None, include_detail=False
 ):
@@ -1062,7 +2291,9 @@ def _build_total_earning_data(
             request, token, int(year), int(month)
         )
     else:
-        hourly_graph = _cached_earning_graph_annually(request, token, str(year))
+        hourly_graph = _cached_earning_graph_annually(
+            request, token, str(year), include_detail=include_detail
+        )
 
     start_dt = date(int(year), 1, 1)
     end_dt = date(int(year), 12, 31)
@@ -1109,7 +2340,7 @@ def _build_total_earning_data(
         fixed_total += amt
 
     client_totals = defaultdict(float)
-    _accumulate_client_totals(client_totals, hourly_graph.get("detail_earning") or [])
+    _accumulate_graph_client_totals(client_totals, hourly_graph)
     for f in fixed_clean:
         client = _client_from_fixed(f)
         if _is_excluded_client_label(f, client):
@@ -1261,10 +2492,6 @@ def earning_graph(request):
         totals = defaultdict(float)
         _accumulate_client_totals(totals, details)
 
-        for d in details:
-            client_name = _normalize_client_name(_extract_client_name(d))
-            d["client"] = client_name
-
         data["client_rows"] = [
             {"name": name, "total": float(total)}
             for name, total in sorted(totals.items(), key=lambda x: x[1], reverse=True)
@@ -1278,6 +2505,12 @@ def earning_graph(request):
             ]
         )
         if graph_obj.get("month"):
+            data["detail_page"] = paginate_details(
+                _hourly_detail_rows(request, request.session["token"], year, month)
+            )
+            data["detail_url"] = reverse(
+                "api_hourly_month_details", args=[int(year), int(month)]
+            )
             start_dt = date(int(year), int(month), 1)
             end_dt = date(int(year), int(month), monthrange(int(year), int(month))[1])
             fee_rows, fee_total, _fee_debug = _service_fee_summary(
@@ -1312,6 +2545,7 @@ def earning_graph(request):
         return redirect("auth")
 
 
+@conditional_report
 def total_earning_graph(request, year=None):
     data = {"page_title": "Total Earning"}
     data["service_fee_total"] = 0.0
@@ -1342,12 +2576,26 @@ def total_earning_graph(request, year=None):
             tenant_id=tenant_id,
             year=year,
             month=month,
-            include_detail=bool(month),
         )
         data["graph"] = graph
         data["client_rows"] = client_rows
         data["client_pie_data"] = client_pie_data
         if month:
+            data["detail_page"] = paginate_details(
+                _hourly_detail_rows(request, token, year, month)
+                + _fixed_detail_rows(
+                    request,
+                    token=token,
+                    tenant_id=tenant_id,
+                    tenant_ids=request.session.get("tenant_ids"),
+                    freelancer_reference=_session_freelancer_reference(request),
+                    year=year,
+                    month=month,
+                )
+            )
+            data["detail_url"] = reverse(
+                "api_earnings_month_details", args=[int(year), int(month)]
+            )
             start_dt = date(int(year), int(month), 1)
             end_dt = date(int(year), int(month), monthrange(int(year), int(month))[1])
             fee_rows, fee_total, fee_debug = _service_fee_summary(
@@ -1374,36 +2622,25 @@ def total_earning_graph(request, year=None):
             data["service_fee_debug"] = fee_debug
     except Exception as exc:
         messages.warning(request, f"Upwork API error: {exc}")
-        data["graph"] = _cached_earning_graph_annually(request, token, str(year))
+        data["graph"] = _cached_earning_graph_annually(
+            request, token, str(year), include_detail=False
+        )
         data["client_rows"] = []
         data["client_pie_data"] = json.dumps([])
 
-    return render(request, "upworkapi/total_earning.html", data)
+    return TemplateResponse(request, "upworkapi/total_earning.html", data)
 
 
-def total_earning_graph_trx(request):
-    data = {"page_title": "Total Earning"}
+def _build_transaction_earning_data(
+    request, *, token, year, month=None, net_view=False
+):
+    data = {}
     data["service_fee_total"] = 0.0
     data["service_fee_rows"] = []
     data["membership_rows"] = []
     data["connect_rows"] = []
     data["membership_total"] = 0.0
-    data["connect_total"] = 0.0
-
-    year = (
-        request.GET.get("year") or request.POST.get("year") or str(datetime.now().year)
-    )
-    month = request.POST.get("month")
-    net_view = request.GET.get("net") == "1" or request.POST.get("net") == "1"
-
-    if not re.match(r"^\d{4}$", str(year)):
-        messages.warning(request, "Wrong year format.!")
-        return redirect("total_earning_graph")
-
-    token = request.session.get("token")
-    if not token:
-        messages.warning(request, "Missing token. Please login again.")
-        return redirect("auth")
+    data["connect_total"] = 0.0
 
     if month:
         start_dt = date(int(year), int(month), 1)
@@ -1416,7 +2653,8 @@ def total_earning_graph_trx(request):
         query_start_dt = start_dt
         query_end_dt = end_dt
 
-    rows, debug_info = fetch_transaction_history_rows(
+    rows, debug_info = _cached_transaction_history_rows(
+        request,
         token=token,
         tenant_id=request.session.get("tenant_id"),
         tenant_ids=request.session.get("tenant_ids"),
@@ -1424,7 +2662,6 @@ def total_earning_graph_trx(request):
         end_date=query_end_dt,
         debug=True,
     )
-    rows = rows or []
 
     earning_rows = [r for r in rows if _is_txn_earning_row(r)]
     fee_rows = [r for r in rows if _is_txn_fee_row(r)]
@@ -1704,10 +2941,38 @@ def total_earning_graph_trx(request):
         ]
     )
 
-    return render(request, "upworkapi/total_earning_trx.html", data)
+    return data
+
+
+@conditional_report
+def total_earning_graph_trx(request):
+    data = {"page_title": "Total Earning"}
+
+    year = (
+        request.GET.get("year") or request.POST.get("year") or str(datetime.now().year)
+    )
+    month = request.POST.get("month")
+    net_view = request.GET.get("net") == "1" or request.POST.get("net") == "1"
+
+    if not re.match(r"^\d{4}$", str(year)):
+        messages.warning(request, "Wrong year format.!")
+        return redirect("total_earning_graph")
+
+    token = request.session.get("token")
+    if not token:
+        messages.warning(request, "Missing token. Please login again.")
+        return redirect("auth")
+
+    data.update(
+        _build_transaction_earning_data(
+            request, token=token, year=year, month=month, net_view=net_view
+        )
+    )
+    return TemplateResponse(request, "upworkapi/total_earning_trx.html", data)
 
 
 @login_required(login_url="/")
+@conditional_report
 def all_time_earning_graph(request):
     data = {"page_title": "All Time Earning"}
     data["service_fee_total"] = 0.0
@@ -1719,27 +2984,18 @@ def all_time_earning_graph(request):
         return redirect("auth")
 
     cache_key = _cache_key("all_time_earning_v3", request.user.id, tenant_id or "")
-    cached = cache.get(cache_key)
+    cached = _cache_get(cache_key)
     if cached is not None:
-        return render(request, "upworkapi/all_time_earning.html", cached)
+        return TemplateResponse(request, "upworkapi/all_time_earning.html", cached)
 
     current_year = datetime.now().year
     years = []
     start_year = 2010
 
-    totals = []
-    client_totals = defaultdict(float)
-    yearly_client_totals = []
-    unknown_rows = []
+    series = _all_time_series([])
     missing_years = []
     try:
-        freelancer_reference = (
-            request.session.get("freelancer_reference")
-            or _profile_key_from_url(
-                (request.session.get("upwork_auth") or {}).get("profile_url")
-            )
-            or request.user.username
-        )
+        freelancer_reference = _session_freelancer_reference(request)
         start_year = _cached_upwork_join_year(
             request,
             token=token,
@@ -1748,81 +3004,48 @@ def all_time_earning_graph(request):
         )
         years = list(range(int(start_year), current_year + 1))
 
-        available_years = []
-
-        for y in years:
-            summary_key = _cache_key(
-                "all_time_year",
-                request.user.id,
-                tenant_id or "",
-                freelancer_reference,
-                y,
-            )
-            summary = cache.get(summary_key)
-            if summary is None:
-                missing_years.append(y)
-                continue
-
-            year_totals = summary.get("client_totals") or {}
-            yearly_client_totals.append({"year": y, "client_totals": year_totals})
-            for name, total in year_totals.items():
-                client_totals[name] += float(total or 0)
-            unknown_rows.extend(summary.get("unknown_rows") or [])
-            totals.append(
-                round(
-                    float(summary.get("hourly_total") or 0)
-                    + float(summary.get("fixed_total") or 0),
-                    2,
-                )
-            )
-            available_years.append(y)
+        _summaries, missing_years, series = _cached_all_time_year_summaries(
+            request,
+            tenant_id=tenant_id,
+            freelancer_reference=freelancer_reference,
+            years=years,
+        )
 
         # If the cache is cold, don't block the request doing multi-year Upwork
         # calls (Cloudflare/Gunicorn will time out). Warm missing years in the
         # background and show partial data while it loads.
         if missing_years:
-            user_id = request.user.id
             _warm_all_time_years_async(
-                user_id=user_id,
+                user_id=request.user.id,
                 token=token,
                 tenant_id=tenant_id,
                 tenant_ids=request.session.get("tenant_ids"),
                 freelancer_reference=freelancer_reference,
                 years=list(missing_years),
             )
-            progress_key = _cache_key(
-                "all_time_warm_progress", user_id, tenant_id or "", freelancer_reference
+            status = _all_time_warm_status(
+                request.user.id, tenant_id, freelancer_reference
             )
-            progress = cache.get(progress_key) or {}
-            done = int(progress.get("done") or 0)
-            total = int(progress.get("total") or len(missing_years))
-            data["warm_progress"] = {"done": done, "total": total}
-            data["is_warming"] = True
-            messages.info(
-                request,
-                "All-time data is warming up (%s/%s). This page will auto-refresh."
-                % (done, total),
-            )
-            years = available_years or years
-        else:
-            years = available_years or years
+            if status["warming"]:
+                done = status["done"]
+                total = status["total"] or len(missing_years)
+                data["warm_progress"] = {"done": done, "total": total}
+                data["is_warming"] = True
+                messages.info(
+                    request,
+                    "All-time data is warming up (%s/%s). "
+                    "This page will refresh when ready." % (done, total),
+                )
+            else:
+                # Waiting out the retry delay after a failed job.
+                messages.warning(request, _warm_failure_message(status))
     except Exception as exc:
         messages.warning(request, f"Upwork API error: {exc}")
         years = years or list(range(start_year, current_year + 1))
-        totals = [0.0 for _ in years]
-
-    if not totals and years:
-        totals = [0.0 for _ in years]
-
-    first_idx = 0
-    for i, total in enumerate(totals):
-        if total > 0:
-            first_idx = i
-            break
 
-    years = years[first_idx:] or years
-    totals = totals[first_idx:] or totals
-    yearly_client_totals = yearly_client_totals[first_idx:] or yearly_client_totals
+    # Series come precomputed (and leading empty years trimmed) from the rollup.
+    years = series["years"] or years
+    totals = series["totals"] or [0.0 for _ in years]
 
     x_axis = [str(y) for y in years]
     total_earning = round(sum(totals), 2)
@@ -1854,18 +3077,7 @@ def all_time_earning_graph(request):
     except Exception:
         pass
 
-    total_sum = sum(client_totals.values()) if client_totals else 0.0
-    data["client_rows"] = [
-        {
-            "name": name,
-            "total": float(total),
-            "percent": (float(total) / total_sum * 100.0) if total_sum else 0.0,
-        }
-        for name, total in sorted(
-            client_totals.items(), key=lambda x: x[1], reverse=True
-        )
-        if not _is_excluded_client_label({"description": name}, name)
-    ]
+    data["client_rows"] = series["client_rows"]
     data["client_pie_data"] = json.dumps(
         [
             {"name": r["name"], "y": float(r["total"])}
@@ -1873,38 +3085,37 @@ def all_time_earning_graph(request):
             if float(r["total"]) > 0
         ]
     )
-
-    # Build year-by-year cumulative pie data for animation (aligned with graph.x_axis).
-    # Ordering follows overall totals (client_rows) for stable slice ordering.
-    client_order = [r["name"] for r in data.get("client_rows") or []]
-    cumulative = defaultdict(float)
-    yearly_pie = []
-    for entry in yearly_client_totals:
-        year_totals = entry.get("client_totals") or {}
-        for name, total in year_totals.items():
-            if _is_excluded_client_label({"description": name}, name):
-                continue
-            cumulative[name] += float(total or 0)
-
-        points = []
-        for name in client_order:
-            val = float(cumulative.get(name) or 0)
-            if val > 0:
-                points.append({"name": name, "y": round(val, 2)})
-        yearly_pie.append(points)
-    data["yearly_client_pie_data"] = json.dumps(yearly_pie)
-    data["unknown_rows"] = sorted(
-        unknown_rows, key=lambda row: abs(row.get("amount") or 0), reverse=True
-    )
+    data["yearly_client_pie_data"] = json.dumps(series["yearly_client_pie"])
+    data["unknown_rows"] = series["unknown_rows"]
 
     # Only cache the full page once all years are available, otherwise users get
     # stuck with an incomplete page for the full TTL.
     if not missing_years:
-        cache.set(cache_key, data, ALL_TIME_CACHE_SECONDS)
-    return render(request, "upworkapi/all_time_earning.html", data)
+        _cache_set(cache_key, data, ALL_TIME_CACHE_SECONDS)
+    return TemplateResponse(request, "upworkapi/all_time_earning.html", data)
+
+
+@login_required(login_url="/")
+def all_time_warm_progress(request):
+    """Lightweight JSON progress for the all-time warming job.
+
+    Polled by all_time_earning.html instead of reloading the full page; the
+    page only re-renders once `complete` is true, and stops polling to show
+    the error when years failed.
+    """
+    response = JsonResponse(
+        _all_time_warm_status(
+            request.user.id,
+            request.session.get("tenant_id"),
+            _session_freelancer_reference(request),
+        )
+    )
+    response["Cache-Control"] = "no-store"
+    return response
 
 
 @login_required(login_url="/")
+@conditional_report
 def all_time_hourly_graph(request):
     data = {"page_title": "All Time Hourly"}
 
@@ -1984,10 +3195,11 @@ def all_time_hourly_graph(request):
             if float(r["total"]) > 0
         ]
     )
-    return render(request, "upworkapi/all_time_hourly.html", data)
+    return TemplateResponse(request, "upworkapi/all_time_hourly.html", data)
 
 
 @login_required(login_url="/")
+@conditional_report
 def all_time_hourly_year(request, year):
     data = {"page_title": "All Time Hourly"}
 
@@ -2034,10 +3246,11 @@ def all_time_hourly_year(request, year):
         data["client_rows"] = []
         data["client_pie_data"] = json.dumps([])
 
-    return render(request, "upworkapi/all_time_hourly_year.html", data)
+    return TemplateResponse(request, "upworkapi/all_time_hourly_year.html", data)
 
 
 @login_required(login_url="/")
+@conditional_report
 def all_time_earning_year(request, year):
     data = {"page_title": "All Time Earning"}
     data["service_fee_total"] = 0.0
@@ -2081,10 +3294,11 @@ def all_time_earning_year(request, year):
         data["client_rows"] = []
         data["client_pie_data"] = json.dumps([])
 
-    return render(request, "upworkapi/all_time_earning_year.html", data)
+    return TemplateResponse(request, "upworkapi/all_time_earning_year.html", data)
 
 
 @login_required(login_url="/")
+@conditional_report
 def all_time_earning_month(request, year, month):
     data = {"page_title": "All Time Earning"}
     data["service_fee_total"] = 0.0
@@ -2133,10 +3347,90 @@ def all_time_earning_month(request, year, month):
         data["client_rows"] = []
         data["client_pie_data"] = json.dumps([])
 
-    return render(request, "upworkapi/all_time_earning_month.html", data)
+    return TemplateResponse(request, "upworkapi/all_time_earning_month.html", data)
+
+
+@timing.timed("aggregate")
+def _fixed_price_year_data(rows):
+    data = {}
+    clean = []
+    total = 0.0
+
+    for r in rows:
+        occurred_at = (r.get("occurred_at") or "")[:10]
+        amt = float(r.get("amount") or 0.0)
+        if amt == 0:
+            continue
+        display_date = _display_date_str(occurred_at)
+
+        client = r.get("client_name") or "Unknown"
+        kind = r.get("kind") or ""
+        desc = r.get("description") or ""
+
+        clean.append(
+            {
+                "date": occurred_at,
+                "display_date": display_date or occurred_at,
+                "client": client,
+                "kind": kind,
+                "description": desc,
+                "amount": amt,
+            }
+        )
+        total += amt
+
+    clean.sort(key=lambda x: x["date"] or "")
+
+    data["rows"] = clean
+    data["total"] = round(total, 2)
+    data["charity"] = round(total * 0.025, 2)
+
+    per_client = defaultdict(float)
+    for x in clean:
+        per_client[x["client"]] += float(x["amount"] or 0)
+
+    data["client_rows"] = [
+        {"name": k, "total": round(v, 2)}
+        for k, v in sorted(per_client.items(), key=lambda kv: kv[1], reverse=True)
+    ]
+    data["client_pie_data"] = json.dumps(
+        [
+            {"name": r["name"], "y": float(r["total"])}
+            for r in data["client_rows"]
+            if float(r["total"]) > 0
+        ]
+    )
+
+    monthly = {m: 0.0 for m in range(1, 13)}
+    for x in clean:
+        try:
+            dt = datetime.strptime(x["date"], "%Y-%m-%d").date()
+            monthly[dt.month] += float(x["amount"] or 0)
+        except Exception:
+            pass
+
+    data["x_axis"] = [
+        "Jan",
+        "Feb",
+        "Mar",
+        "Apr",
+        "May",
+        "Jun",
+        "Jul",
+        "Aug",
+        "Sep",
+        "Oct",
+        "Nov",
+        "Dec",
+    ]
+    data["report"] = [{"y": round(monthly[i], 2), "month": i} for i in range(1, 13)]
+    data["tooltip"] = "'<b>'+this.x+'</b><br/>$ '+this.y"
+
+    return data
 
 
 @login_required(login_url="/")
+@conditional_report
 def fixed_price_graph(request):
     data = {"page_title": "Fixed Price & Bonus"}
     data["service_fee_total"] = 0.0
@@ -2187,7 +3481,8 @@ def fixed_price_graph(request):
 
     fee_rows = []
     try:
-        fee_rows, fee_debug = fetch_transaction_history_rows(
+        fee_rows, fee_debug = _cached_transaction_history_rows(
+            request,
             token=token,
             tenant_id=tenant_id,
             tenant_ids=request.session.get("tenant_ids"),
@@ -2210,86 +3505,17 @@ def fixed_price_graph(request):
     except Exception:
         fee_rows = []
 
-    clean = []
-    total = 0.0
-
-    for r in rows:
-        occurred_at = (r.get("occurred_at") or "")[:10]
-        amt = float(r.get("amount") or 0.0)
-        if amt == 0:
-            continue
-        display_date = _display_date_str(occurred_at)
-
-        client = r.get("client_name") or "Unknown"
-        kind = r.get("kind") or ""
-        desc = r.get("description") or ""
-
-        clean.append(
-            {
-                "date": occurred_at,
-                "display_date": display_date or occurred_at,
-                "client": client,
-                "kind": kind,
-                "description": desc,
-                "amount": amt,
-            }
-        )
-        total += amt
-
-    clean.sort(key=lambda x: x["date"] or "")
-
     data["year"] = year
-    data["rows"] = clean
-    data["total"] = round(total, 2)
     data["service_fee_rows"] = fee_rows
-    data["charity"] = round(total * 0.025, 2)
-    data["show_detail_table"] = len(clean) <= 20
-
-    per_client = defaultdict(float)
-    for x in clean:
-        per_client[x["client"]] += float(x["amount"] or 0)
-
-    data["client_rows"] = [
-        {"name": k, "total": round(v, 2)}
-        for k, v in sorted(per_client.items(), key=lambda kv: kv[1], reverse=True)
-    ]
-    data["client_pie_data"] = json.dumps(
-        [
-            {"name": r["name"], "y": float(r["total"])}
-            for r in data["client_rows"]
-            if float(r["total"]) > 0
-        ]
-    )
-
-    monthly = {m: 0.0 for m in range(1, 13)}
-    for x in clean:
-        try:
-            dt = datetime.strptime(x["date"], "%Y-%m-%d").date()
-            monthly[dt.month] += float(x["amount"] or 0)
-        except Exception:
-            pass
-
-    data["x_axis"] = [
-        "Jan",
-        "Feb",
-        "Mar",
-        "Apr",
-        "May",
-        "Jun",
-        "Jul",
-        "Aug",
-        "Sep",
-        "Oct",
-        "Nov",
-        "Dec",
-    ]
-    data["report"] = [{"y": round(monthly[i], 2), "month": i} for i in range(1, 13)]
-    data["tooltip"] = "'<b>'+this.x+'</b><br/>$ '+this.y"
+    data.update(_fixed_price_year_data(rows))
+    data["detail_page"] = paginate_details(_fixed_rows_as_details(rows))
+    data["detail_url"] = reverse("api_fixed_year_details", args=[int(year)])
 
-    return render(request, "upworkapi/fixed_price.html", data)
+    return TemplateResponse(request, "upworkapi/fixed_price.html", data)
 
 
 @login_required(login_url="/")
+@conditional_report
 def fixed_price_month_detail(request, year, month):
     data = {"page_title": "Fixed Price & Bonus"}
     data["service_fee_total"] = 0.0
@@ -2334,7 +3560,8 @@ def fixed_price_month_detail(request, year, month):
 
     fee_rows = []
     try:
-        fee_rows, fee_debug = fetch_transaction_history_rows(
+        fee_rows, fee_debug = _cached_transaction_history_rows(
+            request,
             token=token,
             tenant_id=tenant_id,
             tenant_ids=request.session.get("tenant_ids"),
@@ -2402,24 +3629,11 @@ def fixed_price_month_detail(request, year, month):
                 week_totals[wlabel] += float(item["amount"] or 0)
                 break
 
-    detail_rows = []
-    for item in clean:
-        client_name = _normalize_client_name(item.get("client") or "Unknown")
-        detail_rows.append(
-            {
-                "date": item.get("display_date") or _display_date_str(item["date"]),
-                "client": client_name,
-                "description": f'{client_name} - {item["description"]}',
-                "amount": item["amount"],
-            }
-        )
-
     graph = {
         "month": month_label,
         "year": str(year),
         "x_axis": x_axis,
         "report": [round(week_totals[w], 2) for w in x_axis],
-        "detail_earning": detail_rows,
         "total_earning": round(total, 2),
         "charity": round(total * 0.025, 2),
         "title": "Month : %s %s ($ %s)"
@@ -2431,6 +3645,10 @@ def fixed_price_month_detail(request, year, month):
         "tooltip": "'<b>Week : </b>'+this.x+'<br/>'+this.series.name+': $ '+this.y",
     }
     data["graph"] = graph
+    data["detail_page"] = paginate_details(_fixed_rows_as_details(rows))
+    data["detail_url"] = reverse(
+        "api_fixed_month_details", args=[int(year), int(month)]
+    )
 
     per_client = defaultdict(float)
     for item in clean:
@@ -2448,40 +3666,39 @@ def fixed_price_month_detail(request, year, month):
         ]
     )
 
-    return render(request, "upworkapi/fixed_price_month_detail.html", data)
+    return TemplateResponse(request, "upworkapi/fixed_price_month_detail.html", data)
 
 
 @login_required(login_url="/")
+@conditional_report
 def timereport_graph(request):
     data = {"page_title": "Time Report Graph"}
 
-    if request.method == "POST":
-        year = request.POST.get("year")
+    # The year picker loads other years from the JSON API and links them as
+    # ?year=, so GET takes a year as well as the form's POST.
+    year = request.POST.get("year") or request.GET.get("year")
+    if year:
         if not re.match("^[0-9]+$", year) or len(year) != 4:
             messages.warning(request, "Wrong year format.!")
             return redirect("timereport_graph")
     else:
-        now = datetime.now()
-        year = str(now.year)
+        year = str(datetime.now().year)
 
-    timelog = timereport_weekly(request.session["token"], year)
+    timelog = timereport_weekly(request.session["token"], year, request=request)
     data["graph"] = timelog
-    return render(request, "upworkapi/timereport.html", data)
+    return TemplateResponse(request, "upworkapi/timereport.html", data)
 
 
 @login_required(login_url="/")
 def earning_month_client_detail(request, year, month, client_name):
-    finreport = earning_graph_monthly(request.session["token"], int(year), int(month))
-
     rows = []
     total = 0.0
-
-    for d in finreport.get("detail_earning") or []:
-        client = _get(d, "client_name") or _extract_client_name(d)
-        client = _normalize_client_name(client)
-        if client == client_name:
-            rows.append(d)
-            total += float(_get(d, "amount", 0) or 0)
+    for r in _cached_client_month_rows(
+        request, request.session["token"], year, month, client_name
+    ):
+        dt = datetime.strptime(r["date"], "%Y-%m-%d").date()
+        rows.append(_time_report_detail(r, dt))
+        total += float(r["charges"] or 0)
 
     return render(
         request,